@@ -0,0 +1,107 @@
+"""
+Benchmark: Batch Drone Dispatch
+Builds a seeded synthetic fleet and incident set and times the joint
+min-cost dispatch, checking the solver against brute force on small cases.
+
+Usage:
+    python benchmarks/drone_dispatch.py --drones 300 --incidents 200 --rounds 20
+"""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "mcp_servers"))
+
+from drone_dispatch import DroneFleet, PRIORITY_WEIGHTS, solve_assignment
+
+
+def synthetic_fleet(count: int, rng: np.random.Generator) -> dict:
+    """Drones spread over the demo area (about 10km across) with mixed batteries"""
+    return {
+        f"UNIT-{n + 1:03d}": {
+            "lat": 37.30 + rng.random() * 0.09,
+            "lng": -122.02 + rng.random() * 0.11,
+            "battery": float(rng.uniform(40, 100)),
+            "speed_mps": float(rng.choice([12.0, 15.0, 18.0]))
+        }
+        for n in range(count)
+    }
+
+
+def synthetic_incidents(count: int, rng: np.random.Generator) -> list:
+    priorities = list(PRIORITY_WEIGHTS)
+    return [
+        {
+            "sector_id": f"Sector-{n + 1}",
+            "lat": 37.30 + rng.random() * 0.09,
+            "lng": -122.02 + rng.random() * 0.11,
+            "priority": priorities[int(rng.integers(len(priorities)))]
+        }
+        for n in range(count)
+    ]
+
+
+def check_against_brute_force(rng: np.random.Generator, cases: int = 200):
+    for _ in range(cases):
+        rows = int(rng.integers(1, 6))
+        cols = int(rng.integers(rows, 8))
+        cost = rng.random((rows, cols)) * 100
+        assignment = solve_assignment(cost)
+        best = min(
+            sum(cost[i, perm[i]] for i in range(rows))
+            for perm in itertools.permutations(range(cols), rows)
+        )
+        assert abs(cost[np.arange(rows), assignment].sum() - best) < 1e-9, "solver is not optimal"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch drone dispatch benchmark")
+    parser.add_argument("--drones", type=int, default=300)
+    parser.add_argument("--incidents", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(7)
+    check_against_brute_force(rng)
+    
+    latencies = []
+    deployed = []
+    for _ in range(args.rounds):
+        # Fresh fleet per round so every round solves the full problem
+        fleet = DroneFleet(synthetic_fleet(args.drones, rng), clock=lambda: 0.0)
+        incidents = synthetic_incidents(args.incidents, rng)
+        started = time.perf_counter()
+        results = fleet.dispatch(incidents, now=0.0)
+        latencies.append((time.perf_counter() - started) * 1000)
+        deployed.append(sum(1 for r in results if r["status"] == "deployed"))
+    
+    latencies.sort()
+    results = {
+        "drones": args.drones,
+        "incidents": args.incidents,
+        "rounds": args.rounds,
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "max_ms": round(latencies[-1], 2),
+        "mean_deployed": round(statistics.mean(deployed), 1)
+    }
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"\nDispatch of {args.incidents} incidents over {args.drones} drones ({args.rounds} rounds)")
+    print(f"   mean {results['mean_ms']:.1f}ms  p50 {results['p50_ms']:.1f}ms  max {results['max_ms']:.1f}ms")
+    print(f"   {results['mean_deployed']} incidents deployed per round on average")
+
+
+if __name__ == "__main__":
+    main()
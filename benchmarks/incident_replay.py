@@ -0,0 +1,82 @@
+"""
+Benchmark: Incident Stream Replay
+Feeds a log recorded with replay.record_path (or NEOGUARD_RECORD_FILE for the
+drone feed) back through SpoonOSAgent at 1x, Nx or maximum speed, answering
+model decisions and chain reports from the recording, and reports throughput
+and per-stage latency.
+
+Usage:
+    python benchmarks/incident_replay.py incidents.jsonl --speed 10
+    python benchmarks/incident_replay.py incidents.jsonl --speed max --concurrency 64 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from main_agent import SpoonOSAgent
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config.json")
+
+
+def parse_speed(value: str):
+    return None if value == "max" else float(value)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Incident stream replay")
+    parser.add_argument("log", help="Recorded incident stream (JSONL)")
+    parser.add_argument("--speed", type=parse_speed, default=1.0, help="Replay speed factor, or 'max'")
+    parser.add_argument("--concurrency", type=int, help="Override max_concurrent_sectors")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+    
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    config.setdefault("replay", {})["record_path"] = None
+    config.setdefault("archive", {})["enabled"] = False
+    # Replayed incidents must never reach the real outbox
+    scratch = tempfile.mkdtemp(prefix="neoguard_replay_")
+    config.setdefault("outbox", {})["path"] = os.path.join(scratch, "outbox.db")
+    config["logging"] = {"mode": "production", "level": "WARNING", "file": os.devnull}
+    if args.concurrency:
+        config["monitoring"]["max_concurrent_sectors"] = args.concurrency
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(config, f)
+    
+    try:
+        with redirect_stdout(StringIO()):
+            agent = SpoonOSAgent(config_path=f.name)
+            summary = await agent.run_replay(args.log, args.speed)
+    finally:
+        os.remove(f.name)
+        shutil.rmtree(scratch, ignore_errors=True)
+    
+    stages = {
+        h["labels"]["stage"]: {q: h[f"{q}_seconds"] for q in ("p50", "p95", "p99")}
+        for h in agent.metrics_snapshot()["histograms"].get("neoguard_stage_latency_seconds", [])
+    }
+    
+    if args.json:
+        print(json.dumps({"log": args.log, "speed": args.speed, "summary": summary, "stages": stages}, indent=2))
+        return
+    
+    print(f"\nReplay of {args.log} at {f'{args.speed}x' if args.speed else 'max'} speed")
+    print(f"   {summary['incidents']} incidents from {summary['scans']} scans: {summary['reported']} reported, "
+          f"{summary['held']} held, {summary['merged']} merged, {summary['failed']} failed")
+    print(f"   {summary['elapsed_seconds']:.2f}s for {summary['recorded_seconds']:.2f}s recorded "
+          f"({summary['incidents_per_second']} incidents/s)")
+    for stage, q in sorted(stages.items()):
+        print(f"   {stage:<16} p50 {q['p50'] * 1000:8.2f}ms  p95 {q['p95'] * 1000:8.2f}ms  p99 {q['p99'] * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Benchmark: Neo RPC Throughput
+Drives NeoReportTool.run_async against the in-process MockNeoRpcServer and compares
+one-call-per-request submission with the pooled, batching NeoRpcClient.
+
+Usage:
+    python benchmarks/neo_rpc_throughput.py --reports 500 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_tools.neo_actions import NeoReportTool
+from custom_tools.neo_rpc import NeoRpcClient, MockNeoRpcServer
+
+
+async def measure(label: str, server: MockNeoRpcServer, reports: int, max_batch_size: int) -> dict:
+    """Submit `reports` incidents concurrently and measure reports per second"""
+    server.http_requests = 0
+    server.rpc_calls = 0
+    
+    async with NeoRpcClient(server.url, pool_size=8, max_batch_size=max_batch_size) as client:
+        tool = NeoReportTool(rpc_client=client)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            tool.run_async(
+                disaster_type="wildfire",
+                evidence_link=f"neofs://neoguard/benchmark_{i}.mp4",
+                sector_id=f"Sector-{i % 4 + 1}",
+                confidence=0.98,
+                coordinates={"lat": 37.3417, "lng": -121.9751}
+            )
+            for i in range(reports)
+        ))
+        elapsed = time.perf_counter() - started
+    
+    return {
+        "mode": label,
+        "reports": reports,
+        "succeeded": sum(1 for r in results if r["status"] == "success"),
+        "http_requests": server.http_requests,
+        "elapsed_s": round(elapsed, 4),
+        "reports_per_s": round(reports / elapsed, 1)
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Neo RPC throughput benchmark")
+    parser.add_argument("--reports", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated node latency per HTTP request")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+    
+    async with MockNeoRpcServer(latency_seconds=args.latency_ms / 1000) as server:
+        results = [
+            await measure("unbatched", server, args.reports, max_batch_size=1),
+            await measure("batched", server, args.reports, max_batch_size=32)
+        ]
+    
+    if args.json:
+        print(json.dumps({"latency_ms": args.latency_ms, "results": results}, indent=2))
+        return
+    
+    print(f"\nNeoReportTool.run_async throughput ({args.reports} reports, {args.latency_ms:.0f}ms node latency)")
+    print(f"{'mode':<12}{'ok':>6}{'http reqs':>12}{'seconds':>10}{'reports/s':>12}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['succeeded']:>6}{r['http_requests']:>12}{r['elapsed_s']:>10.3f}{r['reports_per_s']:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,295 @@
+"""
+Benchmark: End-to-End Patrol Throughput
+Drives SpoonOSAgent sector sweeps through HybridAgent and NeoReportTool against
+seeded stand-ins for Gemini and the Neo RPC node, across sector counts and
+concurrency levels, and reports incidents per second with p50/p95/p99 latency
+per stage (bucket-interpolated from the agent's own metrics registry).
+
+Usage:
+    python benchmarks/patrol_throughput.py --sectors 4,16,64 --concurrency 1,8,32 --sweeps 5
+    python benchmarks/patrol_throughput.py --gemini-error-rate 0.1 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from main_agent import SpoonOSAgent
+from custom_tools.gemini_fallback import GeminiFallbackAgent, HybridAgent
+from custom_tools.neo_rpc import MockNeoRpcServer
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config.json")
+
+
+class StandInResponse:
+    """Minimal response object exposing .text like the Gemini SDK"""
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class SeededModel:
+    """
+    Stand-in for genai.GenerativeModel with seeded latency jitter, failures and verdicts.
+    Latency is latency_seconds scaled by a lognormal factor (sigma = jitter); a
+    malformed_rate share of answers is wrapped in prose and a code fence or cut short.
+    """
+    
+    def __init__(self, latency_seconds: float, jitter: float, error_rate: float, report_rate: float, seed: int,
+                 malformed_rate: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.report_rate = report_rate
+        self.malformed_rate = malformed_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+    
+    async def generate_content_async(self, prompt: str, generation_config: Optional[dict] = None):
+        self.calls += 1
+        # Draw everything up front so the sequence does not depend on completion order
+        delay = self.latency_seconds * (self.rng.lognormvariate(0.0, self.jitter) if self.jitter else 1.0)
+        failed = self.rng.random() < self.error_rate
+        should_report = self.rng.random() < self.report_rate
+        confidence = round(self.rng.uniform(70, 99), 1)
+        malformed = self.rng.random() < self.malformed_rate
+        truncate_at = self.rng.uniform(0.5, 1.0)
+        
+        await asyncio.sleep(delay)
+        if failed:
+            self.errors += 1
+            raise RuntimeError("Simulated Gemini API error")
+        text = json.dumps({
+            "severity": "High",
+            "analysis": {"severity": "High", "recommended_actions": [], "risk_factors": []},
+            "decision": {"should_report": should_report, "confidence": confidence, "reasoning": "benchmark"},
+            "should_report": should_report,
+            "confidence": confidence,
+            "reasoning": "benchmark"
+        })
+        if malformed:
+            text = f"Here is my assessment:\n```json\n{text}\n```" if truncate_at > 0.75 else text[:int(len(text) * truncate_at)]
+        return StandInResponse(text)
+
+
+def build_config(args, sectors: int, concurrency: int, rpc_url: str) -> dict:
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    
+    config["monitoring"]["patrol_mode"] = "sweep"
+    config["monitoring"]["sectors"] = [f"Sector-{n + 1}" for n in range(sectors)]
+    config["monitoring"]["max_concurrent_sectors"] = concurrency
+    config["blockchain"]["rpc_url"] = rpc_url
+    config["blockchain"].setdefault("rpc", {})["enabled"] = True
+    config["blockchain"].setdefault("batch_reporting", {})["enabled"] = args.batch_reporting
+    config["gemini"]["decision_mode"] = args.decision_mode
+    config.setdefault("decision_cache", {})["enabled"] = args.cache
+    config.setdefault("deduplication", {})["enabled"] = args.dedup
+    config.setdefault("decision_engine", {})["enabled"] = not args.no_decision_engine
+    config["gemini"].setdefault("circuit_breaker", {})["enabled"] = not args.no_circuit_breaker
+    config["gemini"].setdefault("scheduler", {})["enabled"] = not args.no_llm_scheduler
+    if args.rpm is not None:
+        config["gemini"]["scheduler"]["requests_per_minute"] = args.rpm
+    config.setdefault("outbox", {})["enabled"] = False
+    config.setdefault("archive", {})["enabled"] = False
+    config.setdefault("metrics", {})["enabled"] = False
+    config["logging"] = {"mode": "production", "level": "WARNING", "file": os.devnull}
+    return config
+
+
+def build_agent(args, sectors: int, concurrency: int, rpc_url: str, seed: int) -> SpoonOSAgent:
+    """Agent wired to the stand-in model and mock node (stdout of setup is discarded)"""
+    config = build_config(args, sectors, concurrency, rpc_url)
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(config, f)
+    
+    try:
+        with redirect_stdout(StringIO()):
+            agent = SpoonOSAgent(config_path=f.name)
+    finally:
+        os.remove(f.name)
+    
+    agent.gemini_agent = GeminiFallbackAgent(
+        api_key="benchmark",
+        metrics=agent.metrics,
+        breaker=agent.build_circuit_breaker(),
+        hedge_quantile=args.hedge_quantile,
+        scheduler=agent.build_llm_scheduler()
+    )
+    agent.gemini_agent.model = SeededModel(
+        args.gemini_latency_ms / 1000,
+        args.gemini_jitter,
+        args.gemini_error_rate,
+        args.report_rate,
+        seed,
+        args.malformed_rate
+    )
+    agent.hybrid_agent = HybridAgent(
+        spoon_agent=agent,
+        gemini_agent=agent.gemini_agent,
+        decision_mode=args.decision_mode
+    )
+    
+    # End-to-end latency of one incident's analyze -> approve -> report chain
+    handle_incident = agent.handle_incident
+    
+    async def timed_handle_incident(incident: dict) -> bool:
+        with agent.metrics.time("stage_latency_seconds", "Latency of agent stages", stage="incident"):
+            return await handle_incident(incident)
+    
+    agent.handle_incident = timed_handle_incident
+    return agent
+
+
+def latency_summary(snapshot: dict) -> dict:
+    """{label: {count, p50_ms, p95_ms, p99_ms, max_ms}} for stage and Gemini call histograms"""
+    stages = {}
+    for name, prefix in (("neoguard_stage_latency_seconds", ""), ("neoguard_gemini_call_latency_seconds", "gemini.")):
+        for h in snapshot["histograms"].get(name, []):
+            labels = h["labels"]
+            label = labels.get("stage") or f"{labels.get('operation')}.{labels.get('outcome')}"
+            stages[prefix + label] = {
+                "count": h["count"],
+                **{
+                    f"{q}_ms": round(h[f"{q}_seconds"] * 1000, 3) if h[f"{q}_seconds"] is not None else None
+                    for q in ("p50", "p95", "p99", "max")
+                }
+            }
+    return stages
+
+
+async def measure(args, server: MockNeoRpcServer, sectors: int, concurrency: int) -> dict:
+    """Run `sweeps` back-to-back sweeps over `sectors` sectors with `concurrency` in flight"""
+    # Same incident stream and model draws for every configuration
+    random.seed(args.seed)
+    agent = build_agent(args, sectors, concurrency, server.url, args.seed + 1)
+    
+    with redirect_stdout(StringIO()):
+        await agent.start()
+    try:
+        started = time.perf_counter()
+        for _ in range(args.sweeps):
+            await agent.run_sector_sweep()
+        elapsed = time.perf_counter() - started
+        agent.logging_runtime.flush()
+    finally:
+        with redirect_stdout(StringIO()):
+            await agent.stop()
+    
+    model = agent.gemini_agent.model
+    snapshot = agent.metrics_snapshot()
+    return {
+        "sectors": sectors,
+        "concurrency": concurrency,
+        "sweeps": args.sweeps,
+        "sectors_scanned": sectors * args.sweeps,
+        "incidents": agent.incidents_detected,
+        "reported": agent.incidents_reported,
+        "fallbacks": int(sum(c["value"] for c in snapshot["counters"].get("neoguard_fallbacks_total", []))),
+        "model_calls": model.calls,
+        "model_errors": model.errors,
+        "circuit_breaker": agent.gemini_agent.breaker.stats() if agent.gemini_agent.breaker is not None else None,
+        "hedges_sent": agent.gemini_agent.hedges_sent,
+        "hedges_won": agent.gemini_agent.hedges_won,
+        "llm_scheduler": agent.gemini_agent.scheduler.stats() if agent.gemini_agent.scheduler is not None else None,
+        "tokens": agent.gemini_agent.token_usage.stats(),
+        "responses": agent.gemini_agent.parser.stats(),
+        "decision_tiers": agent.decision_engine.stats() if agent.decision_engine is not None else None,
+        "elapsed_s": round(elapsed, 4),
+        "sectors_per_s": round(sectors * args.sweeps / elapsed, 1),
+        "incidents_per_s": round(agent.incidents_detected / elapsed, 2),
+        "stages": latency_summary(snapshot)
+    }
+
+
+def parse_levels(value: str) -> list:
+    return [int(level) for level in value.split(",") if level]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="End-to-end patrol throughput benchmark")
+    parser.add_argument("--sectors", type=parse_levels, default=[4, 16, 64], help="Comma-separated sector counts")
+    parser.add_argument("--concurrency", type=parse_levels, default=[1, 8, 32],
+                        help="Comma-separated max_concurrent_sectors levels")
+    parser.add_argument("--sweeps", type=int, default=5, help="Sweeps per configuration")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--decision-mode", choices=HybridAgent.DECISION_MODES, default="fused")
+    parser.add_argument("--gemini-latency-ms", type=float, default=400.0, help="Median stand-in model round trip")
+    parser.add_argument("--gemini-jitter", type=float, default=0.25, help="Lognormal sigma of the model latency")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="Fraction of model calls that fail")
+    parser.add_argument("--report-rate", type=float, default=0.9, help="Fraction of model verdicts that say report")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="Fraction of model answers that are fenced in prose or truncated")
+    parser.add_argument("--rpc-latency-ms", type=float, default=20.0, help="Mock node latency per HTTP request")
+    parser.add_argument("--rpc-error-rate", type=float, default=0.0, help="Fraction of transactions the node rejects")
+    parser.add_argument("--no-circuit-breaker", action="store_true", help="Disable the Gemini circuit breaker")
+    parser.add_argument("--hedge-quantile", type=float, help="Send hedged model calls after this latency quantile")
+    parser.add_argument("--rpm", type=float, help="Gemini requests per minute allowed by the scheduler")
+    parser.add_argument("--no-llm-scheduler", action="store_true",
+                        help="Call the model directly (no rate limiting, prioritization or coalescing)")
+    parser.add_argument("--cache", action="store_true", help="Enable the decision cache")
+    parser.add_argument("--dedup", action="store_true", help="Enable incident deduplication")
+    parser.add_argument("--no-decision-engine", action="store_true",
+                        help="Send every incident to the model (disable the local decision tiers)")
+    parser.add_argument("--batch-reporting", action="store_true", help="Report through the Merkle batcher")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+    os.environ.pop("GEMINI_API_KEY", None)
+    
+    results = []
+    async with MockNeoRpcServer(
+        latency_seconds=args.rpc_latency_ms / 1000,
+        error_rate=args.rpc_error_rate,
+        seed=args.seed
+    ) as server:
+        for sectors in args.sectors:
+            for concurrency in args.concurrency:
+                results.append(await measure(args, server, sectors, concurrency))
+    
+    report = {
+        "benchmark": "patrol_throughput",
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "parameters": {
+            key: value for key, value in vars(args).items() if key not in ("output", "json")
+        },
+        "results": results
+    }
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    
+    print(f"\nPatrol throughput ({args.sweeps} sweeps, {args.gemini_latency_ms:.0f}ms model, "
+          f"{args.rpc_latency_ms:.0f}ms node, {args.gemini_error_rate:.0%}/{args.rpc_error_rate:.0%} errors)")
+    print(f"{'sectors':>8}{'conc':>6}{'incidents':>11}{'inc/s':>9}{'incident p50':>14}{'p95':>10}{'p99':>10}"
+          f"{'decision p95':>14}{'report p95':>12}")
+    for r in results:
+        stages = r["stages"]
+        incident = stages.get("incident", {})
+        print(f"{r['sectors']:>8}{r['concurrency']:>6}{r['incidents']:>11}{r['incidents_per_s']:>9.1f}"
+              f"{incident.get('p50_ms') or 0:>12.0f}ms{incident.get('p95_ms') or 0:>8.0f}ms"
+              f"{incident.get('p99_ms') or 0:>8.0f}ms{stages.get('decision', {}).get('p95_ms') or 0:>12.0f}ms"
+              f"{stages.get('neo_report', {}).get('p95_ms') or 0:>10.0f}ms")
+    if args.output:
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark: Sector Index Lookups
+Builds a seeded synthetic sector map and times SectorIndex point-to-sector,
+radius and neighbor queries, checking results against a brute-force scan.
+
+Usage:
+    python benchmarks/sector_index_lookup.py --sectors 100000 --queries 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "mcp_servers"))
+
+from sector_index import SectorIndex, haversine_km
+
+
+def synthetic_sectors(count: int, seed: int = 7) -> dict:
+    """Jittered grid of sectors around the demo area (roughly 300m spacing)"""
+    rng = random.Random(seed)
+    side = int(count ** 0.5) + 1
+    spacing = 0.003
+    sectors = {}
+    for n in range(count):
+        row, col = divmod(n, side)
+        sectors[f"Sector-{n + 1}"] = {
+            "lat": 37.0 + row * spacing + rng.uniform(-spacing / 3, spacing / 3),
+            "lng": -122.5 + col * spacing + rng.uniform(-spacing / 3, spacing / 3),
+            "status": "clear"
+        }
+    return sectors
+
+
+def time_queries(fn, queries) -> dict:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(*query)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+    return {
+        "mean_us": round(statistics.mean(latencies), 2),
+        "p50_us": round(latencies[len(latencies) // 2], 2),
+        "p99_us": round(latencies[int(len(latencies) * 0.99) - 1], 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sector index lookup benchmark")
+    parser.add_argument("--sectors", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radius-km", type=float, default=1.0)
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+    
+    sectors = synthetic_sectors(args.sectors)
+    started = time.perf_counter()
+    index = SectorIndex(sectors)
+    build_ms = (time.perf_counter() - started) * 1000
+    
+    rng = random.Random(11)
+    lats = [s["lat"] for s in sectors.values()]
+    lngs = [s["lng"] for s in sectors.values()]
+    points = [
+        (rng.uniform(min(lats), max(lats)), rng.uniform(min(lngs), max(lngs)))
+        for _ in range(args.queries)
+    ]
+    sector_ids = rng.sample(list(sectors), min(args.queries, len(sectors)))
+    
+    # Spot-check against a brute-force scan
+    for lat, lng in points[:20]:
+        expected = min(sectors, key=lambda sid: haversine_km(lat, lng, sectors[sid]["lat"], sectors[sid]["lng"]))
+        assert index.locate(lat, lng)[0] == expected, "locate() disagrees with brute force"
+    
+    results = {
+        "sectors": args.sectors,
+        "queries": args.queries,
+        "build_ms": round(build_ms, 1),
+        "locate": time_queries(index.locate, points),
+        "within_radius": time_queries(lambda lat, lng: index.within_radius(lat, lng, args.radius_km), points),
+        "neighbors": time_queries(lambda sid: index.neighbors(sid, k=8), [(sid,) for sid in sector_ids])
+    }
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"\nSectorIndex over {args.sectors} sectors (built in {results['build_ms']}ms, {args.queries} queries)")
+    print(f"{'query':<16}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}")
+    for name in ("locate", "within_radius", "neighbors"):
+        r = results[name]
+        print(f"{name:<16}{r['mean_us']:>10.1f}{r['p50_us']:>10.1f}{r['p99_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Lets pytest import custom_tools, mcp_servers and main_agent from the repository root"""
@@ -0,0 +1,183 @@
+"""
+Circuit Breaker
+Rolling-window circuit breaker for remote model calls.
+Trips open when the recent error rate or a latency percentile crosses its limit,
+fails fast while open, and lets a limited number of probe calls through after a
+cool-down (half-open) to decide whether to close again.
+"""
+
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Callable, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATES = (CLOSED, HALF_OPEN, OPEN)
+
+# What allow() hands out: the state a call was admitted under and, for probes, the
+# half-open period it belongs to
+Admission = Tuple[str, int]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Error-rate and latency circuit breaker over the last `window_size` calls.
+
+    Every admission returned by allow() must be passed to exactly one record() (or
+    release() for calls that were abandoned without an outcome). A call is judged by
+    the state it was admitted under: a call admitted while closed that finishes after
+    the circuit went half-open is not a probe, and a probe from an earlier half-open
+    period does not count towards the current one.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 50,
+        min_calls: int = 10,
+        error_rate_threshold: float = 0.5,
+        latency_threshold_seconds: Optional[float] = None,
+        latency_quantile: float = 0.95,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        close_after_successes: int = 2,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            window_size: Recent calls considered
+            min_calls: Calls needed in the window before the breaker can trip
+            error_rate_threshold: Failure fraction that trips the breaker
+            latency_threshold_seconds: Trip when the latency quantile of recent calls exceeds this (None disables)
+            latency_quantile: Quantile compared against latency_threshold_seconds
+            open_seconds: Cool-down before probes are let through
+            half_open_probes: Concurrent probe calls allowed while half-open
+            close_after_successes: Consecutive successful probes that close the circuit
+            clock: Monotonic time source (defaults to time.monotonic)
+        """
+        self.window_size = max(1, window_size)
+        self.min_calls = max(1, min_calls)
+        self.error_rate_threshold = error_rate_threshold
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.latency_quantile_level = latency_quantile
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.close_after_successes = max(1, close_after_successes)
+        self.clock = clock or time.monotonic
+
+        # (succeeded, latency_seconds) of recent calls
+        self._window: deque = deque(maxlen=self.window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._half_open_period = 0
+
+        self.trips = 0
+        self.rejected = 0
+        self.last_trip_reason: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit whose cool-down has passed reports half_open"""
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+            self._half_open_period += 1
+        return self._state
+
+    @property
+    def accepting(self) -> bool:
+        """Whether allow() would admit a call now (closed, or half-open with a free probe slot)"""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and self._probes_in_flight < self.half_open_probes)
+
+    def allow(self) -> Optional[Admission]:
+        """
+        Admit a call if possible (taking a probe slot while half-open).
+
+        Returns:
+            The admission to pass to record() or release(), or None if the call is refused
+        """
+        state = self.state
+        if state == CLOSED:
+            return (CLOSED, 0)
+        if state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+            self._probes_in_flight += 1
+            return (HALF_OPEN, self._half_open_period)
+        self.rejected += 1
+        return None
+
+    def _is_current_probe(self, admission: Admission) -> bool:
+        return admission == (HALF_OPEN, self._half_open_period) and self._state == HALF_OPEN
+
+    def record(self, admission: Admission, succeeded: bool, latency_seconds: float):
+        """Record the outcome of a call admitted by allow()"""
+        if admission[0] == HALF_OPEN:
+            # Probes of an earlier half-open period are stale: the circuit has moved on
+            if self._is_current_probe(admission):
+                self._record_probe(succeeded, latency_seconds)
+            return
+
+        self._window.append((succeeded, latency_seconds))
+        if self._state != CLOSED or len(self._window) < self.min_calls:
+            return
+
+        failures = sum(1 for ok, _ in self._window if not ok)
+        if failures / len(self._window) >= self.error_rate_threshold:
+            self._trip(f"error rate {failures}/{len(self._window)}")
+            return
+        if self.latency_threshold_seconds is not None:
+            observed = self.latency_quantile(self.latency_quantile_level, successful_only=False)
+            if observed is not None and observed > self.latency_threshold_seconds:
+                self._trip(f"p{self.latency_quantile_level * 100:g} latency {observed:.2f}s")
+
+    def _record_probe(self, succeeded: bool, latency_seconds: float):
+        self._probes_in_flight = max(0, self._probes_in_flight - 1)
+        if not succeeded or self._too_slow(latency_seconds):
+            self._trip("probe failed")
+            return
+        self._probe_successes += 1
+        if self._probe_successes >= self.close_after_successes:
+            self._state = CLOSED
+            self._window.clear()
+
+    def release(self, admission: Admission):
+        """Give back a probe slot for a call that ended without an outcome (e.g. cancelled)"""
+        if self._is_current_probe(admission):
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _too_slow(self, latency_seconds: float) -> bool:
+        return self.latency_threshold_seconds is not None and latency_seconds > self.latency_threshold_seconds
+
+    def _trip(self, reason: str):
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._probes_in_flight = 0
+        self.trips += 1
+        self.last_trip_reason = reason
+
+    def latency_quantile(self, q: float, successful_only: bool = True) -> Optional[float]:
+        """Latency quantile of the calls in the window (None when there are none)"""
+        latencies = sorted(latency for ok, latency in self._window if ok or not successful_only)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    def stats(self) -> Dict[str, Any]:
+        failures = sum(1 for ok, _ in self._window if not ok)
+        return {
+            "state": self.state,
+            "window_calls": len(self._window),
+            "window_error_rate": round(failures / len(self._window), 3) if self._window else 0.0,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "last_trip_reason": self.last_trip_reason
+        }
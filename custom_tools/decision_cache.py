@@ -0,0 +1,121 @@
+"""
+Decision Cache
+Bounded LRU/TTL cache for LLM incident verdicts.
+Repeated disaster_type/sector/confidence combinations reuse a recent decision
+instead of paying for another Gemini round trip.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Tuple
+
+
+class DecisionCache:
+    """
+    LRU cache of incident decisions keyed on a normalized incident signature.
+    Entries expire after `ttl_seconds`; the least recently used entry is evicted
+    once `max_entries` is reached.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        confidence_bucket: float = 0.05,
+        coordinate_precision: int = 3,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the decision cache.
+        
+        Args:
+            max_entries: Maximum number of cached decisions
+            ttl_seconds: Lifetime of a cached decision
+            confidence_bucket: Width of the confidence buckets (0.05 -> 0.85, 0.90, ...)
+            coordinate_precision: Decimal places kept from lat/lng (3 ≈ 110m cells)
+            clock: Monotonic time source
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.confidence_bucket = confidence_bucket
+        self.coordinate_precision = coordinate_precision
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def signature(self, incident: Dict[str, Any]) -> Tuple:
+        """
+        Build the normalized cache key for an incident.
+        Confidence is floored to its bucket and coordinates are rounded to a coarse grid.
+        """
+        confidence = incident.get("confidence", 0) or 0
+        bucket = int(confidence / self.confidence_bucket + 1e-9) if self.confidence_bucket > 0 else confidence
+        
+        coordinates = incident.get("coordinates") or {}
+        lat = coordinates.get("lat")
+        lng = coordinates.get("lng")
+        cell = (
+            round(lat, self.coordinate_precision) if lat is not None else None,
+            round(lng, self.coordinate_precision) if lng is not None else None
+        )
+        
+        return (
+            str(incident.get("disaster_type", "unknown")).lower(),
+            incident.get("sector_id", "unknown"),
+            bucket,
+            cell
+        )
+    
+    def get(self, incident: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached decision for this incident, or None on a miss"""
+        key = self.signature(incident)
+        entry = self._entries.get(key)
+        
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        stored_at, decision = entry
+        if self._clock() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return decision
+    
+    def put(self, incident: Dict[str, Any], decision: Dict[str, Any]):
+        """Store a decision for this incident's signature"""
+        key = self.signature(incident)
+        self._entries[key] = (self._clock(), decision)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        """Drop every cached decision (counters are kept)"""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -0,0 +1,134 @@
+"""
+Tiered Decision Engine
+Settles clear-cut incidents locally and only escalates borderline ones to the LLM.
+
+Tiers, evaluated in order:
+    rules  - explicit per-disaster-type rules from config (report, hold or escalate)
+    score  - confidence weighted by disaster type; at or above `report_at` reports,
+             below `hold_below` holds
+    escalated - everything in the uncertainty band [hold_below, report_at) goes to the LLM
+                (counted here even when the model call is skipped or short-circuited;
+                llm_calls counts the round trips that actually happened)
+"""
+
+import time
+from typing import Optional, Dict, Any, List, Tuple
+
+TIERS = ("rules", "score", "escalated")
+RULE_ACTIONS = ("report", "hold", "escalate")
+
+
+class TieredDecisionEngine:
+    """
+    Local rule and score layer in front of the LLM decision path.
+    decide() returns a decision for clear-cut incidents and None for the ones to escalate.
+    """
+    
+    def __init__(
+        self,
+        report_at: float = 0.95,
+        hold_below: float = 0.75,
+        type_weights: Optional[Dict[str, float]] = None,
+        rules: Optional[List[Dict[str, Any]]] = None,
+        threshold: Optional[float] = None
+    ):
+        """
+        Initialize the engine.
+        
+        Args:
+            report_at: Weighted score at or above which an incident is reported locally
+            hold_below: Weighted score below which an incident is held locally
+            type_weights: Multiplier on confidence per disaster type (default 1.0)
+            rules: [{"disaster_type", "action", "min_confidence"?, "max_confidence"?}]
+                   evaluated before scoring; action is report, hold or escalate
+            threshold: Confidence threshold of the fallback rule; it must lie inside
+                       [hold_below, report_at] or the score tier would contradict it
+        """
+        if hold_below > report_at:
+            raise ValueError("hold_below must not exceed report_at")
+        if threshold is not None and not hold_below <= threshold <= report_at:
+            raise ValueError(
+                f"confidence threshold {threshold} must lie within [hold_below, report_at] = [{hold_below}, {report_at}]"
+            )
+        self.report_at = report_at
+        self.hold_below = hold_below
+        self.type_weights = {key.lower(): value for key, value in (type_weights or {}).items()}
+        
+        # disaster_type -> [(min_confidence, max_confidence, action)], "*" matches any type
+        self._rules: Dict[str, List[Tuple[float, float, str]]] = {}
+        for rule in rules or []:
+            action = rule["action"]
+            if action not in RULE_ACTIONS:
+                raise ValueError(f"Unknown rule action {action!r} (expected one of {RULE_ACTIONS})")
+            self._rules.setdefault(rule.get("disaster_type", "*").lower(), []).append((
+                rule.get("min_confidence", 0.0),
+                rule.get("max_confidence", 1.0),
+                action
+            ))
+        
+        self.counts = {tier: 0 for tier in TIERS}
+        self.local_seconds = 0.0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+    
+    def _match_rule(self, disaster_type: str, confidence: float) -> Optional[str]:
+        for key in (disaster_type, "*"):
+            for low, high, action in self._rules.get(key, ()):
+                if low <= confidence <= high:
+                    return action
+        return None
+    
+    def decide(self, incident: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Decide an incident locally if it is clear-cut.
+        
+        Returns:
+            {"should_report", "confidence" (percent), "tier", "reason"}, or None to escalate
+        """
+        started = time.perf_counter()
+        disaster_type = str(incident.get("disaster_type", "unknown")).lower()
+        confidence = incident.get("confidence", 0) or 0
+        decision = None
+        
+        action = self._match_rule(disaster_type, confidence)
+        if action in ("report", "hold"):
+            decision = {
+                "should_report": action == "report",
+                "confidence": round(confidence * 100, 1),
+                "tier": "rules",
+                "reason": f"{disaster_type} rule: {action}"
+            }
+        elif action is None:
+            score = min(1.0, confidence * self.type_weights.get(disaster_type, 1.0))
+            if score >= self.report_at or score < self.hold_below:
+                decision = {
+                    "should_report": score >= self.report_at,
+                    "confidence": round(score * 100, 1),
+                    "tier": "score",
+                    "reason": f"score {score:.3f} outside uncertainty band [{self.hold_below}, {self.report_at})"
+                }
+        
+        self.local_seconds += time.perf_counter() - started
+        self.counts[decision["tier"] if decision else "escalated"] += 1
+        return decision
+    
+    def record_llm_call(self, latency_seconds: float):
+        """Account one escalated incident's LLM round trip"""
+        self.llm_calls += 1
+        self.llm_seconds += latency_seconds
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per-tier counts, local decision cost and the LLM latency avoided by local decisions"""
+        local = self.counts["rules"] + self.counts["score"]
+        total = local + self.counts["escalated"]
+        mean_llm = self.llm_seconds / self.llm_calls if self.llm_calls else None
+        return {
+            "decisions": total,
+            "by_tier": dict(self.counts),
+            "local_share": round(local / total, 3) if total else 0.0,
+            "mean_local_us": round(self.local_seconds / total * 1e6, 2) if total else None,
+            "llm_calls": self.llm_calls,
+            "mean_llm_seconds": round(mean_llm, 4) if mean_llm is not None else None,
+            "llm_calls_avoided": local,
+            "estimated_llm_seconds_saved": round(local * mean_llm, 3) if mean_llm is not None else None
+        }
@@ -5,11 +5,30 @@ Uses Google's Gemini API for collaborative reasoning about network requirements.
 """
 
 import os
-import json
+import asyncio
+import logging
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 import google.generativeai as genai
 from datetime import datetime
 
+from custom_tools.metrics import MetricsRegistry
+from custom_tools.circuit_breaker import CircuitBreaker, CircuitOpenError
+from custom_tools.llm_scheduler import LLMRequestScheduler
+from custom_tools.prompt_builder import PromptBuilder, TokenUsage, estimate_tokens
+from custom_tools.response_parser import ResponseParser
+from custom_tools.structured_logging import INCIDENT_LOGGER, log_event
+
+logger = logging.getLogger("neoguard.gemini")
+incident_log = logging.getLogger(INCIDENT_LOGGER)
+
+
+def _rejects_response_schema(error: BaseException) -> bool:
+    """Whether an API error says the model does not support JSON mode / response schemas"""
+    text = str(error).lower()
+    return "json mode" in text or "response_mime_type" in text or "response_schema" in text
+
 
 class GeminiFallbackAgent:
     """
@@ -17,8 +36,40 @@ class GeminiFallbackAgent:
     Handles incident analysis, network reasoning, and decision-making.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize Gemini fallback agent"""
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        request_timeout: Optional[float] = 30.0,
+        max_workers: int = 4,
+        metrics: Optional[MetricsRegistry] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge_quantile: Optional[float] = None,
+        hedge_min_delay: float = 0.05,
+        scheduler: Optional[LLMRequestScheduler] = None,
+        prompt_builder: Optional[PromptBuilder] = None,
+        structured_output: bool = True,
+        response_parser: Optional[ResponseParser] = None
+    ):
+        """
+        Initialize Gemini fallback agent.
+        
+        Args:
+            api_key: Gemini API key (defaults to GEMINI_API_KEY)
+            request_timeout: Default per-call deadline in seconds (None disables it)
+            max_workers: Executor pool size used when the SDK has no async API
+            metrics: Registry receiving per-call latency histograms
+            breaker: Circuit breaker consulted before every call (calls fail fast while open)
+            hedge_quantile: Send a second, hedged call when the first has not answered after
+                this latency quantile of recent successful calls (None disables hedging;
+                needs a breaker, whose window supplies the latencies)
+            hedge_min_delay: Lower bound on the hedge delay in seconds
+            scheduler: Shared rate-limiting, prioritizing and coalescing request scheduler
+                (time spent queued counts toward the call deadline)
+            prompt_builder: Builds the compact prompts (defaults to PromptBuilder())
+            structured_output: Request schema-constrained JSON (turned off automatically
+                if the model rejects response schemas)
+            response_parser: Extracts, normalizes and validates JSON responses
+        """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment")
@@ -27,55 +78,233 @@ class GeminiFallbackAgent:
         self.model = genai.GenerativeModel("gemini-pro")
         self.name = "Gemini Fallback Agent"
         self.is_active = False
+        self.request_timeout = request_timeout
+        self.max_workers = max_workers
+        self.metrics = metrics
+        self.breaker = breaker
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.scheduler = scheduler
+        self.prompts = prompt_builder or PromptBuilder()
+        self.token_usage = TokenUsage()
+        self.structured_output = structured_output
+        self.parser = response_parser or ResponseParser()
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    @property
+    def available(self) -> bool:
+        """False while the circuit breaker would refuse a call (open, or half-open with every probe slot taken)"""
+        return self.breaker is None or self.breaker.accepting
+    
+    def _start_call(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> asyncio.Future:
+        """Start one model call; uses the SDK's async API when available, otherwise the executor pool"""
+        kwargs = {"generation_config": generation_config} if generation_config else {}
+        if hasattr(self.model, "generate_content_async"):
+            return asyncio.ensure_future(self.model.generate_content_async(prompt, **kwargs))
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="gemini"
+            )
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(self.model.generate_content, prompt, **kwargs)
+        )
+    
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_quantile is None or self.breaker is None:
+            return None
+        observed = self.breaker.latency_quantile(self.hedge_quantile)
+        return None if observed is None else max(self.hedge_min_delay, observed)
+    
+    async def _call(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None):
+        """
+        One logical model call. With hedging enabled, a second identical call is sent
+        once the first has been outstanding for the hedge delay; the first successful
+        answer wins and the other call is cancelled.
+        """
+        calls = [self._start_call(prompt, generation_config)]
+        try:
+            delay = self._hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(calls, timeout=delay)
+                # A hedge is a second request against the quota: skip it when the bucket is empty
+                if not done and (self.scheduler is None or self.scheduler.try_acquire()):
+                    self.hedges_sent += 1
+                    calls.append(self._start_call(prompt, generation_config))
+            
+            pending = set(calls)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for call in done:
+                    if call.exception() is None:
+                        if call is not calls[0]:
+                            self.hedges_won += 1
+                        return call.result()
+                    error = call.exception()
+            raise error
+        finally:
+            for call in calls:
+                if not call.done():
+                    call.cancel()
+    
+    async def _generate(
+        self,
+        prompt: str,
+        timeout: Optional[float] = None,
+        operation: str = "generate",
+        schema: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Run one model call without blocking the event loop.
+        Uses the SDK's async API when available, otherwise a bounded executor pool.
+        
+        Args:
+            prompt: Prompt text
+            timeout: Deadline in seconds for this call (defaults to request_timeout)
+            operation: Label for the call's latency histogram
+            schema: Response schema to request JSON output against (when structured_output is on)
+        
+        Raises:
+            asyncio.TimeoutError: If the call exceeds its deadline
+        """
+        deadline = self.request_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        admission = self.breaker.allow() if self.breaker is not None else None
+        if self.breaker is not None and admission is None:
+            if self.metrics is not None:
+                self.metrics.inc("gemini_short_circuits_total", help_text="Gemini calls refused by the open circuit breaker",
+                                 operation=operation)
+            raise CircuitOpenError(f"Gemini circuit open ({self.breaker.last_trip_reason})")
+        
+        call_timing = {}
+        
+        async def call():
+            call_timing["started"] = loop.time()
+            generation_config = None
+            if schema is not None and self.structured_output:
+                generation_config = {"response_mime_type": "application/json", "response_schema": schema}
+            try:
+                try:
+                    response = await self._call(prompt, generation_config)
+                except Exception as e:
+                    if generation_config is None or not _rejects_response_schema(e):
+                        raise
+                    # Older models have no JSON mode; the prompt still spells out the schema
+                    self.structured_output = False
+                    log_event(logger, logging.WARNING, "gemini.structured_output_unsupported",
+                              f"⚠️  Model rejected response schemas, continuing without: {e}", error=str(e))
+                    response = await self._call(prompt)
+            finally:
+                call_timing["elapsed"] = loop.time() - call_timing["started"]
+            self._record_tokens(operation, prompt, response)
+            return response
+        
+        if self.scheduler is not None:
+            request = self.scheduler.submit(operation, (operation, prompt), call, deadline=deadline)
+        else:
+            request = call()
+        
+        # wait_for cancels the pending call(s) on timeout or when the caller is cancelled
+        outcome = "error"
+        try:
+            response = await asyncio.wait_for(request, timeout=deadline)
+            outcome = "ok"
+            return response
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise asyncio.TimeoutError(f"Gemini call exceeded {deadline}s deadline")
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            if self.breaker is not None:
+                if outcome == "timeout":
+                    # No answer in time counts against the model even if the call was still
+                    # queued behind slow calls: that is how a hung model shows up
+                    self.breaker.record(admission, False, loop.time() - started)
+                elif outcome == "cancelled" or "started" not in call_timing:
+                    # Nothing of ours reached the model: cancelled, or coalesced onto another
+                    # caller's identical request (which records its own outcome)
+                    self.breaker.release(admission)
+                else:
+                    self.breaker.record(admission, outcome == "ok",
+                                        call_timing.get("elapsed", loop.time() - call_timing["started"]))
+            if self.metrics is not None:
+                self.metrics.observe(
+                    "gemini_call_latency_seconds",
+                    loop.time() - started,
+                    "Latency of Gemini model calls",
+                    operation=operation,
+                    outcome=outcome
+                )
+    
+    def _parse(self, operation: str, text: str) -> Dict[str, Any]:
+        """Validated, normalized JSON of a response (raises ResponseParseError when unusable)"""
+        outcome = "invalid"
+        try:
+            value, outcome = self.parser.parse(operation, text)
+            return value
+        finally:
+            if self.metrics is not None:
+                self.metrics.inc("gemini_responses_total", help_text="Gemini responses by how their JSON was recovered",
+                                 operation=operation, outcome=outcome)
+    
+    def _record_tokens(self, operation: str, prompt: str, response):
+        """Account a successful call's tokens: the provider's usage metadata when present, else a local estimate"""
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt)
+        output_tokens = getattr(usage, "candidates_token_count", None)
+        if output_tokens is None:
+            try:
+                output_tokens = estimate_tokens(response.text)
+            except Exception:
+                output_tokens = 0
+        cached_tokens = getattr(usage, "cached_content_token_count", None) or 0
+        
+        self.token_usage.record(operation, prompt_tokens, output_tokens, cached_tokens)
+        if self.metrics is not None:
+            self.metrics.inc("gemini_prompt_tokens_total", prompt_tokens, "Prompt tokens sent to Gemini",
+                             operation=operation)
+            self.metrics.inc("gemini_output_tokens_total", output_tokens, "Tokens generated by Gemini",
+                             operation=operation)
+            if cached_tokens:
+                self.metrics.inc("gemini_cached_prompt_tokens_total", cached_tokens,
+                                 "Prompt tokens served from the provider's prompt cache", operation=operation)
+    
+    def close(self):
+        """Release the executor pool used for synchronous SDK calls"""
+        if self.scheduler is not None:
+            self.scheduler.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
     
-    async def analyze_incident(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_incident(
+        self,
+        incident_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Analyze incident using Gemini reasoning.
         
         Args:
             incident_data: Incident information from drone feed
+            timeout: Optional per-call deadline override in seconds
         
         Returns:
             Analysis with recommendations
         """
-        prompt = f"""
-You are an emergency response AI assistant for NeoGuard, a drone-based disaster response system.
-
-Analyze this incident and provide recommendations:
-
-Incident Data:
-- Type: {incident_data.get('disaster_type', 'unknown')}
-- Sector: {incident_data.get('sector_id', 'unknown')}
-- Confidence: {incident_data.get('confidence', 0) * 100:.1f}%
-- Description: {incident_data.get('description', 'No description')}
-- Coordinates: {incident_data.get('coordinates', {})}
-- Evidence: {incident_data.get('video_proof_url', 'No URL')}
-
-Please provide:
-1. Severity assessment (Critical/High/Medium/Low)
-2. Recommended actions (list 3-5 specific actions)
-3. Risk factors to consider
-4. Whether this should be reported to blockchain (yes/no with reasoning)
-5. Additional resources needed
-
-Format your response as JSON.
-"""
+        prompt = self.prompts.analyze_incident(incident_data)
         
         try:
-            response = self.model.generate_content(prompt)
-            analysis_text = response.text
-            
-            # Try to parse as JSON
-            try:
-                analysis = json.loads(analysis_text)
-            except json.JSONDecodeError:
-                # If not JSON, structure the response
-                analysis = {
-                    "raw_analysis": analysis_text,
-                    "severity": "High",
-                    "should_report": True,
-                    "timestamp": datetime.now().isoformat()
-                }
+            response = await self._generate(prompt, timeout, operation="analyze_incident",
+                                            schema=self.parser.schema("analyze_incident"))
+            analysis = self._parse("analyze_incident", response.text)
             
             return {
                 "status": "success",
@@ -91,50 +320,27 @@ Format your response as JSON.
                 "error": str(e)
             }
     
-    async def reason_about_network(self, network_state: Dict[str, Any]) -> Dict[str, Any]:
+    async def reason_about_network(
+        self,
+        network_state: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Use Gemini to reason about network requirements and state.
         
         Args:
             network_state: Current state of the drone network
+            timeout: Optional per-call deadline override in seconds
         
         Returns:
             Network analysis and recommendations
         """
-        prompt = f"""
-You are a network optimization AI for NeoGuard's drone swarm.
-
-Current Network State:
-{json.dumps(network_state, indent=2)}
-
-Please analyze and provide:
-1. Network health assessment
-2. Drone deployment recommendations
-3. Resource allocation suggestions
-4. Potential bottlenecks or issues
-5. Optimization opportunities
-
-Consider:
-- Battery levels and flight times
-- Signal strength and coverage
-- Sector coverage gaps
-- Response time requirements
-- Blockchain transaction costs
-
-Format your response as JSON with actionable insights.
-"""
+        prompt = self.prompts.reason_about_network(network_state)
         
         try:
-            response = self.model.generate_content(prompt)
-            reasoning_text = response.text
-            
-            try:
-                reasoning = json.loads(reasoning_text)
-            except json.JSONDecodeError:
-                reasoning = {
-                    "raw_reasoning": reasoning_text,
-                    "timestamp": datetime.now().isoformat()
-                }
+            response = await self._generate(prompt, timeout, operation="reason_about_network",
+                                            schema=self.parser.schema("reason_about_network"))
+            reasoning = self._parse("reason_about_network", response.text)
             
             return {
                 "status": "success",
@@ -154,7 +360,8 @@ Format your response as JSON with actionable insights.
         self,
         incident: Dict[str, Any],
         network_state: Dict[str, Any],
-        spoon_recommendation: Optional[str] = None
+        spoon_recommendation: Optional[str] = None,
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Collaborate with Spoon OS (or provide independent reasoning if Spoon failed).
@@ -163,45 +370,18 @@ Format your response as JSON with actionable insights.
             incident: Incident data
             network_state: Current network state
             spoon_recommendation: Optional recommendation from Spoon OS
+            timeout: Optional per-call deadline override in seconds
         
         Returns:
-            Collaborative decision
+            Collaborative decision (confidence in percent); status "error" if the
+            response is not a valid decision
         """
-        spoon_context = f"\nSpoon OS Recommendation: {spoon_recommendation}" if spoon_recommendation else "\nSpoon OS: No recommendation available (fallback mode)"
-        
-        prompt = f"""
-You are part of a collaborative AI system for NeoGuard emergency response.
-
-Incident:
-{json.dumps(incident, indent=2)}
-
-Network State:
-{json.dumps(network_state, indent=2)}
-
-{spoon_context}
-
-Based on this information, provide a final decision:
-1. Should this incident be reported to the blockchain? (yes/no)
-2. Confidence level in this decision (0-100%)
-3. Reasoning for the decision
-4. Alternative actions to consider
-5. Risk assessment
-
-Format as JSON with clear decision logic.
-"""
+        prompt = self.prompts.collaborate_on_decision(incident, network_state, spoon_recommendation)
         
         try:
-            response = self.model.generate_content(prompt)
-            decision_text = response.text
-            
-            try:
-                decision = json.loads(decision_text)
-            except json.JSONDecodeError:
-                decision = {
-                    "raw_decision": decision_text,
-                    "should_report": True,
-                    "confidence": 0.85
-                }
+            response = await self._generate(prompt, timeout, operation="collaborate_on_decision",
+                                            schema=self.parser.schema("collaborate_on_decision"))
+            decision = self._parse("collaborate_on_decision", response.text)
             
             return {
                 "status": "success",
@@ -215,70 +395,99 @@ Format as JSON with clear decision logic.
             return {
                 "status": "error",
                 "message": f"Collaborative decision failed: {str(e)}",
-                "error": str(e)
+                "error": str(e),
+                "circuit_open": isinstance(e, CircuitOpenError)
+            }
+    
+    async def assess_and_decide(
+        self,
+        incident: Dict[str, Any],
+        network_state: Dict[str, Any],
+        spoon_recommendation: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Produce the severity assessment and the report/hold decision in one model call.
+        Replaces the analyze_incident + collaborate_on_decision round trips.
+        
+        Args:
+            incident: Incident data
+            network_state: Current network state
+            spoon_recommendation: Optional recommendation from Spoon OS
+            timeout: Optional per-call deadline override in seconds
+        
+        Returns:
+            Dict with "analysis" and "decision" sections (confidence in percent);
+            status "error" if the response is not a valid assessment
+        """
+        prompt = self.prompts.assess_and_decide(incident, network_state, spoon_recommendation)
+        
+        try:
+            response = await self._generate(prompt, timeout, operation="assess_and_decide",
+                                            schema=self.parser.schema("assess_and_decide"))
+            fused = self._parse("assess_and_decide", response.text)
+            analysis = fused["analysis"]
+            decision = fused["decision"]
+            
+            return {
+                "status": "success",
+                "analysis": analysis,
+                "decision": decision,
+                "model": "gemini-pro",
+                "collaboration_mode": "fallback" if not spoon_recommendation else "hybrid",
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Fused decision failed: {str(e)}",
+                "error": str(e),
+                "circuit_open": isinstance(e, CircuitOpenError)
             }
     
-    async def generate_incident_report(self, incident: Dict[str, Any]) -> str:
+    async def generate_incident_report(
+        self,
+        incident: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> str:
         """
         Generate a human-readable incident report.
         
         Args:
             incident: Incident data
+            timeout: Optional per-call deadline override in seconds
         
         Returns:
             Formatted incident report
         """
-        prompt = f"""
-Generate a professional incident report for emergency responders:
-
-Incident Details:
-{json.dumps(incident, indent=2)}
-
-Include:
-- Executive Summary
-- Incident Classification
-- Location and Coordinates
-- Severity Assessment
-- Recommended Response
-- Evidence Links
-- Timestamp
-
-Make it concise but comprehensive.
-"""
+        prompt = self.prompts.generate_incident_report(incident)
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt, timeout, operation="generate_incident_report")
             return response.text
         except Exception as e:
             return f"Error generating report: {str(e)}"
     
-    async def query_network_requirements(self, query: str) -> Dict[str, Any]:
+    async def query_network_requirements(
+        self,
+        query: str,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Query Gemini about network requirements and best practices.
         
         Args:
             query: Question about network requirements
+            timeout: Optional per-call deadline override in seconds
         
         Returns:
             Answer with reasoning
         """
-        prompt = f"""
-You are an expert in drone swarm networks and emergency response systems.
-
-Question: {query}
-
-Provide a detailed answer considering:
-- NeoGuard's architecture
-- Neo blockchain integration
-- Drone coordination
-- Real-time response requirements
-- Scalability and reliability
-
-Format your response clearly with actionable insights.
-"""
+        prompt = self.prompts.query_network_requirements(query)
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt, timeout, operation="query_network_requirements")
             return {
                 "status": "success",
                 "answer": response.text,
@@ -297,14 +506,36 @@ class HybridAgent:
     """
     Hybrid agent that uses Spoon OS primarily with Gemini fallback.
     Enables collaboration between both systems for better reasoning.
+    
+    Decision modes:
+        sequential: analyze_incident, then collaborate_on_decision (two round trips)
+        concurrent: both calls in flight at once (latency of the slower call)
+        fused: one assess_and_decide call returning severity and decision
     """
     
-    def __init__(self, spoon_agent=None, gemini_api_key: Optional[str] = None):
-        """Initialize hybrid agent"""
+    DECISION_MODES = ("sequential", "concurrent", "fused")
+    
+    def __init__(
+        self,
+        spoon_agent=None,
+        gemini_api_key: Optional[str] = None,
+        gemini_agent: Optional[GeminiFallbackAgent] = None,
+        decision_mode: str = "fused"
+    ):
+        """
+        Initialize hybrid agent.
+        
+        Args:
+            spoon_agent: Owning Spoon OS agent
+            gemini_api_key: Gemini API key, used when no gemini_agent is given
+            gemini_agent: Existing Gemini agent to share (keeps one executor pool and timeout policy)
+            decision_mode: One of DECISION_MODES
+        """
         self.spoon_agent = spoon_agent
-        self.gemini_agent = GeminiFallbackAgent(api_key=gemini_api_key)
+        self.gemini_agent = gemini_agent or GeminiFallbackAgent(api_key=gemini_api_key)
         self.name = "NeoGuard Hybrid Agent"
         self.fallback_active = False
+        self.decision_mode = decision_mode if decision_mode in self.DECISION_MODES else "fused"
     
     async def process_incident(
         self,
@@ -332,27 +563,46 @@ class HybridAgent:
         spoon_recommendation = None
         if self.spoon_agent:
             try:
-                print("🥄 Attempting Spoon OS analysis...")
+                log_event(incident_log, logging.DEBUG, "hybrid.spoon_os", "🥄 Attempting Spoon OS analysis...")
                 # Spoon OS would analyze here
                 spoon_recommendation = "Spoon OS analysis pending"
                 result["agents_used"].append("spoon_os")
             except Exception as e:
-                print(f"⚠️  Spoon OS failed: {e}")
+                log_event(logger, logging.WARNING, "hybrid.spoon_os_failed", f"⚠️  Spoon OS failed: {e}", error=str(e))
                 self.fallback_active = True
         
+        if self.decision_mode == "fused":
+            await self._fused_decision(result, incident, network_state, spoon_recommendation)
+        elif self.decision_mode == "concurrent":
+            await self._concurrent_decision(result, incident, network_state, spoon_recommendation)
+        else:
+            await self._sequential_decision(result, incident, network_state, spoon_recommendation)
+        
+        result["decision_mode"] = self.decision_mode
+        result["fallback_active"] = self.fallback_active
+        return result
+    
+    async def _sequential_decision(
+        self,
+        result: Dict[str, Any],
+        incident: Dict[str, Any],
+        network_state: Dict[str, Any],
+        spoon_recommendation: Optional[str]
+    ):
+        """Analysis then collaborative decision, one round trip after the other"""
         # Use Gemini for analysis
         try:
-            print("🤖 Gemini analysis starting...")
+            log_event(incident_log, logging.DEBUG, "hybrid.analysis", "🤖 Gemini analysis starting...")
             gemini_analysis = await self.gemini_agent.analyze_incident(incident)
             result["gemini_analysis"] = gemini_analysis
             result["agents_used"].append("gemini")
         except Exception as e:
-            print(f"❌ Gemini analysis failed: {e}")
+            log_event(logger, logging.WARNING, "hybrid.analysis_failed", f"❌ Gemini analysis failed: {e}", error=str(e))
             result["gemini_error"] = str(e)
         
         # Collaborative decision
         try:
-            print("🤝 Collaborative decision making...")
+            log_event(incident_log, logging.DEBUG, "hybrid.decision", "🤝 Collaborative decision making...")
             decision = await self.gemini_agent.collaborate_on_decision(
                 incident=incident,
                 network_state=network_state,
@@ -360,8 +610,77 @@ class HybridAgent:
             )
             result["decision"] = decision
         except Exception as e:
-            print(f"❌ Decision making failed: {e}")
+            log_event(logger, logging.WARNING, "hybrid.decision_failed", f"❌ Decision making failed: {e}", error=str(e))
             result["decision_error"] = str(e)
+    
+    async def _concurrent_decision(
+        self,
+        result: Dict[str, Any],
+        incident: Dict[str, Any],
+        network_state: Dict[str, Any],
+        spoon_recommendation: Optional[str]
+    ):
+        """Analysis and collaborative decision in flight at the same time (they are independent)"""
+        log_event(incident_log, logging.DEBUG, "hybrid.concurrent", "🤖🤝 Gemini analysis and decision running concurrently...")
+        gemini_analysis, decision = await asyncio.gather(
+            self.gemini_agent.analyze_incident(incident),
+            self.gemini_agent.collaborate_on_decision(
+                incident=incident,
+                network_state=network_state,
+                spoon_recommendation=spoon_recommendation
+            ),
+            return_exceptions=True
+        )
         
-        result["fallback_active"] = self.fallback_active
-        return result
+        if isinstance(gemini_analysis, Exception):
+            log_event(logger, logging.WARNING, "hybrid.analysis_failed", f"❌ Gemini analysis failed: {gemini_analysis}",
+                      error=str(gemini_analysis))
+            result["gemini_error"] = str(gemini_analysis)
+        else:
+            result["gemini_analysis"] = gemini_analysis
+            result["agents_used"].append("gemini")
+        
+        if isinstance(decision, Exception):
+            log_event(logger, logging.WARNING, "hybrid.decision_failed", f"❌ Decision making failed: {decision}",
+                      error=str(decision))
+            result["decision_error"] = str(decision)
+        else:
+            result["decision"] = decision
+    
+    async def _fused_decision(
+        self,
+        result: Dict[str, Any],
+        incident: Dict[str, Any],
+        network_state: Dict[str, Any],
+        spoon_recommendation: Optional[str]
+    ):
+        """Severity assessment and decision from a single round trip"""
+        try:
+            log_event(incident_log, logging.DEBUG, "hybrid.fused", "🤖 Gemini fused assessment + decision...")
+            fused = await self.gemini_agent.assess_and_decide(
+                incident=incident,
+                network_state=network_state,
+                spoon_recommendation=spoon_recommendation
+            )
+            result["agents_used"].append("gemini")
+        except Exception as e:
+            log_event(logger, logging.WARNING, "hybrid.fused_failed", f"❌ Fused decision failed: {e}", error=str(e))
+            result["decision_error"] = str(e)
+            return
+        
+        if fused["status"] != "success":
+            result["gemini_analysis"] = fused
+            result["decision"] = fused
+            return
+        
+        shared = {
+            "status": "success",
+            "model": fused["model"],
+            "timestamp": fused["timestamp"]
+        }
+        result["gemini_analysis"] = {**shared, "analysis": fused["analysis"]}
+        result["decision"] = {
+            **shared,
+            "decision": fused["decision"],
+            "collaboration_mode": fused["collaboration_mode"]
+        }
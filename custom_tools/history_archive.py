@@ -0,0 +1,257 @@
+"""
+History Archive
+Append-only, time-partitioned archive of fixed-size binary records for sector
+scans, swarm telemetry and incidents.
+Each stream has a NumPy structured dtype; records are appended to one file per
+time partition and read back through np.memmap, so range queries return views
+into the page cache instead of Python objects.
+
+Layout:
+    <path>/<stream>/<partition_start>.bin
+    16-byte header (magic, version, record size) followed by records in time order
+"""
+
+import os
+import struct
+import time
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator, Callable
+
+import numpy as np
+
+MAGIC = b"NGARCH\x00\x01"
+HEADER = struct.Struct("<8sII")
+FORMAT_VERSION = 1
+
+SCAN_STATUSES = ("clear", "CRITICAL_ALERT")
+INCIDENT_OUTCOMES = ("held", "rejected", "queued", "reported", "failed", "merged")
+
+STREAMS: Dict[str, np.dtype] = {
+    "scans": np.dtype([
+        ("ts", "<f8"),
+        ("sector_id", "S24"),
+        ("status", "u1"),
+        ("disaster_type", "S16"),
+        ("confidence", "<f4"),
+        ("lat", "<f8"),
+        ("lng", "<f8")
+    ]),
+    "telemetry": np.dtype([
+        ("ts", "<f8"),
+        ("drone_id", "S16"),
+        ("battery", "<f4"),
+        ("lat", "<f8"),
+        ("lng", "<f8"),
+        ("deployed", "u1")
+    ]),
+    "incidents": np.dtype([
+        ("ts", "<f8"),
+        ("incident_id", "S32"),
+        ("sector_id", "S24"),
+        ("disaster_type", "S16"),
+        ("confidence", "<f4"),
+        ("lat", "<f8"),
+        ("lng", "<f8"),
+        ("outcome", "u1")
+    ])
+}
+
+
+def encode_column(stream: str, field: str, values: Iterable[Any]) -> np.ndarray:
+    """
+    Encode strings for a fixed-width bytes field of a stream.
+    
+    Raises:
+        ValueError: If a value is longer than the field (NumPy would silently truncate it)
+    """
+    dtype = STREAMS[stream][field]
+    encoded = [value.encode("utf-8") if isinstance(value, str) else bytes(value) for value in values]
+    for value in encoded:
+        if len(value) > dtype.itemsize:
+            raise ValueError(
+                f"{stream}.{field} holds at most {dtype.itemsize} bytes; {value!r} has {len(value)}"
+            )
+    return np.array(encoded, dtype=dtype)
+
+
+def to_dicts(records: np.ndarray) -> List[Dict[str, Any]]:
+    """Decode records into plain dicts (for small result sets only)"""
+    names = records.dtype.names
+    rows = []
+    for record in records.tolist():
+        row = {}
+        for name, value in zip(names, record):
+            row[name] = value.decode("utf-8", "replace") if isinstance(value, bytes) else value
+        rows.append(row)
+    return rows
+
+
+class HistoryArchive:
+    """
+    Time-partitioned archive of fixed-record streams.
+    
+    Appends within a stream are expected in (roughly) time order: each partition
+    is binary-searched on "ts", so out-of-order records only blur range edges.
+    """
+    
+    def __init__(
+        self,
+        path: str = "neoguard_archive",
+        partition_seconds: int = 3600,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        """
+        Open (or create) an archive directory.
+        
+        Args:
+            path: Archive root directory
+            partition_seconds: Time span covered by one partition file
+            clock: Time source for records appended without a timestamp (defaults to time.time)
+        """
+        self.path = path
+        self.partition_seconds = max(1, int(partition_seconds))
+        self.clock = clock or time.time
+        self._writers: Dict[str, Tuple[int, Any]] = {}
+        self.records_written = 0
+    
+    def new_records(self, stream: str, count: int) -> np.ndarray:
+        """Zeroed record array for a stream, to be filled column by column"""
+        return np.zeros(count, dtype=STREAMS[stream])
+    
+    def _partition_path(self, stream: str, partition: int) -> str:
+        return os.path.join(self.path, stream, f"{partition}.bin")
+    
+    def _writer(self, stream: str, partition: int):
+        current = self._writers.get(stream)
+        if current is not None and current[0] == partition:
+            return current[1]
+        if current is not None:
+            current[1].close()
+        
+        dtype = STREAMS[stream]
+        path = self._partition_path(stream, partition)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle = open(path, "ab")
+        size = handle.tell()
+        if size == 0:
+            handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, dtype.itemsize))
+        else:
+            # Drop a partial record left by a crash mid-append
+            whole = HEADER.size + (size - HEADER.size) // dtype.itemsize * dtype.itemsize
+            if whole != size:
+                handle.truncate(whole)
+        handle.flush()
+        self._writers[stream] = (partition, handle)
+        return handle
+    
+    def append(self, stream: str, records: np.ndarray):
+        """
+        Append records to a stream.
+        Records with ts == 0 are stamped with the current time.
+        """
+        if not len(records):
+            return
+        records = np.asarray(records, dtype=STREAMS[stream])
+        unstamped = records["ts"] == 0
+        if unstamped.any():
+            records = records.copy()
+            records["ts"][unstamped] = self.clock()
+        
+        partitions = (records["ts"] // self.partition_seconds).astype(np.int64) * self.partition_seconds
+        if (partitions[1:] < partitions[:-1]).any():
+            order = np.argsort(partitions, kind="stable")
+            records = records[order]
+            partitions = partitions[order]
+        boundaries = np.flatnonzero(partitions[1:] != partitions[:-1]) + 1
+        
+        for lo, hi in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [len(records)]))):
+            handle = self._writer(stream, int(partitions[lo]))
+            handle.write(records[lo:hi].tobytes())
+            handle.flush()
+        self.records_written += len(records)
+    
+    def append_rows(self, stream: str, rows: List[Dict[str, Any]]):
+        """Append records given as dicts (missing fields are zero; over-long strings raise ValueError)"""
+        records = self.new_records(stream, len(rows))
+        for n, row in enumerate(rows):
+            for name, value in row.items():
+                if isinstance(value, (str, bytes)):
+                    value = encode_column(stream, name, [value])[0]
+                records[name][n] = value
+        self.append(stream, records)
+    
+    def partitions(self, stream: str, start: Optional[float] = None, end: Optional[float] = None) -> List[Tuple[int, str]]:
+        """(partition_start, path) of the partitions overlapping [start, end), oldest first"""
+        directory = os.path.join(self.path, stream)
+        if not os.path.isdir(directory):
+            return []
+        found = []
+        for name in os.listdir(directory):
+            if not name.endswith(".bin"):
+                continue
+            partition = int(name[:-4])
+            if start is not None and partition + self.partition_seconds <= start:
+                continue
+            if end is not None and partition >= end:
+                continue
+            found.append((partition, os.path.join(directory, name)))
+        found.sort()
+        return found
+    
+    def _open(self, stream: str, path: str) -> Optional[np.ndarray]:
+        dtype = STREAMS[stream]
+        size = os.path.getsize(path)
+        count = (size - HEADER.size) // dtype.itemsize if size > HEADER.size else 0
+        if count <= 0:
+            return None
+        with open(path, "rb") as f:
+            magic, version, itemsize = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or itemsize != dtype.itemsize:
+            raise ValueError(f"{path} is not a {stream} archive partition (version {version})")
+        return np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,))
+    
+    def iter_range(self, stream: str, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[np.ndarray]:
+        """
+        Records with start <= ts < end, one zero-copy memmap view per partition.
+        Views stay valid while referenced; records appended later are not included.
+        """
+        for _, path in self.partitions(stream, start, end):
+            records = self._open(stream, path)
+            if records is None:
+                continue
+            ts = records["ts"]
+            lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+            hi = len(records) if end is None else int(np.searchsorted(ts, end, side="left"))
+            if hi > lo:
+                yield records[lo:hi]
+    
+    def query(self, stream: str, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Records with start <= ts < end as one array (copies only when several partitions match)"""
+        views = list(self.iter_range(stream, start, end))
+        if not views:
+            return self.new_records(stream, 0)
+        if len(views) == 1:
+            return views[0]
+        return np.concatenate(views)
+    
+    def count(self, stream: str, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        return sum(len(view) for view in self.iter_range(stream, start, end))
+    
+    def prune(self, before: float) -> int:
+        """Delete partitions that end at or before `before`; returns the number removed"""
+        removed = 0
+        for stream in STREAMS:
+            current = self._writers.get(stream)
+            for partition, path in self.partitions(stream, end=before):
+                if partition + self.partition_seconds > before:
+                    continue
+                if current is not None and current[0] == partition:
+                    current[1].close()
+                    del self._writers[stream]
+                os.remove(path)
+                removed += 1
+        return removed
+    
+    def close(self):
+        for _, handle in self._writers.values():
+            handle.close()
+        self._writers = {}
@@ -0,0 +1,201 @@
+"""
+Incident Deduplication Index
+Spatio-temporal index that merges repeat sightings of the same incident.
+Incidents are bucketed by sector, geohash cell of their coordinates and disaster type;
+a sighting within the time window of an open incident becomes an update instead of a new report,
+unless it lifts an unreported incident's confidence across the reporting threshold.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, List, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 6) -> str:
+    """Encode a coordinate as a geohash string of `precision` characters"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits = bits << 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """Return the (lat, lng) size in degrees of a geohash cell at `precision`"""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def geohash_neighborhood(lat: float, lng: float, precision: int = 6) -> List[str]:
+    """Return the geohash of a coordinate followed by its 8 surrounding cells"""
+    lat_step, lng_step = geohash_cell_size(precision)
+    center = geohash_encode(lat, lng, precision)
+    cells = [center]
+    for dlat in (-lat_step, 0.0, lat_step):
+        for dlng in (-lng_step, 0.0, lng_step):
+            if dlat == 0.0 and dlng == 0.0:
+                continue
+            cell = geohash_encode(
+                max(-90.0, min(90.0, lat + dlat)),
+                ((lng + dlng + 180.0) % 360.0) - 180.0,
+                precision
+            )
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+class IncidentIndex:
+    """
+    Deduplication index between drone-feed detection and incident analysis.
+    Lookups check a constant number of buckets (the incident's cell and its neighbors),
+    so cost stays O(1) regardless of how many incidents are open.
+    """
+    
+    def __init__(
+        self,
+        window_seconds: float = 600.0,
+        geohash_precision: int = 6,
+        escalate_at: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the incident index.
+        
+        Args:
+            window_seconds: How long after its last sighting an incident stays open for merging
+            geohash_precision: Geohash length used for spatial buckets (6 ≈ 1.2km x 0.6km)
+            escalate_at: Reporting threshold; a merged sighting that lifts an unreported
+                incident's max_confidence to it re-submits the incident once (None disables)
+            clock: Monotonic time source
+        """
+        self.window_seconds = window_seconds
+        self.geohash_precision = geohash_precision
+        self._clock = clock
+        # Ordered by last sighting so expired incidents can be pruned from the front
+        self._open: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self.escalate_at = escalate_at
+        
+        self.new_incidents = 0
+        self.merged_sightings = 0
+        self.resubmitted = 0
+    
+    def _bucket_keys(self, incident: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+        """Bucket keys for the incident's own cell followed by its neighbors"""
+        sector_id = incident.get("sector_id", "unknown")
+        disaster_type = str(incident.get("disaster_type", "unknown")).lower()
+        coordinates = incident.get("coordinates") or {}
+        lat = coordinates.get("lat")
+        lng = coordinates.get("lng")
+        
+        if lat is None or lng is None:
+            return [(sector_id, "", disaster_type)]
+        
+        return [
+            (sector_id, cell, disaster_type)
+            for cell in geohash_neighborhood(lat, lng, self.geohash_precision)
+        ]
+    
+    def _prune(self, now: float):
+        """Close incidents whose last sighting fell out of the window"""
+        while self._open:
+            record = next(iter(self._open.values()))
+            if now - record["last_seen"] <= self.window_seconds:
+                break
+            _, expired = self._open.popitem(last=False)
+            self._by_id.pop(expired["incident_id"], None)
+    
+    def observe(self, incident: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Record a sighting.
+        
+        Args:
+            incident: Incident from the drone feed
+        
+        Returns:
+            (record, is_new) - is_new is False when the sighting was merged into an open incident,
+            except for the one sighting that lifts an unreported incident to escalate_at
+        """
+        now = self._clock()
+        self._prune(now)
+        
+        keys = self._bucket_keys(incident)
+        for key in keys:
+            record = self._open.get(key)
+            if record is None:
+                continue
+            
+            previous_max = record["max_confidence"]
+            record["sightings"] += 1
+            record["last_seen"] = now
+            record["max_confidence"] = max(previous_max, incident.get("confidence", 0))
+            record["latest"] = incident
+            self._open.move_to_end(key)
+            self.merged_sightings += 1
+            
+            # An incident held at low confidence gets one more evaluation once a sighting crosses the threshold
+            if (self.escalate_at is not None and not record["reported"] and not record["resubmitted"]
+                    and previous_max < self.escalate_at <= record["max_confidence"]):
+                record["resubmitted"] = True
+                self.resubmitted += 1
+                return record, True
+            return record, False
+        
+        record = {
+            "incident_id": uuid.uuid4().hex,
+            "incident": incident,
+            "latest": incident,
+            "sightings": 1,
+            "first_seen": now,
+            "last_seen": now,
+            "max_confidence": incident.get("confidence", 0),
+            "reported": False,
+            "resubmitted": False
+        }
+        self._open[keys[0]] = record
+        self._by_id[record["incident_id"]] = record
+        self.new_incidents += 1
+        return record, True
+    
+    def mark_reported(self, incident_id: str):
+        """Record that an open incident was reported, so later sightings never re-submit it"""
+        record = self._by_id.get(incident_id)
+        if record is not None:
+            record["reported"] = True
+    
+    def __len__(self) -> int:
+        return len(self._open)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return open incident count and merge counters"""
+        return {
+            "open_incidents": len(self._open),
+            "new_incidents": self.new_incidents,
+            "merged_sightings": self.merged_sightings,
+            "resubmitted": self.resubmitted
+        }
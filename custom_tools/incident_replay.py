@@ -0,0 +1,255 @@
+"""
+Incident Record and Replay
+Captures the incident stream an agent sees (every sector scan, plus the latency
+and result of each model decision and chain report) to a compact JSONL log, and
+feeds such a log back at 1x, Nx or maximum speed so bursts seen in production
+can be reproduced and load-tested offline.
+
+Either consumer (the agent or the drone feed server) can replay a log recorded
+by either source; incidents are converted to the consumer's shape on the way out.
+
+Log format (one JSON object per line, compact separators):
+    {"format": "neoguard-replay", "version": 1, "source": "agent", "started": <epoch>}
+    {"t": <seconds since start>, "k": "scan", "s": <sector_id>, "i": <incident or null>}
+    {"t": ..., "k": "decision", "key": <evidence url>, "ms": <latency>, "r": <result>}
+    {"t": ..., "k": "report", "key": <evidence url>, "ms": <latency>, "r": <result>}
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Deque, AsyncIterator
+
+FORMAT = "neoguard-replay"
+FORMAT_VERSION = 1
+SOURCES = ("agent", "drone_feed")
+
+
+def _dumps(entry: Dict[str, Any]) -> str:
+    return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+def to_agent_incident(scan: Dict[str, Any]) -> Dict[str, Any]:
+    """Agent incident from a drone feed CRITICAL_ALERT scan"""
+    coordinates = scan["coordinates"]
+    return {
+        "sector_id": scan["sector_id"],
+        "disaster_type": scan["disaster_type"],
+        "name": scan["detected_object"],
+        "confidence": scan["confidence"],
+        "description": scan["description"],
+        "coordinates": {"lat": coordinates["lat"], "lng": coordinates["lng"]},
+        "video_proof_url": scan["video_proof_url"]
+    }
+
+
+def to_feed_incident(incident: Dict[str, Any]) -> Dict[str, Any]:
+    """Drone feed CRITICAL_ALERT scan from an agent incident"""
+    return {
+        "sector_id": incident["sector_id"],
+        "timestamp": datetime.now().isoformat(),
+        "status": "CRITICAL_ALERT",
+        "detected_object": incident["name"],
+        "disaster_type": incident["disaster_type"],
+        "confidence": incident["confidence"],
+        "description": incident["description"],
+        "coordinates": incident["coordinates"],
+        "video_proof_url": incident["video_proof_url"],
+        "recommended_action": "IMMEDIATE_REPORT_TO_BLOCKCHAIN"
+    }
+
+
+# (recorded source, consumer) -> incident conversion; same-source replays pass through
+_CONVERSIONS = {
+    ("drone_feed", "agent"): to_agent_incident,
+    ("agent", "drone_feed"): to_feed_incident
+}
+
+
+class IncidentRecorder:
+    """
+    Append-only JSONL recorder; lines are buffered and written on flush() or close().
+    The file is created (replacing any existing one) on the first flush.
+    """
+    
+    def __init__(self, path: str, source: str = "agent", flush_every: int = 256):
+        """
+        Start a new recording.
+        
+        Args:
+            path: Log file path
+            source: What produced the stream ("agent" or "drone_feed")
+            flush_every: Buffered lines written per flush
+        """
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.started = time.time()
+        self._origin = time.perf_counter()
+        self._buffer: List[str] = [_dumps({
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "source": source,
+            "started": self.started
+        })]
+        self._file = None
+        self.events = 0
+    
+    def _write(self, entry: Dict[str, Any]):
+        entry["t"] = round(time.perf_counter() - self._origin, 6)
+        self._buffer.append(_dumps(entry))
+        self.events += 1
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+    
+    def record_scan(self, sector_id: str, incident: Optional[Dict[str, Any]]):
+        """One sector scan and what it found (None for a clear scan)"""
+        self._write({"k": "scan", "s": sector_id, "i": incident})
+    
+    def record_decision(self, key: str, latency_seconds: float, result: Dict[str, Any]):
+        """Latency and result of one model decision for the incident with evidence `key`"""
+        self._write({"k": "decision", "key": key, "ms": round(latency_seconds * 1000, 3), "r": result})
+    
+    def record_report(self, key: str, latency_seconds: float, result: Dict[str, Any]):
+        """Latency and result of one chain report for the incident with evidence `key`"""
+        self._write({"k": "report", "key": key, "ms": round(latency_seconds * 1000, 3), "r": result})
+    
+    def flush(self):
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._file.flush()
+        self._buffer = []
+    
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+
+
+class IncidentReplay:
+    """
+    A loaded recording.
+    
+    speed scales recorded timing: 1.0 is real time, 10.0 is ten times faster,
+    None (or 0) replays at maximum speed with no waiting at all.
+    consumer ("agent" or "drone_feed") selects the shape replayed incidents take.
+    """
+    
+    def __init__(self, path: str, speed: Optional[float] = 1.0, consumer: str = "agent"):
+        if consumer not in SOURCES:
+            raise ValueError(f"Unknown replay consumer {consumer!r} (expected one of {', '.join(SOURCES)})")
+        self.path = path
+        self.speed = speed if speed else None
+        self.consumer = consumer
+        self.scans: List[Tuple[float, str, Optional[Dict[str, Any]]]] = []
+        self.decisions: Dict[str, Deque[Tuple[float, Dict[str, Any]]]] = {}
+        self.reports: Dict[str, Deque[Tuple[float, Dict[str, Any]]]] = {}
+        self._by_sector: Dict[str, Deque[Optional[Dict[str, Any]]]] = {}
+        
+        with open(path, encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != FORMAT:
+                raise ValueError(f"{path} is not a NeoGuard replay log")
+            self.source = header.get("source", "agent")
+            if self.source not in SOURCES:
+                raise ValueError(f"{path} was recorded by unknown source {self.source!r} "
+                                 f"(expected one of {', '.join(SOURCES)})")
+            self._convert = _CONVERSIONS.get((self.source, consumer), dict)
+            self.started = header.get("started")
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                kind = entry["k"]
+                if kind == "scan":
+                    self.scans.append((entry["t"], entry["s"], entry["i"]))
+                    self._by_sector.setdefault(entry["s"], deque()).append(entry["i"])
+                elif kind == "decision":
+                    self.decisions.setdefault(entry["key"], deque()).append((entry["ms"] / 1000, entry["r"]))
+                elif kind == "report":
+                    self.reports.setdefault(entry["key"], deque()).append((entry["ms"] / 1000, entry["r"]))
+    
+    @property
+    def duration(self) -> float:
+        """Recorded span from the first to the last scan, in seconds"""
+        return self.scans[-1][0] - self.scans[0][0] if self.scans else 0.0
+    
+    @property
+    def incident_count(self) -> int:
+        return sum(1 for _, _, incident in self.scans if incident is not None)
+    
+    async def scan_events(self) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Recorded scans as (sector_id, incident), released on the recorded schedule.
+        Pacing is anchored to the replay start, so slow consumers never add drift.
+        """
+        if not self.scans:
+            return
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first = self.scans[0][0]
+        for offset, sector_id, incident in self.scans:
+            if self.speed is not None:
+                delay = started + (offset - first) / self.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield sector_id, self._convert(incident) if incident is not None else None
+    
+    def next_scan(self, sector_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Pull-style replay for scanners: the next recorded result of a sector.
+        Returns (False, None) once the sector's recording is exhausted.
+        """
+        pending = self._by_sector.get(sector_id)
+        if not pending:
+            return False, None
+        incident = pending.popleft()
+        return True, self._convert(incident) if incident is not None else None
+    
+    async def _replay(self, table: Dict[str, Deque[Tuple[float, Dict[str, Any]]]], key: str) -> Optional[Dict[str, Any]]:
+        pending = table.get(key)
+        if not pending:
+            return None
+        latency, result = pending.popleft()
+        if self.speed is not None:
+            await asyncio.sleep(latency / self.speed)
+        return result
+    
+    async def decision(self, key: str) -> Optional[Dict[str, Any]]:
+        """Recorded decision result for an incident, after its (scaled) recorded latency"""
+        return await self._replay(self.decisions, key)
+    
+    async def report(self, key: str) -> Optional[Dict[str, Any]]:
+        """Recorded report result for an incident, after its (scaled) recorded latency"""
+        return await self._replay(self.reports, key)
+
+
+class ReplayHybridAgent:
+    """Stands in for HybridAgent during replay: returns the recorded decision"""
+    
+    def __init__(self, replay: IncidentReplay):
+        self.replay = replay
+    
+    async def process_incident(self, incident: Dict[str, Any], network_state: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self.replay.decision(incident.get("video_proof_url", ""))
+        if result is None:
+            return {"decision_error": "No recorded decision for this incident"}
+        return result
+
+
+class ReplayReportTool:
+    """Stands in for NeoReportTool during replay: returns the recorded chain result"""
+    
+    def __init__(self, replay: IncidentReplay):
+        self.replay = replay
+    
+    async def run_async(self, disaster_type: str, evidence_link: str, sector_id: str,
+                        confidence: float, coordinates: Optional[dict] = None) -> dict:
+        result = await self.replay.report(evidence_link)
+        if result is None:
+            return {"status": "error", "message": "No recorded report for this incident"}
+        return result
@@ -0,0 +1,283 @@
+"""
+LLM Request Scheduler
+Shared front door for model calls: a token bucket keeps the request rate inside
+the API quota, a priority queue lets decision calls overtake background work
+(network reasoning, report generation), and identical requests already in
+flight are coalesced so concurrent callers share one response (singleflight).
+Each call runs under its request's deadline and is cancelled once every caller
+has given up, so a hung call cannot hold a concurrency slot.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Optional, Dict, Any, Callable, Awaitable, Hashable, List, Tuple
+
+# Lower runs first; operations not listed get DEFAULT_PRIORITY
+DEFAULT_PRIORITIES = {
+    "assess_and_decide": 0,
+    "collaborate_on_decision": 0,
+    "analyze_incident": 1,
+    "query_network_requirements": 2,
+    "reason_about_network": 2,
+    "generate_incident_report": 3
+}
+DEFAULT_PRIORITY = 2
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """Whether an exception looks like an API rate-limit / quota rejection"""
+    text = f"{type(error).__name__} {error}".lower()
+    return "resourceexhausted" in text or "429" in text or "quota" in text or "rate limit" in text
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second, holding at most `burst`"""
+    
+    def __init__(self, rate: float, burst: float, clock: Optional[Callable[[], float]] = None):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.clock = clock or time.monotonic
+        self.tokens = self.burst
+        self._updated = self.clock()
+        self._paused_until = 0.0
+    
+    def _refill(self, now: float):
+        if now > self._updated:
+            start = max(self._updated, min(now, self._paused_until))
+            self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+            self._updated = now
+    
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        now = self.clock()
+        self._refill(now)
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+    
+    def take(self):
+        self.tokens -= 1
+    
+    def pause(self, seconds: float):
+        """Empty the bucket and stop refilling for `seconds` (after a quota rejection)"""
+        now = self.clock()
+        self._refill(now)
+        self.tokens = 0.0
+        self._paused_until = max(self._paused_until, now + seconds)
+
+
+class _Request:
+    __slots__ = ("key", "factory", "future", "waiters", "enqueued", "deadline", "task")
+    
+    def __init__(self, key: Hashable, factory: Callable[[], Awaitable[Any]], future: asyncio.Future, enqueued: float,
+                 deadline: Optional[float]):
+        self.key = key
+        self.factory = factory
+        self.future = future
+        self.waiters = 1
+        self.enqueued = enqueued
+        self.deadline = deadline
+        self.task: Optional[asyncio.Task] = None
+
+
+class LLMRequestScheduler:
+    """
+    Rate-limited, prioritized, coalescing dispatcher for model calls.
+    The dispatcher task starts on the first submit() and runs on that event loop.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: float = 60.0,
+        burst: int = 10,
+        max_concurrent: int = 4,
+        priorities: Optional[Dict[str, int]] = None,
+        quota_backoff_seconds: float = 10.0,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            requests_per_minute: Sustained request rate allowed by the API quota
+            burst: Requests that may be sent back to back after an idle period
+            max_concurrent: Model calls in flight at once
+            priorities: Operation -> priority overrides (lower runs first)
+            quota_backoff_seconds: Pause applied to the bucket after a quota rejection
+            clock: Monotonic time source (defaults to time.monotonic)
+        """
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst, clock)
+        self.max_concurrent = max(1, max_concurrent)
+        self.priorities = {**DEFAULT_PRIORITIES, **(priorities or {})}
+        self.quota_backoff_seconds = quota_backoff_seconds
+        self.clock = clock or time.monotonic
+        
+        self._queue: List[Tuple[int, int, _Request]] = []
+        self._inflight: Dict[Hashable, _Request] = {}
+        self._sequence = itertools.count()
+        self._running = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._closed = False
+        
+        self.submitted = 0
+        self.coalesced = 0
+        self.dispatched = 0
+        self.abandoned = 0
+        self.timed_out = 0
+        self.extra_calls = 0
+        self.quota_errors = 0
+        self.queue_wait_seconds = 0.0
+    
+    def priority(self, operation: str) -> int:
+        return self.priorities.get(operation, DEFAULT_PRIORITY)
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+    
+    async def submit(
+        self,
+        operation: str,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        deadline: Optional[float] = None
+    ) -> Any:
+        """
+        Run factory() when quota, concurrency and priority allow, sharing the result
+        with any identical request (same key) already queued or in flight.
+        
+        Args:
+            operation: Operation name (selects the priority)
+            key: Identity of the request; equal keys are coalesced
+            factory: Creates the awaitable that performs the call
+            deadline: Seconds the call may run once dispatched (the request that starts
+                      a coalesced group sets it for the group)
+        
+        Raises:
+            asyncio.TimeoutError: If the call outlives its deadline
+        """
+        self.submitted += 1
+        request = self._inflight.get(key)
+        if request is not None:
+            self.coalesced += 1
+            request.waiters += 1
+        else:
+            request = _Request(key, factory, asyncio.get_running_loop().create_future(), self.clock(), deadline)
+            self._inflight[key] = request
+            heapq.heappush(self._queue, (self.priority(operation), next(self._sequence), request))
+            self._ensure_dispatcher()
+            self._wakeup.set()
+        
+        try:
+            # shield: one caller giving up must not cancel the call for the others
+            return await asyncio.shield(request.future)
+        except asyncio.CancelledError:
+            request.waiters -= 1
+            if request.waiters <= 0 and request.task is not None:
+                # Nobody is left to use the answer: stop the call and free its slot
+                request.task.cancel()
+            raise
+    
+    def try_acquire(self) -> bool:
+        """
+        Take a token for a call made outside the queue (e.g. a hedged duplicate of a
+        running call). Returns False, taking nothing, if the quota has no token right now.
+        """
+        if self.bucket.wait_time() > 0:
+            return False
+        self.bucket.take()
+        self.extra_calls += 1
+        return True
+    
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._closed = False
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch_forever())
+    
+    async def _dispatch_forever(self):
+        # The flag backs up cancel(): wait_for can swallow a cancellation that races the wakeup
+        while not self._closed:
+            self._wakeup.clear()
+            if not self._queue or self._running >= self.max_concurrent:
+                await self._wakeup.wait()
+                continue
+            delay = self.bucket.wait_time()
+            if delay > 0:
+                # A wakeup (new request or finished call) re-evaluates priority and quota
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            _, _, request = heapq.heappop(self._queue)
+            if request.waiters <= 0:
+                # Every caller gave up before the call started; don't spend quota on it
+                self.abandoned += 1
+                self._inflight.pop(request.key, None)
+                request.future.cancel()
+                continue
+            self.bucket.take()
+            self._running += 1
+            self.dispatched += 1
+            self.queue_wait_seconds += self.clock() - request.enqueued
+            request.task = asyncio.create_task(self._run(request))
+    
+    async def _run(self, request: _Request):
+        try:
+            result = await asyncio.wait_for(request.factory(), request.deadline)
+        except asyncio.CancelledError:
+            # Cancelled because every waiter left (or the scheduler closed)
+            request.future.cancel()
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+            elif is_quota_error(e):
+                self.quota_errors += 1
+                self.bucket.pause(self.quota_backoff_seconds)
+            if not request.future.done():
+                request.future.set_exception(e)
+        else:
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            if self._inflight.get(request.key) is request:
+                del self._inflight[request.key]
+            self._running -= 1
+            self._wakeup.set()
+        # Retrieve the exception even if every waiter has gone, so it is not reported as unhandled
+        if request.future.done() and not request.future.cancelled():
+            request.future.exception()
+    
+    def close(self):
+        """Stop the dispatcher; queued requests that never started are cancelled"""
+        if self._dispatcher is not None:
+            self._closed = True
+            self._wakeup.set()
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        while self._queue:
+            _, _, request = heapq.heappop(self._queue)
+            self._inflight.pop(request.key, None)
+            request.future.cancel()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "timed_out": self.timed_out,
+            "extra_calls": self.extra_calls,
+            "queue_depth": len(self._queue),
+            "running": self._running,
+            "quota_errors": self.quota_errors,
+            "mean_queue_wait_seconds": round(self.queue_wait_seconds / self.dispatched, 4) if self.dispatched else 0.0
+        }
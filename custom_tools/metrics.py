@@ -0,0 +1,272 @@
+"""
+Agent Metrics
+Lightweight in-process instrumentation for SpoonOSAgent: latency histograms,
+counters (incremented or read from callbacks) and callback gauges with labels,
+rendered in the Prometheus text exposition format or as a JSON snapshot, and
+served over HTTP by MetricsServer.
+"""
+
+import bisect
+import functools
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Tuple, Callable
+
+from aiohttp import web
+
+# Latency buckets in seconds: 100us .. 60s, roughly 2.5x apart
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def timed(stage: str):
+    """
+    Decorator for agent coroutine methods: time every call into the owner's
+    `metrics` registry as stage_latency_seconds{stage=...}.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            with self.metrics.time("stage_latency_seconds", "Latency of agent stages", stage=stage):
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is O(log buckets)"""
+    
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantile estimate by linear interpolation inside the matching bucket, clamped to the observed range"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for n, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = max(self.buckets[n - 1] if n > 0 else 0.0, self.min)
+                upper = min(self.buckets[n] if n < len(self.buckets) else self.max, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+
+class MetricsRegistry:
+    """Named metric families (histogram, counter, gauge), each split by label set"""
+    
+    def __init__(self, namespace: str = "neoguard"):
+        self.namespace = namespace
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._counter_fns: Dict[str, Dict[LabelKey, Callable[[], float]]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, Callable[[], float]]] = {}
+    
+    def _name(self, name: str, kind: str, help_text: str) -> str:
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        known = self._help.get(full_name)
+        if known is None:
+            self._help[full_name] = (kind, help_text)
+        elif known[0] != kind:
+            raise ValueError(f"Metric {full_name} is already registered as a {known[0]}")
+        return full_name
+    
+    def observe(self, name: str, value: float, help_text: str = "", **labels):
+        """Record one observation in a histogram"""
+        family = self._histograms.setdefault(self._name(name, "histogram", help_text), {})
+        key = _label_key(labels)
+        histogram = family.get(key)
+        if histogram is None:
+            histogram = family[key] = Histogram()
+        histogram.observe(value)
+    
+    @contextmanager
+    def time(self, name: str, help_text: str = "", **labels):
+        """Time the enclosed block into a latency histogram (works inside coroutines too)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, help_text, **labels)
+    
+    def inc(self, name: str, amount: float = 1.0, help_text: str = "", **labels):
+        """Increase a counter"""
+        family = self._counters.setdefault(self._name(name, "counter", help_text), {})
+        key = _label_key(labels)
+        family[key] = family.get(key, 0.0) + amount
+    
+    def counter(self, name: str, fn: Callable[[], float], help_text: str = "", **labels):
+        """Register a counter whose (monotonic) value is read from `fn` at collection time"""
+        self._counter_fns.setdefault(self._name(name, "counter", help_text), {})[_label_key(labels)] = fn
+    
+    def gauge(self, name: str, fn: Callable[[], float], help_text: str = "", **labels):
+        """Register a gauge whose value is read from `fn` at collection time"""
+        self._gauges.setdefault(self._name(name, "gauge", help_text), {})[_label_key(labels)] = fn
+    
+    def _read_counters(self) -> Dict[str, Dict[LabelKey, float]]:
+        values = {name: dict(family) for name, family in self._counters.items()}
+        for name, family in self._read(self._counter_fns).items():
+            merged = values.setdefault(name, {})
+            for key, value in family.items():
+                merged[key] = merged.get(key, 0.0) + value
+        return values
+    
+    def _read_gauges(self) -> Dict[str, Dict[LabelKey, float]]:
+        return self._read(self._gauges)
+    
+    @staticmethod
+    def _read(callbacks: Dict[str, Dict[LabelKey, Callable[[], float]]]) -> Dict[str, Dict[LabelKey, float]]:
+        values = {}
+        for name, family in callbacks.items():
+            values[name] = {}
+            for key, fn in family.items():
+                try:
+                    values[name][key] = float(fn())
+                except Exception:
+                    # A callback reading from a stopped component is skipped, not fatal
+                    continue
+        return values
+    
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        
+        def header(name: str):
+            kind, help_text = self._help[name]
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+        
+        for name, family in sorted(self._histograms.items()):
+            header(name)
+            for key, histogram in sorted(family.items()):
+                cumulative = 0
+                for bucket, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', repr(bucket)))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        
+        for name, family in sorted(self._read_counters().items()):
+            header(name)
+            for key, value in sorted(family.items()):
+                lines.append(f"{name}{_format_labels(key)} {value}")
+        
+        for name, family in sorted(self._read_gauges().items()):
+            header(name)
+            for key, value in sorted(family.items()):
+                lines.append(f"{name}{_format_labels(key)} {value}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as a JSON-friendly dict; histograms carry count, mean and p50/p95/p99"""
+        
+        def labelled(key: LabelKey, values: Dict[str, Any]) -> Dict[str, Any]:
+            return {"labels": dict(key), **values}
+        
+        histograms = {}
+        for name, family in self._histograms.items():
+            histograms[name] = [
+                labelled(key, {
+                    "count": h.count,
+                    "sum_seconds": round(h.sum, 6),
+                    "mean_seconds": round(h.sum / h.count, 6) if h.count else None,
+                    "max_seconds": round(h.max, 6) if h.count else None,
+                    "p50_seconds": round(h.quantile(0.50), 6) if h.count else None,
+                    "p95_seconds": round(h.quantile(0.95), 6) if h.count else None,
+                    "p99_seconds": round(h.quantile(0.99), 6) if h.count else None
+                })
+                for key, h in sorted(family.items())
+            ]
+        
+        return {
+            "timestamp": time.time(),
+            "histograms": histograms,
+            "counters": {
+                name: [labelled(key, {"value": value}) for key, value in sorted(family.items())]
+                for name, family in self._read_counters().items()
+            },
+            "gauges": {
+                name: [labelled(key, {"value": value}) for key, value in sorted(family.items())]
+                for name, family in self._read_gauges().items()
+            }
+        }
+
+
+class MetricsServer:
+    """HTTP endpoint serving /metrics (Prometheus text) and /metrics.json (snapshot)"""
+    
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Args:
+            registry: Registry to expose
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    async def start(self):
+        """Start serving on host:port"""
+        app = web.Application()
+        app.router.add_get("/metrics", self._prometheus)
+        app.router.add_get("/metrics.json", self._snapshot)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+    
+    async def stop(self):
+        """Stop serving"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    async def _prometheus(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render_prometheus().encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+        )
+    
+    async def _snapshot(self, request: web.Request) -> web.Response:
+        return web.json_response(self.registry.snapshot())
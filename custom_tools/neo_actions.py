@@ -5,8 +5,76 @@ This tool allows Spoon OS to report incidents on the Neo N3 blockchain.
 
 import os
 import json
+import base64
+import hashlib
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Any
+
+
+# Domain separation (RFC 6962): a leaf hash can never be passed off as an internal node
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def canonical_hash(data: dict) -> str:
+    """Hex SHA-256 of the canonical (sorted-key) JSON form of a record"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def merkle_leaf_hash(data: dict) -> str:
+    """Hex Merkle leaf hash of a record: SHA-256 of 0x00 || canonical JSON"""
+    return hashlib.sha256(LEAF_PREFIX + json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def merkle_tree(leaves: List[str]) -> List[List[str]]:
+    """
+    Build a Merkle tree over hex leaf hashes (from merkle_leaf_hash).
+    The last node of an odd level is promoted unchanged, never paired with itself, so
+    [a, b, c] and [a, b, c, c] have different roots. Returns every level, leaves first, root last.
+    """
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+    
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_proof(levels: List[List[str]], index: int) -> List[Dict[str, str]]:
+    """
+    Inclusion proof for leaf `index`: sibling hashes from the leaf level up to the root
+    (levels where the node was promoted without a sibling contribute no step)
+    """
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append({
+                "position": "left" if sibling < index else "right",
+                "hash": level[sibling]
+            })
+        index //= 2
+    return proof
+
+
+def verify_merkle_proof(leaf_hash: str, proof: List[Dict[str, str]], root: str) -> bool:
+    """Check that `leaf_hash` is included under `root` using its inclusion proof"""
+    current = leaf_hash
+    for step in proof:
+        if step["position"] == "left":
+            current = _hash_pair(step["hash"], current)
+        else:
+            current = _hash_pair(current, step["hash"])
+    return current == root
 
 
 class NeoReportTool:
@@ -18,11 +86,16 @@ class NeoReportTool:
     name = "neo_report_incident"
     description = "Report a confirmed disaster incident to the Neo N3 blockchain with proof of evidence"
     
-    def __init__(self):
+    def __init__(self, rpc_client=None):
+        """
+        Args:
+            rpc_client: Optional NeoRpcClient used by run_async to submit transactions
+        """
         self.network = "neo3-testnet"
         self.rpc_url = "https://testnet1.neo.coz.io:443"
         self.contract_hash = "0x8d35a57f8c01156527c92ebbb4d772fa9574cbf4"
         self.private_key = os.getenv("NEO_PRIVATE_KEY", "")
+        self.rpc_client = rpc_client
     
     def run(
         self,
@@ -50,16 +123,9 @@ class NeoReportTool:
             # In production, this would use neo3-py library
             # For hackathon demo, we simulate the blockchain call
             
-            incident_data = {
-                "disaster_type": disaster_type,
-                "evidence_link": evidence_link,
-                "sector_id": sector_id,
-                "confidence": confidence,
-                "coordinates": coordinates or {},
-                "timestamp": datetime.now().isoformat(),
-                "reporter": "NeoGuard Sentinel 01",
-                "network": self.network
-            }
+            incident_data = self._build_incident_data(
+                disaster_type, evidence_link, sector_id, confidence, coordinates
+            )
             
             # Simulate blockchain transaction
             tx_hash = self._simulate_blockchain_report(incident_data)
@@ -79,16 +145,159 @@ class NeoReportTool:
                 "error": str(e)
             }
     
+    async def run_async(
+        self,
+        disaster_type: str,
+        evidence_link: str,
+        sector_id: str,
+        confidence: float,
+        coordinates: Optional[dict] = None
+    ) -> dict:
+        """
+        Report an incident through the async RPC client without blocking the agent loop.
+        Falls back to the simulated run() when no rpc_client is configured.
+        """
+        if self.rpc_client is None:
+            return self.run(disaster_type, evidence_link, sector_id, confidence, coordinates)
+        
+        try:
+            incident_data = self._build_incident_data(
+                disaster_type, evidence_link, sector_id, confidence, coordinates
+            )
+            
+            # In production the payload is the neo3-py signed transaction invoking contract_hash
+            payload = base64.b64encode(json.dumps(incident_data, sort_keys=True).encode()).decode()
+            result = await self.rpc_client.call("sendrawtransaction", [payload])
+            
+            return {
+                "status": "success",
+                "message": f"Incident reported on Neo N3 blockchain",
+                "transaction_hash": result["hash"],
+                "incident_data": incident_data,
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Failed to report incident: {str(e)}",
+                "error": str(e)
+            }
+    
+    def run_batch(self, incidents: List[Dict[str, Any]]) -> dict:
+        """
+        Report several incidents in one transaction by anchoring a Merkle root.
+        Each incident is hashed canonically; only the root goes on-chain and every
+        incident gets an inclusion proof so it can still be verified on its own.
+        
+        Args:
+            incidents: List of dicts with the same keys as run()'s arguments
+        
+        Returns:
+            Batch result with the anchoring transaction, root and per-incident proofs
+        """
+        try:
+            records, leaves, levels, anchor = self._build_batch(incidents)
+            # Simulate anchoring the root in a single transaction
+            tx_hash = self._simulate_blockchain_report(anchor)
+            return self._batch_result(records, leaves, levels, tx_hash)
+        
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Failed to report incident batch: {str(e)}",
+                "error": str(e)
+            }
+    
+    async def run_batch_async(self, incidents: List[Dict[str, Any]]) -> dict:
+        """
+        Anchor a batch's Merkle root through the async RPC client.
+        Falls back to the simulated run_batch() when no rpc_client is configured.
+        """
+        if self.rpc_client is None:
+            return self.run_batch(incidents)
+        
+        try:
+            records, leaves, levels, anchor = self._build_batch(incidents)
+            # In production the payload is the neo3-py signed transaction anchoring the root
+            payload = base64.b64encode(json.dumps(anchor, sort_keys=True).encode()).decode()
+            result = await self.rpc_client.call("sendrawtransaction", [payload])
+            return self._batch_result(records, leaves, levels, result["hash"])
+        
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Failed to report incident batch: {str(e)}",
+                "error": str(e)
+            }
+    
+    def _build_batch(self, incidents: List[Dict[str, Any]]):
+        """Incident records, their leaf hashes, the Merkle tree levels and the on-chain anchor"""
+        records = [
+            self._build_incident_data(
+                incident["disaster_type"],
+                incident["evidence_link"],
+                incident["sector_id"],
+                incident["confidence"],
+                incident.get("coordinates")
+            )
+            for incident in incidents
+        ]
+        leaves = [merkle_leaf_hash(record) for record in records]
+        levels = merkle_tree(leaves)
+        anchor = {
+            "merkle_root": levels[-1][0],
+            "leaf_count": len(leaves),
+            "timestamp": datetime.now().isoformat(),
+            "reporter": "NeoGuard Sentinel 01",
+            "network": self.network
+        }
+        return records, leaves, levels, anchor
+    
+    def _batch_result(self, records: List[dict], leaves: List[str], levels: List[List[str]], tx_hash: str) -> dict:
+        return {
+            "status": "success",
+            "message": f"{len(records)} incidents anchored on Neo N3 blockchain",
+            "transaction_hash": tx_hash,
+            "merkle_root": levels[-1][0],
+            "reports": [
+                {
+                    "incident_data": record,
+                    "leaf_hash": leaf,
+                    "merkle_proof": merkle_proof(levels, index)
+                }
+                for index, (record, leaf) in enumerate(zip(records, leaves))
+            ],
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _build_incident_data(
+        self,
+        disaster_type: str,
+        evidence_link: str,
+        sector_id: str,
+        confidence: float,
+        coordinates: Optional[dict] = None
+    ) -> dict:
+        """Canonical on-chain record for one incident"""
+        return {
+            "disaster_type": disaster_type,
+            "evidence_link": evidence_link,
+            "sector_id": sector_id,
+            "confidence": confidence,
+            "coordinates": coordinates or {},
+            "timestamp": datetime.now().isoformat(),
+            "reporter": "NeoGuard Sentinel 01",
+            "network": self.network
+        }
+    
     def _simulate_blockchain_report(self, incident_data: dict) -> str:
         """
         Simulate a blockchain transaction.
         In production, this would use neo3-py to create and sign a transaction.
         """
-        import hashlib
-        
         # Create a mock transaction hash
-        data_str = json.dumps(incident_data, sort_keys=True)
-        tx_hash = "0x" + hashlib.sha256(data_str.encode()).hexdigest()
+        tx_hash = "0x" + canonical_hash(incident_data)
         
         return tx_hash
     
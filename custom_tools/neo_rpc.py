@@ -0,0 +1,288 @@
+"""
+Neo N3 JSON-RPC Client
+Async RPC layer for NeoReportTool with a persistent connection pool,
+call pipelining (concurrent calls are coalesced into JSON-RPC batch requests)
+and an in-process mock Neo RPC node for offline throughput testing.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import random
+from typing import Optional, Dict, Any, List, Tuple
+
+import aiohttp
+from aiohttp import web
+
+
+class NeoRpcError(Exception):
+    """Error object returned by a Neo RPC node"""
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(f"RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+
+
+class NeoRpcClient:
+    """
+    Pooled async JSON-RPC client for a Neo N3 node.
+    
+    Calls issued through call() are queued and flushed together as one JSON-RPC
+    batch request (on the next loop iteration, or after batch_window_seconds),
+    while several batches can be in flight at once over the keep-alive pool.
+    """
+    
+    def __init__(
+        self,
+        rpc_url: str,
+        pool_size: int = 8,
+        max_batch_size: int = 32,
+        batch_window_seconds: float = 0.0,
+        timeout: float = 10.0
+    ):
+        """
+        Initialize the RPC client.
+        
+        Args:
+            rpc_url: Node JSON-RPC endpoint
+            pool_size: Maximum persistent connections to the node
+            max_batch_size: Maximum calls coalesced into one batch request
+            batch_window_seconds: How long to wait for more calls before flushing (0 = next loop tick)
+            timeout: Per-request timeout in seconds
+        """
+        self.rpc_url = rpc_url
+        self.pool_size = pool_size
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window_seconds = batch_window_seconds
+        self.timeout = timeout
+        
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ids = itertools.count(1)
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._in_flight: set = set()
+        
+        self.http_requests = 0
+        self.rpc_calls = 0
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def close(self):
+        """Flush pending calls, wait for in-flight requests and close the pool"""
+        if self._pending:
+            self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def call(self, method: str, params: Optional[list] = None) -> Any:
+        """
+        Call one RPC method. Concurrent calls share batch requests.
+        
+        Raises:
+            NeoRpcError: If the node returns an error object
+        """
+        future = asyncio.get_running_loop().create_future()
+        request = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params or []}
+        self._pending.append((request, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.batch_window_seconds > 0:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window_seconds, self._flush)
+            else:
+                self._flush_handle = asyncio.get_running_loop().call_soon(self._flush)
+        
+        return await future
+    
+    async def batch(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """
+        Send several calls as explicit JSON-RPC batch requests.
+        
+        Returns:
+            Results in call order; failed calls are returned as NeoRpcError instances
+        """
+        return await asyncio.gather(
+            *(self.call(method, params) for method, params in calls),
+            return_exceptions=True
+        )
+    
+    def _flush(self):
+        """Move every queued call into batch requests and send them"""
+        # A size-triggered flush must not leave the window timer to flush the next batch early
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            chunk = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            task = asyncio.ensure_future(self._send(chunk))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+    
+    async def _send(self, chunk: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """POST one batch and resolve each call's future from the matching response id"""
+        futures = {request["id"]: future for request, future in chunk}
+        payload = [request for request, _ in chunk]
+        
+        try:
+            self.http_requests += 1
+            self.rpc_calls += len(payload)
+            async with self._get_session().post(self.rpc_url, json=payload) as response:
+                response.raise_for_status()
+                body = await response.json(content_type=None)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        if isinstance(body, dict):
+            body = [body]
+        for reply in body:
+            future = futures.pop(reply.get("id"), None)
+            if future is None or future.done():
+                continue
+            if "error" in reply:
+                error = reply["error"]
+                future.set_exception(NeoRpcError(error.get("code", -1), error.get("message", "unknown error")))
+            else:
+                future.set_result(reply.get("result"))
+        
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(NeoRpcError(-32603, "No response for request"))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return request counters"""
+        return {
+            "http_requests": self.http_requests,
+            "rpc_calls": self.rpc_calls,
+            "calls_per_request": self.rpc_calls / self.http_requests if self.http_requests else 0.0
+        }
+
+
+class MockNeoRpcServer:
+    """
+    In-process mock Neo N3 RPC node.
+    Implements the handful of methods NeoGuard uses, accepts JSON-RPC batches and
+    adds a configurable per-request latency so throughput can be measured offline.
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the mock node.
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency_seconds: Simulated processing delay per HTTP request
+            error_rate: Fraction of sendrawtransaction calls rejected with an RPC error
+            seed: Seed for the error draws (repeatable failure patterns)
+        """
+        self.host = host
+        self.port = port
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self.block_count = 1
+        self.transactions: Dict[str, str] = {}
+        self._runner: Optional[web.AppRunner] = None
+        
+        self.http_requests = 0
+        self.rpc_calls = 0
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+    
+    async def start(self):
+        """Start serving on host:port"""
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+    
+    async def stop(self):
+        """Stop serving"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        body = await request.json()
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        
+        if isinstance(body, list):
+            return web.json_response([self._dispatch(call) for call in body])
+        return web.json_response(self._dispatch(body))
+    
+    def _dispatch(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        self.rpc_calls += 1
+        method = call.get("method")
+        params = call.get("params", [])
+        reply = {"jsonrpc": "2.0", "id": call.get("id")}
+        
+        if method == "getversion":
+            reply["result"] = {"useragent": "/NeoGuard-MockNode:0.1/", "protocol": {"network": 894710606}}
+        elif method == "getblockcount":
+            reply["result"] = self.block_count
+        elif method == "sendrawtransaction":
+            if not params:
+                reply["error"] = {"code": -32602, "message": "Invalid params"}
+                return reply
+            if self.error_rate and self._rng.random() < self.error_rate:
+                reply["error"] = {"code": -500, "message": "Transaction rejected (simulated)"}
+                return reply
+            tx_hash = "0x" + hashlib.sha256(str(params[0]).encode()).hexdigest()
+            self.transactions[tx_hash] = params[0]
+            self.block_count += 1
+            reply["result"] = {"hash": tx_hash}
+        elif method == "getrawtransaction":
+            tx_hash = params[0] if params else None
+            if tx_hash not in self.transactions:
+                reply["error"] = {"code": -100, "message": "Unknown transaction"}
+            else:
+                reply["result"] = self.transactions[tx_hash]
+        elif method == "invokefunction":
+            reply["result"] = {"state": "HALT", "gasconsumed": "1000000", "stack": []}
+        else:
+            reply["error"] = {"code": -32601, "message": "Method not found"}
+        
+        return reply
@@ -0,0 +1,249 @@
+"""
+Staged Incident Pipeline
+Stages connected by bounded async queues, each with its own worker pool and
+overflow policy, so detection throughput no longer depends on decision and
+reporting latency.
+
+Overflow policies:
+    block: producers wait for room (backpressure)
+    drop_oldest: the oldest queued item is discarded to make room
+    spill: overflow is appended to an on-disk JSONL spill file and read back in order
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from collections import deque
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+
+from custom_tools.structured_logging import log_event
+
+logger = logging.getLogger("neoguard.pipeline")
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+
+
+class SpillFile:
+    """Append-only JSONL overflow buffer, consumed front to back"""
+    
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="neoguard_spill_", suffix=".jsonl")
+            os.close(fd)
+        self.path = path
+        self._writer = open(path, "a+", encoding="utf-8")
+        self._read_offset = 0
+        self.count = 0
+    
+    def append(self, item: Any):
+        self._writer.write(json.dumps(item, default=str) + "\n")
+        self._writer.flush()
+        self.count += 1
+    
+    def pop(self) -> Any:
+        self._writer.seek(self._read_offset)
+        line = self._writer.readline()
+        self._read_offset = self._writer.tell()
+        self._writer.seek(0, os.SEEK_END)
+        self.count -= 1
+        if self.count == 0:
+            # Everything consumed: reclaim the file
+            self._writer.truncate(0)
+            self._read_offset = 0
+        return json.loads(line)
+    
+    def close(self):
+        self._writer.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class StageQueue:
+    """Bounded FIFO queue with a configurable overflow policy"""
+    
+    def __init__(self, maxsize: int, overflow: str = "block", spill_path: Optional[str] = None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.maxsize = max(1, maxsize)
+        self.overflow = overflow
+        self._items: deque = deque()
+        self._spill = SpillFile(spill_path) if overflow == "spill" else None
+        self._cond = asyncio.Condition()
+        
+        self.max_depth = 0
+        self.dropped = 0
+        self.spilled = 0
+    
+    def qsize(self) -> int:
+        return len(self._items) + (self._spill.count if self._spill else 0)
+    
+    async def put(self, item: Any):
+        async with self._cond:
+            if self.overflow == "block":
+                await self._cond.wait_for(lambda: len(self._items) < self.maxsize)
+            elif self.overflow == "drop_oldest":
+                if len(self._items) >= self.maxsize:
+                    self._items.popleft()
+                    self.dropped += 1
+            elif len(self._items) >= self.maxsize or self._spill.count:
+                # Once anything is spilled, new items follow it to keep FIFO order
+                self._spill.append(item)
+                self.spilled += 1
+                self._record_depth()
+                self._cond.notify_all()
+                return
+            
+            self._items.append(item)
+            self._record_depth()
+            self._cond.notify_all()
+    
+    async def get(self) -> Any:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.qsize() > 0)
+            item = self._items.popleft() if self._items else self._spill.pop()
+            while self._spill and self._spill.count and len(self._items) < self.maxsize:
+                self._items.append(self._spill.pop())
+            self._cond.notify_all()
+            return item
+    
+    def _record_depth(self):
+        self.max_depth = max(self.max_depth, self.qsize())
+    
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+
+
+class Stage:
+    """One pipeline stage: a queue feeding a pool of workers running `handler`"""
+    
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 1,
+        queue_size: int = 100,
+        overflow: str = "block",
+        spill_path: Optional[str] = None
+    ):
+        """
+        Args:
+            name: Stage name used in metrics
+            handler: Coroutine processing one item; a non-None result is passed to the next stage
+            workers: Number of concurrent workers
+            queue_size: Bound of the stage's input queue
+            overflow: Overflow policy of the input queue (block, drop_oldest, spill)
+            spill_path: Spill file location for the spill policy (temporary file if omitted)
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue = StageQueue(queue_size, overflow, spill_path)
+        self.next_stage: Optional["Stage"] = None
+        self._tasks: List[asyncio.Task] = []
+        
+        self.busy = 0
+        self.processed = 0
+        self.failed = 0
+        self.forwarded = 0
+    
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"{self.name}-{n}")
+            for n in range(self.workers)
+        ]
+    
+    async def _work(self):
+        while True:
+            item = await self.queue.get()
+            # Stay busy until the result is handed off so drain() never sees a gap
+            self.busy += 1
+            try:
+                try:
+                    result = await self.handler(item)
+                except Exception as e:
+                    self.failed += 1
+                    log_event(logger, logging.WARNING, "pipeline.stage_failed",
+                              f"❌ Pipeline stage '{self.name}' failed: {e}",
+                              stage=self.name, error=str(e))
+                    result = None
+                self.processed += 1
+                
+                if result is not None and self.next_stage is not None:
+                    self.forwarded += 1
+                    await self.next_stage.queue.put(result)
+            finally:
+                self.busy -= 1
+    
+    def idle(self) -> bool:
+        return self.busy == 0 and self.queue.qsize() == 0
+    
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.queue.close()
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.queue.max_depth,
+            "queue_size": self.queue.maxsize,
+            "overflow": self.queue.overflow,
+            "processed": self.processed,
+            "forwarded": self.forwarded,
+            "failed": self.failed,
+            "dropped": self.queue.dropped,
+            "spilled": self.queue.spilled
+        }
+
+
+class Pipeline:
+    """Linear chain of stages; items submitted to the first stage flow through the rest"""
+    
+    def __init__(self, stages: List[Stage]):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        for upstream, downstream in zip(stages, stages[1:]):
+            upstream.next_stage = downstream
+    
+    async def start(self):
+        for stage in self.stages:
+            stage.start()
+    
+    async def submit(self, item: Any):
+        """Feed an item into the first stage (subject to its overflow policy)"""
+        await self.stages[0].queue.put(item)
+    
+    async def drain(self, poll_seconds: float = 0.05):
+        """Wait until every queue is empty and every worker is idle"""
+        while not all(stage.idle() for stage in self.stages):
+            await asyncio.sleep(poll_seconds)
+    
+    async def stop(self, drain: bool = True, drain_timeout: Optional[float] = None):
+        """
+        Stop all workers.
+        
+        Args:
+            drain: Let in-flight and queued items finish first
+            drain_timeout: Upper bound on the drain wait in seconds
+        """
+        if drain:
+            try:
+                await asyncio.wait_for(self.drain(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+        for stage in self.stages:
+            await stage.stop()
+    
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage queue depth, worker and throughput counters"""
+        return {stage.name: stage.metrics() for stage in self.stages}
@@ -0,0 +1,221 @@
+"""
+Prompt Builder
+Precompiled prompt templates for the Gemini calls. Every prompt starts with the same
+SHARED_PREFIX so provider-side prompt caching can reuse it; the static task instructions
+come next and the per-call data goes last, as compact JSON limited to the fields the
+model actually uses. Token counts are estimated locally (no extra API round trip) and
+TokenUsage keeps per-operation totals for the metrics registry.
+"""
+
+import json
+import re
+import string
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+
+SHARED_PREFIX = (
+    "You are the reasoning service of NeoGuard, a drone-based disaster response system "
+    "that reports verified incidents to the Neo blockchain. Inputs are compact JSON. "
+    "Be concise.\n"
+)
+
+# Incident fields sent to the model; evidence links only matter for the written report.
+# incident_id stays on the Python side: it tells the model nothing and costs ~30 tokens a call
+INCIDENT_FIELDS = (
+    "sector_id", "disaster_type", "name", "confidence", "description", "coordinates"
+)
+REPORT_INCIDENT_FIELDS = INCIDENT_FIELDS + ("video_proof_url",)
+
+# Digits are tokenized one by one, words roughly every 6 characters, punctuation
+# runs in pairs, and whitespace other than a single space (newlines, indentation)
+# one token per run
+_TOKEN_PIECES = re.compile(r"\d+|[^\W\d_]+|\s*\n\s*|\s{2,}|[^\w\s]+|_")
+
+# Task instructions per operation; fields in braces are filled in per call
+TEMPLATES = {
+    "analyze_incident": (
+        "Task: analyze the incident for emergency responders.\n"
+        "Return JSON: {{\"severity\":\"Critical|High|Medium|Low\",\"recommended_actions\":[3-5 items],"
+        "\"risk_factors\":[...],\"should_report\":true|false,\"reasoning\":\"...\",\"resources_needed\":[...]}}\n"
+        "Incident:{incident}\n"
+    ),
+    "reason_about_network": (
+        "Task: assess the drone network. Consider battery and flight time, link quality, "
+        "sector coverage gaps, response time and blockchain transaction cost.\n"
+        "Return JSON: {{\"health\":\"...\",\"deployment\":[...],\"resource_allocation\":[...],"
+        "\"bottlenecks\":[...],\"optimizations\":[...]}}\n"
+        "Network:{network}\n"
+    ),
+    "collaborate_on_decision": (
+        "Task: decide whether to report the incident to the blockchain.\n"
+        "Return JSON: {{\"should_report\":true|false,\"confidence\":0-100,\"reasoning\":\"...\","
+        "\"alternatives\":[...],\"risk\":\"...\"}}\n"
+        "Network:{network}\n"
+        "Incident:{incident}\n"
+        "Spoon OS:{spoon}\n"
+    ),
+    "assess_and_decide": (
+        "Task: assess the incident and decide whether to report it to the blockchain.\n"
+        "Return one JSON object: {{\"analysis\":{{\"severity\":\"Critical|High|Medium|Low\","
+        "\"recommended_actions\":[...],\"risk_factors\":[...]}},\"decision\":{{\"should_report\":true|false,"
+        "\"confidence\":0-100,\"reasoning\":\"...\"}}}}\n"
+        "Network:{network}\n"
+        "Incident:{incident}\n"
+        "Spoon OS:{spoon}\n"
+    ),
+    "generate_incident_report": (
+        "Task: write a concise, professional incident report for emergency responders with an "
+        "executive summary, classification, location and coordinates, severity, recommended "
+        "response, evidence links and timestamp.\n"
+        "Incident:{incident}\n"
+    ),
+    "query_network_requirements": (
+        "Task: answer the question with actionable insights, considering NeoGuard's architecture, "
+        "Neo blockchain integration, drone coordination, real-time response requirements, "
+        "scalability and reliability.\n"
+        "Question:{query}\n"
+    )
+}
+
+NO_SPOON_RECOMMENDATION = "no recommendation available (fallback mode)"
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model token count of `text` (within ~15% for English prompts and JSON)"""
+    count = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece[0].isdigit():
+            count += len(piece)
+        elif piece[0].isalpha():
+            count += (len(piece) + 5) // 6
+        elif piece[0].isspace():
+            count += 1
+        else:
+            count += (len(piece) + 1) // 2
+    return count
+
+
+def _rounded(value: Any, digits: int) -> Any:
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: _rounded(item, digits) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_rounded(item, digits) for item in value]
+    return value
+
+
+def compact_json(value: Any, digits: int = 5) -> str:
+    """
+    Deterministic minimal JSON: no whitespace, sorted keys, None values dropped and
+    floats rounded to `digits` places (1e-5 degrees is about a metre)
+    """
+    return json.dumps(_rounded(value, digits), separators=(",", ":"), sort_keys=True,
+                      ensure_ascii=False, default=str)
+
+
+def select_fields(data: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """The listed fields of `data` that are present and not empty"""
+    return {field: data[field] for field in fields if data.get(field) not in (None, "", [], {})}
+
+
+class PromptTemplate:
+    """Template parsed once into literal and field segments; render() only joins strings"""
+    
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            if spec or conversion:
+                raise ValueError(f"Template {name!r} uses a format spec; pass preformatted values")
+            self._segments.append((literal, field))
+        self.fields = tuple(field for _, field in self._segments if field is not None)
+        self.static_tokens = estimate_tokens("".join(literal for literal, _ in self._segments))
+    
+    @property
+    def prefix(self) -> str:
+        """Literal text before the first field: identical on every call"""
+        return self._segments[0][0] if self._segments else ""
+    
+    def render(self, **values: str) -> str:
+        parts = []
+        for literal, field in self._segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(values[field])
+        return "".join(parts)
+
+
+class PromptBuilder:
+    """Builds the prompt for each GeminiFallbackAgent operation from the precompiled templates"""
+    
+    def __init__(self, prefix: str = SHARED_PREFIX):
+        self.templates = {name: PromptTemplate(name, prefix + body) for name, body in TEMPLATES.items()}
+    
+    @staticmethod
+    def _network(network_state: Dict[str, Any]) -> str:
+        # Decisions only need how many drones are low on battery, not which ones
+        state = dict(network_state)
+        low_battery = state.pop("low_battery_drones", None)
+        if low_battery is not None:
+            state["low_battery_count"] = len(low_battery)
+        return compact_json(state)
+    
+    def analyze_incident(self, incident: Dict[str, Any]) -> str:
+        return self.templates["analyze_incident"].render(
+            incident=compact_json(select_fields(incident, INCIDENT_FIELDS))
+        )
+    
+    def reason_about_network(self, network_state: Dict[str, Any]) -> str:
+        return self.templates["reason_about_network"].render(network=compact_json(network_state))
+    
+    def collaborate_on_decision(self, incident: Dict[str, Any], network_state: Dict[str, Any],
+                                spoon_recommendation: Optional[str] = None) -> str:
+        return self.templates["collaborate_on_decision"].render(
+            network=self._network(network_state),
+            incident=compact_json(select_fields(incident, INCIDENT_FIELDS)),
+            spoon=spoon_recommendation or NO_SPOON_RECOMMENDATION
+        )
+    
+    def assess_and_decide(self, incident: Dict[str, Any], network_state: Dict[str, Any],
+                          spoon_recommendation: Optional[str] = None) -> str:
+        return self.templates["assess_and_decide"].render(
+            network=self._network(network_state),
+            incident=compact_json(select_fields(incident, INCIDENT_FIELDS)),
+            spoon=spoon_recommendation or NO_SPOON_RECOMMENDATION
+        )
+    
+    def generate_incident_report(self, incident: Dict[str, Any]) -> str:
+        return self.templates["generate_incident_report"].render(
+            incident=compact_json(select_fields(incident, REPORT_INCIDENT_FIELDS))
+        )
+    
+    def query_network_requirements(self, query: str) -> str:
+        return self.templates["query_network_requirements"].render(query=query.strip())
+
+
+class TokenUsage:
+    """Per-operation token totals for successful model calls"""
+    
+    def __init__(self):
+        self.by_operation: Dict[str, Dict[str, int]] = {}
+    
+    def record(self, operation: str, prompt_tokens: int, output_tokens: int, cached_tokens: int = 0):
+        totals = self.by_operation.setdefault(
+            operation, {"calls": 0, "prompt_tokens": 0, "output_tokens": 0, "cached_tokens": 0}
+        )
+        totals["calls"] += 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["output_tokens"] += output_tokens
+        totals["cached_tokens"] += cached_tokens
+    
+    def stats(self) -> Dict[str, Any]:
+        calls = sum(totals["calls"] for totals in self.by_operation.values())
+        prompt_tokens = sum(totals["prompt_tokens"] for totals in self.by_operation.values())
+        return {
+            "calls": calls,
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": sum(totals["output_tokens"] for totals in self.by_operation.values()),
+            "cached_tokens": sum(totals["cached_tokens"] for totals in self.by_operation.values()),
+            "mean_prompt_tokens": round(prompt_tokens / calls, 1) if calls else 0.0,
+            "by_operation": {operation: dict(totals) for operation, totals in self.by_operation.items()}
+        }
@@ -0,0 +1,130 @@
+"""
+Report Batcher
+Collects incident reports for a short window (or up to a size limit) and submits them
+to NeoReportTool.run_batch_async as one Merkle-anchored transaction (sent through the
+RPC client when one is configured).
+"""
+
+import asyncio
+from typing import Optional, Dict, Any, List, Tuple
+
+from custom_tools.neo_actions import NeoReportTool
+
+
+class ReportBatcher:
+    """
+    Async front end for batched on-chain reporting.
+    Callers await submit() and receive their own per-incident result
+    (shared transaction hash and Merkle root, individual inclusion proof).
+    """
+    
+    def __init__(
+        self,
+        report_tool: NeoReportTool,
+        max_batch_size: int = 16,
+        max_wait_seconds: float = 0.5
+    ):
+        """
+        Initialize the report batcher.
+        
+        Args:
+            report_tool: Tool used to anchor each batch
+            max_batch_size: Flush as soon as this many incidents are pending
+            max_wait_seconds: Flush at most this long after the first pending incident
+        """
+        self.report_tool = report_tool
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._in_flight: set = set()
+        
+        self.batches_sent = 0
+        self.incidents_sent = 0
+    
+    @property
+    def pending(self) -> int:
+        """Incidents waiting for the next batch"""
+        return len(self._pending)
+    
+    async def submit(
+        self,
+        disaster_type: str,
+        evidence_link: str,
+        sector_id: str,
+        confidence: float,
+        coordinates: Optional[dict] = None
+    ) -> dict:
+        """
+        Queue an incident for the next batch and wait for its result.
+        Takes the same arguments as NeoReportTool.run and returns a result of the same shape,
+        extended with merkle_root, leaf_hash and merkle_proof.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(({
+            "disaster_type": disaster_type,
+            "evidence_link": evidence_link,
+            "sector_id": sector_id,
+            "confidence": confidence,
+            "coordinates": coordinates
+        }, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        
+        return await future
+    
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.max_wait_seconds)
+        self._flush_task = None
+        self._flush()
+    
+    def _flush(self):
+        """Start anchoring every pending incident in one transaction"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        task = asyncio.ensure_future(self._anchor(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+    
+    async def _anchor(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Anchor one batch and resolve each submitter's future with its own result"""
+        try:
+            result = await self.report_tool.run_batch_async([incident for incident, _ in batch])
+        except Exception as e:
+            result = {"status": "error", "message": f"Failed to report incident batch: {e}", "error": str(e)}
+        self.batches_sent += 1
+        self.incidents_sent += len(batch)
+        
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if result["status"] != "success":
+                future.set_result(result)
+                continue
+            
+            report = result["reports"][index]
+            future.set_result({
+                "status": "success",
+                "message": f"Incident anchored in batch of {len(batch)} on Neo N3 blockchain",
+                "transaction_hash": result["transaction_hash"],
+                "merkle_root": result["merkle_root"],
+                "leaf_hash": report["leaf_hash"],
+                "merkle_proof": report["merkle_proof"],
+                "incident_data": report["incident_data"],
+                "timestamp": result["timestamp"]
+            })
+    
+    async def flush(self):
+        """Submit whatever is pending immediately and wait for it (e.g. on shutdown)"""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
@@ -0,0 +1,337 @@
+"""
+Report Outbox
+Durable, append-only outbox for approved incidents (SQLite in WAL mode).
+Approved incidents are group-committed to disk before any chain call is attempted;
+a background drainer submits them with retries and exponential backoff, so a failed
+report or a crash between approval and NeoReportTool.run no longer loses the incident.
+Delivery is at-least-once.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+
+from custom_tools.structured_logging import log_event
+
+logger = logging.getLogger("neoguard.outbox")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    incident TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    delivered_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+class ReportOutbox:
+    """
+    SQLite-backed outbox with group commit and a retrying drainer.
+    
+    enqueue() returns once the incident is durable; concurrent enqueues within
+    commit_interval_seconds share one transaction (and one fsync).
+    """
+    
+    def __init__(
+        self,
+        path: str = "neoguard_outbox.db",
+        commit_interval_seconds: float = 0.01,
+        max_group_size: int = 256,
+        drain_batch_size: int = 32,
+        drain_interval_seconds: float = 1.0,
+        max_attempts: int = 8,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 300.0
+    ):
+        """
+        Initialize the outbox.
+        
+        Args:
+            path: SQLite database file
+            commit_interval_seconds: How long enqueues wait to share a group commit
+            max_group_size: Commit immediately once this many enqueues are buffered
+            drain_batch_size: Maximum incidents submitted concurrently per drain pass
+            drain_interval_seconds: Idle poll interval of the drainer
+            max_attempts: Attempts before an incident is parked as 'failed'
+            base_backoff_seconds: First retry delay (doubles per attempt, with jitter)
+            max_backoff_seconds: Upper bound on the retry delay
+        """
+        self.path = path
+        self.commit_interval_seconds = commit_interval_seconds
+        self.max_group_size = max(1, max_group_size)
+        self.drain_batch_size = max(1, drain_batch_size)
+        self.drain_interval_seconds = drain_interval_seconds
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        
+        # A single worker thread serializes all access to the connection
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outbox")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._buffer: List[Tuple[str, asyncio.Future]] = []
+        self._commit_task: Optional[asyncio.Task] = None
+        self._drainer_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        
+        self.enqueued = 0
+        self.group_commits = 0
+        self.delivered = 0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.drain_errors = 0
+        # Rows still awaiting delivery, seeded from the table so leftovers of a previous run count
+        self._pending = 0
+    
+    @property
+    def pending(self) -> int:
+        """Committed incidents not yet delivered or parked as 'failed'"""
+        return self._pending
+    
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.executescript(_SCHEMA)
+        self._pending = conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+        self._conn = conn
+    
+    async def _db(self, fn: Callable, *args):
+        """Run a blocking database operation on the outbox thread"""
+        loop = asyncio.get_running_loop()
+        if self._conn is None:
+            await loop.run_in_executor(self._executor, self._open)
+        return await loop.run_in_executor(self._executor, fn, *args)
+    
+    async def enqueue(self, incident: Dict[str, Any]) -> int:
+        """
+        Durably append an approved incident.
+        
+        Returns:
+            Outbox row id, once the group commit containing it has completed
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._buffer.append((json.dumps(incident, sort_keys=True, default=str), future))
+        
+        if len(self._buffer) >= self.max_group_size:
+            await self._commit()
+        elif self._commit_task is None:
+            self._commit_task = asyncio.create_task(self._commit_after_interval())
+        
+        return await future
+    
+    async def _commit_after_interval(self):
+        await asyncio.sleep(self.commit_interval_seconds)
+        self._commit_task = None
+        await self._commit()
+    
+    async def _commit(self):
+        """Write every buffered incident in one transaction and resolve their futures"""
+        if self._commit_task is not None:
+            self._commit_task.cancel()
+            self._commit_task = None
+        
+        group, self._buffer = self._buffer, []
+        if not group:
+            return
+        
+        try:
+            row_ids = await self._db(self._insert_group, [payload for payload, _ in group])
+        except Exception as e:
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self.group_commits += 1
+        self.enqueued += len(group)
+        self._pending += len(group)
+        for (_, future), row_id in zip(group, row_ids):
+            if not future.done():
+                future.set_result(row_id)
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    def _insert_group(self, payloads: List[str]) -> List[int]:
+        now = time.time()
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            row_ids = []
+            for payload in payloads:
+                cursor.execute(
+                    "INSERT INTO outbox (incident, next_attempt_at, created_at) VALUES (?, ?, ?)",
+                    (payload, now, now)
+                )
+                row_ids.append(cursor.lastrowid)
+            cursor.execute("COMMIT")
+            return row_ids
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+    
+    def _fetch_due(self, limit: int) -> List[Tuple[int, str, int]]:
+        return self._conn.execute(
+            "SELECT id, incident, attempts FROM outbox "
+            "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+            (time.time(), limit)
+        ).fetchall()
+    
+    def _record_outcomes(self, outcomes: List[Tuple[int, int, Optional[str]]]):
+        """Persist a drain pass: (row id, attempts so far, error or None) per incident"""
+        now = time.time()
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for row_id, attempts, error in outcomes:
+                if error is None:
+                    cursor.execute(
+                        "UPDATE outbox SET status = 'delivered', attempts = ?, delivered_at = ?, "
+                        "last_error = NULL WHERE id = ?",
+                        (attempts + 1, now, row_id)
+                    )
+                elif attempts + 1 >= self.max_attempts:
+                    cursor.execute(
+                        "UPDATE outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                        (attempts + 1, error, row_id)
+                    )
+                else:
+                    cursor.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                        (attempts + 1, now + self._backoff(attempts + 1), error, row_id)
+                    )
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+    
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_backoff_seconds, self.base_backoff_seconds * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+    
+    async def drain_once(self, submit: Callable[[Dict[str, Any]], Awaitable[bool]]) -> int:
+        """
+        Submit every due incident once.
+        
+        Args:
+            submit: Coroutine reporting one incident, returning True on success
+        
+        Returns:
+            Number of incidents attempted
+        """
+        rows = await self._db(self._fetch_due, self.drain_batch_size)
+        if not rows:
+            return 0
+        
+        results = await asyncio.gather(
+            *(submit(json.loads(payload)) for _, payload, _ in rows),
+            return_exceptions=True
+        )
+        
+        outcomes = []
+        settled = 0
+        for (row_id, _, attempts), result in zip(rows, results):
+            if isinstance(result, Exception):
+                error = str(result) or type(result).__name__
+            elif not result:
+                error = "report failed"
+            else:
+                error = None
+            
+            if error is None:
+                self.delivered += 1
+                settled += 1
+            elif attempts + 1 >= self.max_attempts:
+                self.dead_lettered += 1
+                settled += 1
+            else:
+                self.retries += 1
+            outcomes.append((row_id, attempts, error))
+        
+        await self._db(self._record_outcomes, outcomes)
+        self._pending -= settled
+        return len(rows)
+    
+    async def _drain_forever(self, submit: Callable[[Dict[str, Any]], Awaitable[bool]]):
+        # The flag backs up cancel(): wait_for can swallow a cancellation that races the wakeup
+        failures = 0
+        while not self._stopping:
+            # Clear before draining so enqueues during the pass trigger another one
+            self._wakeup.clear()
+            try:
+                attempted = await self.drain_once(submit)
+            except Exception as e:
+                # A failed pass (e.g. a SQLite error) must not end the drainer; pending rows stay pending
+                failures += 1
+                self.drain_errors += 1
+                delay = self._backoff(failures)
+                log_event(logger, logging.ERROR, "outbox.drain_failed",
+                          f"❌ Outbox drain failed ({e}); retrying in {delay:.1f}s",
+                          error=str(e), consecutive_failures=failures)
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+            if attempted >= self.drain_batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.drain_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+    
+    def start(self, submit: Callable[[Dict[str, Any]], Awaitable[bool]]):
+        """Start the background drainer (also resubmits anything left pending by a previous run)"""
+        if self._drainer_task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._drainer_task = asyncio.create_task(self._drain_forever(submit))
+    
+    async def stop(self, submit: Optional[Callable[[Dict[str, Any]], Awaitable[bool]]] = None):
+        """
+        Stop the drainer and close the database.
+        If `submit` is given, one final drain pass runs first.
+        """
+        await self._commit()
+        if self._drainer_task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            self._drainer_task.cancel()
+            try:
+                await self._drainer_task
+            except asyncio.CancelledError:
+                pass
+            self._drainer_task = None
+        if submit is not None:
+            await self.drain_once(submit)
+        if self._conn is not None:
+            await self._db(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+    
+    def _counts(self) -> Dict[str, int]:
+        rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return dict(rows)
+    
+    async def stats(self) -> Dict[str, Any]:
+        """Return row counts by status and session counters"""
+        counts = await self._db(self._counts)
+        return {
+            "pending": counts.get("pending", 0),
+            "delivered": counts.get("delivered", 0),
+            "failed": counts.get("failed", 0),
+            "enqueued": self.enqueued,
+            "group_commits": self.group_commits,
+            "retries": self.retries,
+            "dead_lettered": self.dead_lettered,
+            "drain_errors": self.drain_errors
+        }
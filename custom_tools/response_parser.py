@@ -0,0 +1,344 @@
+"""
+Response Parser
+Turns Gemini output into validated, unit-normalized dicts.
+JSON is pulled out of plain, fenced (```json) or prose-wrapped text, truncated output is
+closed off at the last complete value (except for decisions, which are never taken
+from truncated output), and the result is coerced (confidence always in percent,
+should_report always a bool) and checked against a schema compiled once per operation.
+Anything that still does not fit raises ResponseParseError, so callers fall back to
+the local decision instead of acting on a guess.
+"""
+
+import json
+import re
+from typing import Optional, Dict, Any, Callable, List, Tuple
+
+# Schemas use the subset understood by both the compiler below and Gemini's response_schema
+SEVERITY_SCHEMA = {"type": "string", "enum": ["Critical", "High", "Medium", "Low"]}
+STRING_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "severity": SEVERITY_SCHEMA,
+        "recommended_actions": STRING_LIST_SCHEMA,
+        "risk_factors": STRING_LIST_SCHEMA,
+        "should_report": {"type": "boolean"},
+        "reasoning": {"type": "string"},
+        "resources_needed": STRING_LIST_SCHEMA
+    },
+    "required": ["severity"]
+}
+
+DECISION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "should_report": {"type": "boolean"},
+        "confidence": {"type": "number"},
+        "reasoning": {"type": "string"},
+        "alternatives": STRING_LIST_SCHEMA,
+        "risk": {"type": "string"}
+    },
+    "required": ["should_report", "confidence"]
+}
+
+FUSED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analysis": {
+            "type": "object",
+            "properties": {
+                "severity": SEVERITY_SCHEMA,
+                "recommended_actions": STRING_LIST_SCHEMA,
+                "risk_factors": STRING_LIST_SCHEMA
+            },
+            "required": ["severity"]
+        },
+        "decision": {
+            "type": "object",
+            "properties": {
+                "should_report": {"type": "boolean"},
+                "confidence": {"type": "number"},
+                "reasoning": {"type": "string"}
+            },
+            "required": ["should_report", "confidence"]
+        }
+    },
+    "required": ["analysis", "decision"]
+}
+
+NETWORK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "health": {"type": "string"},
+        "deployment": STRING_LIST_SCHEMA,
+        "resource_allocation": STRING_LIST_SCHEMA,
+        "bottlenecks": STRING_LIST_SCHEMA,
+        "optimizations": STRING_LIST_SCHEMA
+    }
+}
+
+# Operation -> schema of its JSON response
+SCHEMAS = {
+    "analyze_incident": ANALYSIS_SCHEMA,
+    "reason_about_network": NETWORK_SCHEMA,
+    "collaborate_on_decision": DECISION_SCHEMA,
+    "assess_and_decide": FUSED_SCHEMA
+}
+
+# How the JSON was recovered, from cheapest to most invasive
+OUTCOMES = ("direct", "extracted", "repaired", "invalid")
+
+# Operations whose answer can put a report on chain: a truncated verdict may have lost
+# the digits that matter ("confidence": 1 cut from 15), so it is never repaired
+NO_REPAIR_OPERATIONS = ("collaborate_on_decision", "assess_and_decide")
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+_TRUE_WORDS = {"true", "yes", "y", "report", "1"}
+_FALSE_WORDS = {"false", "no", "n", "hold", "0"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class ResponseParseError(ValueError):
+    """Model output that is not usable JSON or does not match the operation's schema"""
+
+
+def compile_schema(schema: Dict[str, Any], path: str = "$") -> Callable[[Any], List[str]]:
+    """
+    Compile a schema into a validator returning the list of violations (empty when valid).
+    Supports type (object, array, string, number, integer, boolean), properties,
+    required, items and enum; a None value counts as absent.
+    """
+    kind = schema.get("type")
+    enum = tuple(schema["enum"]) if "enum" in schema else None
+    
+    if kind == "object":
+        properties = {
+            name: compile_schema(child, f"{path}.{name}")
+            for name, child in schema.get("properties", {}).items()
+        }
+        required = tuple(schema.get("required", ()))
+        
+        def validate(value: Any) -> List[str]:
+            if not isinstance(value, dict):
+                return [f"{path}: expected object"]
+            errors = [f"{path}.{name}: required" for name in required if value.get(name) is None]
+            for name, check in properties.items():
+                if value.get(name) is not None:
+                    errors.extend(check(value[name]))
+            return errors
+        return validate
+    
+    if kind == "array":
+        check_item = compile_schema(schema.get("items", {}), f"{path}[]")
+        
+        def validate(value: Any) -> List[str]:
+            if not isinstance(value, list):
+                return [f"{path}: expected array"]
+            errors = []
+            for item in value:
+                errors.extend(check_item(item))
+            return errors
+        return validate
+    
+    accepts: Callable[[Any], bool] = {
+        "string": lambda value: isinstance(value, str),
+        "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+        "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+        "boolean": lambda value: isinstance(value, bool)
+    }.get(kind, lambda value: True)
+    
+    def validate(value: Any) -> List[str]:
+        if not accepts(value):
+            return [f"{path}: expected {kind}"]
+        if enum is not None and value not in enum:
+            return [f"{path}: {value!r} not one of {list(enum)}"]
+        return []
+    return validate
+
+
+def _close_truncated(text: str) -> List[str]:
+    """
+    Candidate completions of JSON cut off mid-stream: the whole text closed off, then
+    the text cut back to each of the last few value separators and closed off.
+    Text that ends in a bare number or literal is not closed off as is, since the
+    cut may have fallen inside that value.
+    """
+    stack: List[str] = []
+    cuts: List[Tuple[int, List[str]]] = []
+    in_string = escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == ",":
+            cuts.append((index, list(stack)))
+    
+    tail = text[:-1] if escaped else text
+    if in_string:
+        tail += '"'
+    tail = tail.rstrip()
+    if tail.endswith(":"):
+        tail += "null"
+    candidates = []
+    if in_string or not (tail[-1:].isalnum() or tail.endswith(".")):
+        candidates.append(tail.rstrip(",") + "".join(reversed(stack)))
+    for index, open_at_cut in reversed(cuts[-3:]):
+        candidates.append(text[:index] + "".join(reversed(open_at_cut)))
+    return candidates
+
+
+def extract_json(text: str) -> Tuple[Any, str]:
+    """
+    Recover the JSON value in a model response.
+    
+    Returns:
+        (value, outcome) with outcome "direct", "extracted" (fenced or surrounded by
+        prose) or "repaired" (truncated output closed off)
+    
+    Raises:
+        ResponseParseError: If no JSON value can be recovered
+    """
+    stripped = (text or "").strip()
+    if not stripped:
+        raise ResponseParseError("empty response")
+    try:
+        return json.loads(stripped), "direct"
+    except json.JSONDecodeError:
+        pass
+    
+    fenced = _FENCE.search(stripped)
+    body = fenced.group(1).strip() if fenced else stripped
+    starts = [index for index in (body.find("{"), body.find("[")) if index >= 0]
+    if not starts:
+        raise ResponseParseError("no JSON object in response")
+    body = body[min(starts):]
+    
+    try:
+        value, _ = json.JSONDecoder().raw_decode(body)
+        return value, "extracted"
+    except json.JSONDecodeError:
+        pass
+    
+    for candidate in _close_truncated(body):
+        try:
+            return json.loads(candidate), "repaired"
+        except json.JSONDecodeError:
+            continue
+    raise ResponseParseError("malformed JSON in response")
+
+
+def normalize_confidence(value: Any) -> Optional[float]:
+    """
+    Confidence in percent (0-100, one decimal), the unit the prompts ask for. Accepts
+    percents (85, "85%") and fractions strictly between 0 and 1 (0.85, "0.85"); whole
+    numbers are always percent, so 1 is 1%, not 100%. Returns None for anything that
+    is not a confidence.
+    """
+    if isinstance(value, str):
+        value = value.strip().rstrip("%").strip()
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        return None
+    if 0 < value < 1:
+        value *= 100
+    if not 0 <= value <= 100:
+        return None
+    return round(float(value), 1)
+
+
+def normalize_should_report(value: Any) -> Any:
+    """Booleans pass through; "yes"/"report"/"true" and "no"/"hold"/"false" become bools"""
+    if isinstance(value, str):
+        word = value.strip().lower()
+        if word in _TRUE_WORDS:
+            return True
+        if word in _FALSE_WORDS:
+            return False
+    return value
+
+
+def _normalize(value: Any) -> Any:
+    """Coerce the decision and severity fields wherever they appear (unusable confidences raise)"""
+    if isinstance(value, dict):
+        normalized = {key: _normalize(item) for key, item in value.items()}
+        if "should_report" in normalized:
+            normalized["should_report"] = normalize_should_report(normalized["should_report"])
+        if normalized.get("confidence") is not None:
+            confidence = normalize_confidence(normalized["confidence"])
+            if confidence is None:
+                raise ResponseParseError(f"confidence {normalized['confidence']!r} is not a fraction or percent")
+            normalized["confidence"] = confidence
+        severity = normalized.get("severity")
+        if isinstance(severity, str):
+            normalized["severity"] = severity.strip().capitalize()
+        return normalized
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+class ResponseParser:
+    """Per-operation extraction, normalization and validation of model responses"""
+    
+    def __init__(self, schemas: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize the parser.
+        
+        Args:
+            schemas: Operation -> response schema (defaults to SCHEMAS)
+        """
+        self.schemas = schemas or SCHEMAS
+        self._validators = {operation: compile_schema(schema) for operation, schema in self.schemas.items()}
+        self.outcomes = {outcome: 0 for outcome in OUTCOMES}
+    
+    def schema(self, operation: str) -> Optional[Dict[str, Any]]:
+        """Response schema of an operation (None for free-text operations)"""
+        return self.schemas.get(operation)
+    
+    def parse(self, operation: str, text: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Parse one response.
+        
+        Returns:
+            (normalized value, outcome) with outcome as in extract_json
+        
+        Raises:
+            ResponseParseError: If the response is not JSON or violates the schema
+        """
+        try:
+            value, outcome = extract_json(text)
+            if outcome == "repaired" and operation in NO_REPAIR_OPERATIONS:
+                raise ResponseParseError(f"truncated {operation} response")
+            value = _normalize(value)
+            validator = self._validators.get(operation)
+            errors = validator(value) if validator is not None else []
+            if errors:
+                raise ResponseParseError("; ".join(errors[:5]))
+        except ResponseParseError:
+            self.outcomes["invalid"] += 1
+            raise
+        self.outcomes[outcome] += 1
+        return value, outcome
+    
+    def stats(self) -> Dict[str, Any]:
+        total = sum(self.outcomes.values())
+        return {
+            "responses": total,
+            "outcomes": dict(self.outcomes),
+            "invalid_rate": round(self.outcomes["invalid"] / total, 4) if total else 0.0
+        }
@@ -0,0 +1,222 @@
+"""
+Adaptive Sector Scheduler
+Priority-driven revisit scheduling for sector patrols.
+Each sector gets a revisit deadline from its recent alert history, detection
+confidence and drone availability; deadlines live in a hashed timing wheel and
+sectors that come due together are served from a priority queue, hottest first.
+Ticks are anchored to the start time, so lag never accumulates across cycles.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Optional, Dict, Any, List, Tuple
+
+
+class SectorState:
+    """Scheduling state of one sector"""
+    
+    def __init__(self, sector_id: str, heat_updated: float = 0.0, interval: float = 0.0):
+        self.sector_id = sector_id
+        self.heat = 0.0
+        self.heat_updated = heat_updated
+        self.clear_streak = 0
+        self.last_confidence = 0.0
+        self.interval = interval
+        self.deadline_tick = 0
+        self.generation = 0
+        self.visits = 0
+        self.alerts = 0
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel with an overflow heap for deadlines beyond one rotation.
+    schedule() and advance() are O(1) per entry; stale entries are skipped lazily.
+    """
+    
+    def __init__(self, slots: int = 512):
+        self.slots = max(1, slots)
+        self._wheel: List[List[Tuple[int, Any]]] = [[] for _ in range(self.slots)]
+        self._overflow: List[Tuple[int, int, Any]] = []
+        self._seq = itertools.count()
+        self.current_tick = 0
+    
+    def schedule(self, deadline_tick: int, item: Any):
+        deadline_tick = max(deadline_tick, self.current_tick + 1)
+        if deadline_tick - self.current_tick < self.slots:
+            self._wheel[deadline_tick % self.slots].append((deadline_tick, item))
+        else:
+            heapq.heappush(self._overflow, (deadline_tick, next(self._seq), item))
+    
+    def advance(self, to_tick: int) -> List[Tuple[int, Any]]:
+        """Move the wheel to `to_tick` and return every (deadline_tick, item) that came due"""
+        due = []
+        while self.current_tick < to_tick:
+            self.current_tick += 1
+            while self._overflow and self._overflow[0][0] - self.current_tick < self.slots:
+                deadline_tick, _, item = heapq.heappop(self._overflow)
+                if deadline_tick <= self.current_tick:
+                    due.append((deadline_tick, item))
+                else:
+                    self._wheel[deadline_tick % self.slots].append((deadline_tick, item))
+            slot = self._wheel[self.current_tick % self.slots]
+            if slot:
+                due.extend(slot)
+                slot.clear()
+        return due
+
+
+class SectorScheduler:
+    """
+    Adaptive revisit scheduler.
+    
+    interval = base_interval * backoff_factor ** clear_streak / (1 + heat_gain * heat) / availability
+    clamped to [min_interval, max_interval], where heat is an exponentially decaying
+    sum of recent alert confidences and availability is the active share of the drone fleet.
+    """
+    
+    def __init__(
+        self,
+        sectors: List[str],
+        tick_seconds: float = 0.5,
+        base_interval: float = 5.0,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        backoff_factor: float = 1.5,
+        heat_half_life: float = 120.0,
+        heat_gain: float = 4.0,
+        wheel_slots: int = 512
+    ):
+        """
+        Initialize the scheduler. Every sector is due on the first tick.
+        
+        Args:
+            sectors: Sector ids to patrol
+            tick_seconds: Scheduling resolution
+            base_interval: Revisit interval of a sector with no history
+            min_interval: Fastest revisit (hot sectors)
+            max_interval: Slowest revisit (long-quiet sectors)
+            backoff_factor: Interval growth per consecutive clear scan
+            heat_half_life: Seconds for alert heat to halve
+            heat_gain: How strongly heat shortens the interval
+            wheel_slots: Timing wheel size
+        """
+        self.tick_seconds = tick_seconds
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.heat_half_life = heat_half_life
+        self.heat_gain = heat_gain
+        self.availability = 1.0
+        
+        self.wheel = TimingWheel(wheel_slots)
+        self.states: Dict[str, SectorState] = {}
+        self._ready: List[Tuple[float, int, int, str]] = []
+        self._seq = itertools.count()
+        
+        for sector_id in sectors:
+            self.add_sector(sector_id)
+    
+    def add_sector(self, sector_id: str, now: float = 0.0):
+        state = SectorState(sector_id=sector_id, heat_updated=now, interval=self.base_interval)
+        self.states[sector_id] = state
+        self._schedule(state, self.wheel.current_tick + 1)
+    
+    def remove_sector(self, sector_id: str):
+        # Outstanding wheel entries carry the old generation and are skipped
+        self.states.pop(sector_id, None)
+    
+    def set_drone_availability(self, active_drones: int, total_drones: int):
+        """Scale revisit intervals by the share of the fleet that is available"""
+        self.availability = max(0.1, active_drones / total_drones) if total_drones else 0.1
+    
+    def tick_at(self, elapsed_seconds: float) -> int:
+        """Tick number for a time offset from the scheduler start (drift-free anchor)"""
+        return int(elapsed_seconds / self.tick_seconds)
+    
+    def _schedule(self, state: SectorState, deadline_tick: int):
+        state.generation += 1
+        state.deadline_tick = deadline_tick
+        self.wheel.schedule(deadline_tick, (state.sector_id, state.generation))
+    
+    def _heat(self, state: SectorState, now: float) -> float:
+        if now > state.heat_updated:
+            state.heat *= math.pow(0.5, (now - state.heat_updated) / self.heat_half_life)
+            state.heat_updated = now
+        return state.heat
+    
+    def priority(self, state: SectorState, now: float) -> float:
+        """Higher is more urgent: hot, high-confidence sectors first"""
+        return self._heat(state, now) + state.last_confidence
+    
+    def due(self, now_tick: int, now: float, limit: Optional[int] = None) -> List[str]:
+        """
+        Advance to `now_tick` and pop due sectors, most urgent first.
+        Sectors beyond `limit` stay queued (ahead of later arrivals of lower priority).
+        """
+        for _, (sector_id, generation) in self.wheel.advance(now_tick):
+            state = self.states.get(sector_id)
+            if state is None or state.generation != generation:
+                continue
+            heapq.heappush(self._ready, (-self.priority(state, now), state.deadline_tick, next(self._seq), sector_id))
+        
+        picked = []
+        while self._ready and (limit is None or len(picked) < limit):
+            _, _, _, sector_id = heapq.heappop(self._ready)
+            if sector_id in self.states:
+                picked.append(sector_id)
+        return picked
+    
+    def pending(self) -> int:
+        """Sectors that are due but not yet handed out"""
+        return len(self._ready)
+    
+    def record_result(self, sector_id: str, now: float, alert: bool, confidence: float = 0.0) -> float:
+        """
+        Update a sector's history after a scan and schedule its next visit.
+        
+        Returns:
+            The new revisit interval in seconds
+        """
+        state = self.states.get(sector_id)
+        if state is None:
+            return 0.0
+        
+        heat = self._heat(state, now)
+        state.visits += 1
+        if alert:
+            state.alerts += 1
+            state.heat = heat + confidence
+            state.clear_streak = 0
+            state.last_confidence = confidence
+        else:
+            state.clear_streak += 1
+            state.last_confidence = 0.0
+        
+        interval = self.base_interval * math.pow(self.backoff_factor, min(state.clear_streak, 32))
+        interval /= (1.0 + self.heat_gain * state.heat)
+        interval /= self.availability
+        state.interval = min(self.max_interval, max(self.min_interval, interval))
+        
+        now_tick = self.tick_at(now)
+        self._schedule(state, now_tick + max(1, int(round(state.interval / self.tick_seconds))))
+        return state.interval
+    
+    def snapshot(self, now: float) -> List[Dict[str, Any]]:
+        """Per-sector scheduling state, most urgent first"""
+        rows = [
+            {
+                "sector_id": state.sector_id,
+                "interval_seconds": round(state.interval, 3),
+                "next_visit_seconds": round(state.deadline_tick * self.tick_seconds - now, 3),
+                "heat": round(self._heat(state, now), 4),
+                "clear_streak": state.clear_streak,
+                "visits": state.visits,
+                "alerts": state.alerts
+            }
+            for state in self.states.values()
+        ]
+        rows.sort(key=lambda row: (-row["heat"], row["next_visit_seconds"]))
+        return rows
@@ -0,0 +1,187 @@
+"""
+Structured Logging
+Non-blocking logging for the agent hot path: records go onto a bounded queue
+and are formatted and written by a background listener thread, so a slow
+stdout or log collector never stalls the event loop.
+
+Output is either console text (the message only, as the agent always printed)
+or JSON lines with the event name and structured fields. High-volume events
+can be sampled, and per-incident detail is kept off the console in production.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+
+# Per-incident detail (analysis steps, approvals, transaction hashes)
+INCIDENT_LOGGER = "neoguard.incident"
+
+
+def log_event(logger: logging.Logger, level: int, event: str, message: str, **fields):
+    """
+    Emit one structured record.
+    
+    Args:
+        logger: Target logger
+        level: logging level
+        event: Stable event name, e.g. "incident.analyze" (used for sampling and filtering)
+        message: Human-readable message (what the console shows)
+        fields: Structured fields (JSON output only)
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"event": event, "fields": fields})
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, event, message and fields"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage().strip()
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep roughly `rate` of the records of each sampled event (deterministic 1-in-N).
+    Warnings and errors are never sampled out.
+    """
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.every = {event: max(1, round(1 / rate)) if rate > 0 else 0 for event, rate in rates.items()}
+        self.seen: Dict[str, int] = {}
+        self.suppressed = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        every = self.every.get(event)
+        if every is None or record.levelno >= logging.WARNING:
+            return True
+        count = self.seen.get(event, 0)
+        self.seen[event] = count + 1
+        if every and count % every == 0:
+            return True
+        self.suppressed += 1
+        return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler over a bounded queue that drops (and counts) records instead of waiting"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingRuntime:
+    """Handle on the configured logging pipeline; stop() flushes and joins the writer thread"""
+    
+    def __init__(self, handler: NonBlockingQueueHandler, listener: logging.handlers.QueueListener, sampler: SamplingFilter):
+        self.handler = handler
+        self.listener = listener
+        self.sampler = sampler
+        # setup_logging starts the listener before handing out the runtime
+        self.running = True
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.handler.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampler.suppressed
+        }
+    
+    def flush(self):
+        """Block until every queued record has been written"""
+        if self.running:
+            self.handler.queue.join()
+    
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+_runtime: Optional[LoggingRuntime] = None
+
+
+def setup_logging(config: Optional[Dict[str, Any]] = None) -> LoggingRuntime:
+    """
+    Configure the "neoguard" logger tree from the `logging` config section.
+    
+    Config keys:
+        mode: "development" (console text, incident detail shown) or "production"
+              (JSON lines, incident detail only at WARNING and above)
+        level: Root level for neoguard loggers (default INFO)
+        format: "console" or "json" (defaults from mode)
+        file: Optional path; records are appended there instead of stdout
+        queue_size: Bound of the in-memory queue (records beyond it are dropped)
+        sampling: {event: rate} for high-volume events
+        incident_console: Override whether per-incident detail is logged
+    
+    Calling it again replaces the previous configuration.
+    """
+    global _runtime
+    config = config or {}
+    production = config.get("mode", "development") == "production"
+    
+    if _runtime is not None:
+        _runtime.stop()
+    
+    if config.get("file"):
+        sink: logging.Handler = logging.FileHandler(config["file"], encoding="utf-8")
+    else:
+        sink = logging.StreamHandler(sys.stdout)
+    output_format = config.get("format", "json" if production else "console")
+    sink.setFormatter(JsonLinesFormatter() if output_format == "json" else logging.Formatter("%(message)s"))
+    
+    log_queue: queue.Queue = queue.Queue(maxsize=config.get("queue_size", 10000))
+    handler = NonBlockingQueueHandler(log_queue)
+    sampler = SamplingFilter(config.get("sampling", {}))
+    handler.addFilter(sampler)
+    listener = logging.handlers.QueueListener(log_queue, sink, respect_handler_level=True)
+    
+    root = logging.getLogger("neoguard")
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(config.get("level", "INFO"))
+    root.propagate = False
+    
+    show_incidents = config.get("incident_console", not production)
+    logging.getLogger(INCIDENT_LOGGER).setLevel(logging.NOTSET if show_incidents else logging.WARNING)
+    
+    listener.start()
+    _runtime = LoggingRuntime(handler, listener, sampler)
+    return _runtime
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _runtime
+    if _runtime is not None:
+        _runtime.stop()
+        _runtime = None
@@ -0,0 +1,218 @@
+"""
+Drone Telemetry Store
+Structure-of-arrays store of per-drone telemetry (battery, position, link quality,
+heartbeat) with a fixed-size ring buffer of history per drone.
+Appends are O(1); fleet aggregates are vectorized over the current-value arrays
+and feed the network state used by the decision agents.
+"""
+
+import time
+from typing import Optional, Dict, Any, List, Callable
+
+import numpy as np
+
+FIELDS = ("battery", "lat", "lng", "link_quality")
+
+
+class TelemetryStore:
+    """
+    Columnar telemetry for a drone fleet.
+    
+    Row i of every array describes drone_ids[i]; history is a (drones, history_size, fields)
+    ring buffer with one write position per drone.
+    """
+    
+    def __init__(
+        self,
+        drone_ids: Optional[List[str]] = None,
+        history_size: int = 256,
+        heartbeat_timeout_seconds: float = 15.0,
+        min_battery: float = 20.0,
+        min_link_quality: float = 0.3,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            drone_ids: Drones known up front (others are registered on first sample)
+            history_size: Samples kept per drone
+            heartbeat_timeout_seconds: A drone with no heartbeat for this long counts as offline
+            min_battery: Battery percentage below which a drone is not counted as active
+            min_link_quality: Link quality (0-1) below which a drone is not counted as active
+            clock: Time source in seconds (defaults to time.time)
+        """
+        self.history_size = max(1, history_size)
+        self.heartbeat_timeout_seconds = heartbeat_timeout_seconds
+        self.min_battery = min_battery
+        self.min_link_quality = min_link_quality
+        self.clock = clock or time.time
+        
+        self.drone_ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self._allocate(max(4, len(drone_ids or [])))
+        for drone_id in drone_ids or []:
+            self.register(drone_id)
+    
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.current = np.full((capacity, len(FIELDS)), np.nan)
+        self.last_heartbeat = np.full(capacity, np.nan)
+        self.history = np.full((capacity, self.history_size, len(FIELDS)), np.nan)
+        self.history_ts = np.full((capacity, self.history_size), np.nan)
+        self.head = np.zeros(capacity, dtype=np.int64)
+        self.count = np.zeros(capacity, dtype=np.int64)
+    
+    def _grow(self):
+        old = (self.current, self.last_heartbeat, self.history, self.history_ts, self.head, self.count)
+        size = len(self.drone_ids)
+        self._allocate(self.capacity * 2)
+        for new, previous in zip(
+            (self.current, self.last_heartbeat, self.history, self.history_ts, self.head, self.count),
+            old
+        ):
+            new[:size] = previous[:size]
+    
+    def __len__(self) -> int:
+        return len(self.drone_ids)
+    
+    def register(self, drone_id: str) -> int:
+        """Row of a drone, adding it if it is new"""
+        row = self.rows.get(drone_id)
+        if row is not None:
+            return row
+        if len(self.drone_ids) == self.capacity:
+            self._grow()
+        row = len(self.drone_ids)
+        self.drone_ids.append(drone_id)
+        self.rows[drone_id] = row
+        return row
+    
+    def record(
+        self,
+        drone_id: str,
+        battery: float,
+        lat: float,
+        lng: float,
+        link_quality: float,
+        timestamp: Optional[float] = None
+    ):
+        """Append one telemetry sample (also counts as a heartbeat)"""
+        if timestamp is None:
+            timestamp = self.clock()
+        row = self.register(drone_id)
+        sample = (battery, lat, lng, link_quality)
+        
+        slot = self.head[row]
+        self.current[row] = sample
+        self.history[row, slot] = sample
+        self.history_ts[row, slot] = timestamp
+        self.head[row] = (slot + 1) % self.history_size
+        self.count[row] = min(self.count[row] + 1, self.history_size)
+        self.last_heartbeat[row] = timestamp
+    
+    def heartbeat(self, drone_id: str, timestamp: Optional[float] = None):
+        """Mark a drone as alive without a full sample"""
+        self.last_heartbeat[self.register(drone_id)] = self.clock() if timestamp is None else timestamp
+    
+    def record_status(self, drones: List[Dict[str, Any]], timestamp: Optional[float] = None):
+        """
+        Ingest the per-drone list of a swarm status report.
+        
+        Args:
+            drones: [{"drone_id", "battery", "coordinates": {"lat", "lng"}, "link_quality"}]
+        """
+        if timestamp is None:
+            timestamp = self.clock()
+        for drone in drones:
+            coordinates = drone.get("coordinates", {})
+            self.record(
+                drone["drone_id"],
+                drone.get("battery", np.nan),
+                coordinates.get("lat", np.nan),
+                coordinates.get("lng", np.nan),
+                drone.get("link_quality", 1.0),
+                timestamp
+            )
+    
+    def latest(self, drone_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent sample of a drone"""
+        row = self.rows.get(drone_id)
+        if row is None or not self.count[row]:
+            return None
+        sample = {field: float(value) for field, value in zip(FIELDS, self.current[row])}
+        sample["last_heartbeat"] = float(self.last_heartbeat[row])
+        return sample
+    
+    def drone_history(self, drone_id: str, last: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Chronological history of one drone.
+        
+        Args:
+            last: Only the most recent `last` samples
+        
+        Returns:
+            {"timestamp": array, "battery": array, "lat": array, "lng": array, "link_quality": array}
+        """
+        row = self.rows.get(drone_id)
+        if row is None:
+            return {name: np.empty(0) for name in ("timestamp",) + FIELDS}
+        
+        count = int(self.count[row])
+        if last is not None:
+            count = min(count, max(0, last))
+        slots = (self.head[row] - count + np.arange(count)) % self.history_size
+        samples = self.history[row, slots]
+        result = {"timestamp": self.history_ts[row, slots]}
+        for n, field in enumerate(FIELDS):
+            result[field] = samples[:, n]
+        return result
+    
+    def active_mask(self, now: Optional[float] = None) -> np.ndarray:
+        """Drones with a recent heartbeat, enough battery and a usable link"""
+        if now is None:
+            now = self.clock()
+        size = len(self.drone_ids)
+        with np.errstate(invalid="ignore"):
+            return (
+                (now - self.last_heartbeat[:size] <= self.heartbeat_timeout_seconds) &
+                (self.current[:size, 0] >= self.min_battery) &
+                (self.current[:size, 3] >= self.min_link_quality)
+            )
+    
+    def aggregates(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Vectorized fleet-level aggregates over the latest samples"""
+        if now is None:
+            now = self.clock()
+        size = len(self.drone_ids)
+        active = self.active_mask(now)
+        battery = self.current[:size, 0]
+        link = self.current[:size, 3]
+        reporting = ~np.isnan(battery)
+        
+        with np.errstate(invalid="ignore"):
+            stale = int(np.count_nonzero(~(now - self.last_heartbeat[:size] <= self.heartbeat_timeout_seconds)))
+        
+        return {
+            "total_drones": size,
+            "active_drones": int(np.count_nonzero(active)),
+            "stale_drones": stale,
+            "average_battery": round(float(battery[reporting].mean()), 1) if reporting.any() else 0.0,
+            "min_battery": round(float(battery[reporting].min()), 1) if reporting.any() else 0.0,
+            "average_link_quality": round(float(link[reporting].mean()), 3) if reporting.any() else 0.0,
+            "low_battery_drones": [
+                self.drone_ids[i]
+                for i in np.flatnonzero(reporting & (battery < self.min_battery)).tolist()
+            ]
+        }
+    
+    def network_state(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Network state dict for decision prompts (total/active drones, battery, status)"""
+        state = self.aggregates(now)
+        if state["total_drones"] and state["active_drones"] * 2 >= state["total_drones"]:
+            state["network_status"] = "operational"
+        elif state["active_drones"]:
+            state["network_status"] = "degraded"
+        else:
+            state["network_status"] = "offline"
+        return state
@@ -7,13 +7,33 @@ Uses Spoon OS primarily with Gemini as fallback for collaborative reasoning.
 
 import asyncio
 import json
+import logging
 import os
+import time
 from datetime import datetime
 from typing import Optional
 
 # Import custom tools
 from custom_tools.neo_actions import NeoReportTool, NeoWalletApprovalTool
 from custom_tools.gemini_fallback import GeminiFallbackAgent, HybridAgent
+from custom_tools.circuit_breaker import CircuitBreaker, STATES
+from custom_tools.llm_scheduler import LLMRequestScheduler
+from custom_tools.decision_cache import DecisionCache
+from custom_tools.decision_engine import TieredDecisionEngine, TIERS
+from custom_tools.incident_index import IncidentIndex
+from custom_tools.report_batcher import ReportBatcher
+from custom_tools.neo_rpc import NeoRpcClient
+from custom_tools.report_outbox import ReportOutbox
+from custom_tools.pipeline import Pipeline, Stage
+from custom_tools.sector_scheduler import SectorScheduler
+from custom_tools.telemetry_store import TelemetryStore
+from custom_tools.history_archive import HistoryArchive, INCIDENT_OUTCOMES
+from custom_tools.metrics import MetricsRegistry, MetricsServer, timed
+from custom_tools.structured_logging import INCIDENT_LOGGER, log_event, setup_logging, shutdown_logging
+from custom_tools.incident_replay import IncidentRecorder, IncidentReplay, ReplayHybridAgent, ReplayReportTool
+
+logger = logging.getLogger("neoguard.agent")
+incident_log = logging.getLogger(INCIDENT_LOGGER)
 
 
 class SpoonOSAgent:
@@ -25,15 +45,56 @@ class SpoonOSAgent:
     def __init__(self, config_path: str = "config.json"):
         """Initialize the Spoon OS agent"""
         self.config = self._load_config(config_path)
+        self.logging_runtime = setup_logging(self.config.get("logging", {}))
         self.agent_name = self.config["agent"]["name"]
         self.role = self.config["agent"]["role"]
         self.confidence_threshold = self.config["monitoring"]["confidence_threshold"]
         self.check_interval = self.config["monitoring"]["check_interval_seconds"]
         
+        # Patrol configuration: "single" scans one random sector per cycle,
+        # "sweep" fans out over every configured sector concurrently,
+        # "pipeline" streams sectors through staged detect/analyze/approve/report queues,
+        # "adaptive" revisits each sector on a deadline driven by its alert history
+        monitoring = self.config["monitoring"]
+        self.patrol_mode = monitoring.get("patrol_mode", "single")
+        self.sectors = monitoring.get("sectors", [f"Sector-{i}" for i in range(1, 5)])
+        self.max_concurrent_sectors = max(1, monitoring.get("max_concurrent_sectors", len(self.sectors)))
+        
+        # Latency histograms, counters and queue gauges; served over HTTP when enabled
+        metrics_config = self.config.get("metrics", {})
+        self.metrics = MetricsRegistry()
+        self.metrics_server = None
+        if metrics_config.get("enabled", False):
+            self.metrics_server = MetricsServer(
+                self.metrics,
+                host=metrics_config.get("host", "127.0.0.1"),
+                port=metrics_config.get("port", 9464)
+            )
+        
         # Initialize tools
-        self.neo_report_tool = NeoReportTool()
+        rpc_config = self.config["blockchain"].get("rpc", {})
+        self.rpc_client = None
+        if rpc_config.get("enabled", False):
+            self.rpc_client = NeoRpcClient(
+                rpc_url=self.config["blockchain"]["rpc_url"],
+                pool_size=rpc_config.get("pool_size", 8),
+                max_batch_size=rpc_config.get("max_batch_size", 32),
+                batch_window_seconds=rpc_config.get("batch_window_seconds", 0.0),
+                timeout=rpc_config.get("timeout_seconds", 10.0)
+            )
+        self.neo_report_tool = NeoReportTool(rpc_client=self.rpc_client)
         self.wallet_approval_tool = NeoWalletApprovalTool()
         
+        # Batch reporting anchors many incidents under one Merkle root per transaction
+        batch_config = self.config["blockchain"].get("batch_reporting", {})
+        self.report_batcher = None
+        if batch_config.get("enabled", False):
+            self.report_batcher = ReportBatcher(
+                self.neo_report_tool,
+                max_batch_size=batch_config.get("max_batch_size", 16),
+                max_wait_seconds=batch_config.get("max_wait_seconds", 0.5)
+            )
+        
         # Initialize Gemini fallback agent
         gemini_api_key = os.getenv("GEMINI_API_KEY")
         self.gemini_agent = None
@@ -41,20 +102,186 @@ class SpoonOSAgent:
         
         if gemini_api_key:
             try:
-                self.gemini_agent = GeminiFallbackAgent(api_key=gemini_api_key)
-                self.hybrid_agent = HybridAgent(spoon_agent=self, gemini_api_key=gemini_api_key)
+                gemini_config = self.config.get("gemini", {})
+                hedging = gemini_config.get("hedging", {})
+                self.gemini_agent = GeminiFallbackAgent(
+                    api_key=gemini_api_key,
+                    request_timeout=gemini_config.get("request_timeout_seconds", 30.0),
+                    max_workers=gemini_config.get("max_workers", 4),
+                    metrics=self.metrics,
+                    breaker=self.build_circuit_breaker(),
+                    hedge_quantile=hedging.get("quantile", 0.95) if hedging.get("enabled", False) else None,
+                    hedge_min_delay=hedging.get("min_delay_seconds", 0.05),
+                    scheduler=self.build_llm_scheduler(),
+                    structured_output=gemini_config.get("structured_output", True)
+                )
+                self.hybrid_agent = HybridAgent(
+                    spoon_agent=self,
+                    gemini_agent=self.gemini_agent,
+                    decision_mode=gemini_config.get("decision_mode", "fused")
+                )
                 print("✅ Gemini fallback agent initialized")
             except Exception as e:
                 print(f"⚠️  Gemini initialization failed: {e}")
         else:
             print("⚠️  GEMINI_API_KEY not set - fallback disabled")
         
+        # Durable outbox: approved incidents survive report failures and restarts
+        outbox_config = self.config.get("outbox", {})
+        self.report_outbox = None
+        if outbox_config.get("enabled", False):
+            self.report_outbox = ReportOutbox(
+                path=outbox_config.get("path", "neoguard_outbox.db"),
+                commit_interval_seconds=outbox_config.get("commit_interval_seconds", 0.01),
+                max_group_size=outbox_config.get("max_group_size", 256),
+                drain_batch_size=outbox_config.get("drain_batch_size", 32),
+                drain_interval_seconds=outbox_config.get("drain_interval_seconds", 1.0),
+                max_attempts=outbox_config.get("max_attempts", 8),
+                base_backoff_seconds=outbox_config.get("base_backoff_seconds", 1.0),
+                max_backoff_seconds=outbox_config.get("max_backoff_seconds", 300.0)
+            )
+        
+        # Cache of recent LLM verdicts keyed on normalized incident signatures
+        cache_config = self.config.get("decision_cache", {})
+        self.decision_cache = None
+        if cache_config.get("enabled", True):
+            self.decision_cache = DecisionCache(
+                max_entries=cache_config.get("max_entries", 1024),
+                ttl_seconds=cache_config.get("ttl_seconds", 300),
+                confidence_bucket=cache_config.get("confidence_bucket", 0.05),
+                coordinate_precision=cache_config.get("coordinate_precision", 3)
+            )
+        
+        # Local rule/score tiers; only incidents in the uncertainty band reach the LLM.
+        # The band defaults to [0.75, 0.95] widened to contain the confidence threshold.
+        engine_config = self.config.get("decision_engine", {})
+        self.decision_engine = None
+        if engine_config.get("enabled", True):
+            self.decision_engine = TieredDecisionEngine(
+                report_at=engine_config.get("report_at", max(0.95, self.confidence_threshold)),
+                hold_below=engine_config.get("hold_below", min(0.75, self.confidence_threshold)),
+                type_weights=engine_config.get("type_weights", {}),
+                rules=engine_config.get("rules", []),
+                threshold=self.confidence_threshold
+            )
+        
+        # Spatio-temporal index that merges repeat sightings of an open incident
+        dedup_config = self.config.get("deduplication", {})
+        self.incident_index = None
+        if dedup_config.get("enabled", True):
+            self.incident_index = IncidentIndex(
+                window_seconds=dedup_config.get("window_seconds", 600),
+                geohash_precision=dedup_config.get("geohash_precision", 6),
+                escalate_at=self.confidence_threshold
+            )
+        
+        # Per-drone telemetry with ring-buffer history; feeds network_state()
+        telemetry_config = self.config.get("telemetry", {})
+        self.telemetry = TelemetryStore(
+            drone_ids=telemetry_config.get("drones", ["UNIT-001", "UNIT-002", "UNIT-003"]),
+            history_size=telemetry_config.get("history_size", 256),
+            heartbeat_timeout_seconds=telemetry_config.get("heartbeat_timeout_seconds", 15),
+            min_battery=telemetry_config.get("min_battery", 20),
+            min_link_quality=telemetry_config.get("min_link_quality", 0.3)
+        )
+        
+        # Append-only incident history for post-incident analysis
+        archive_config = self.config.get("archive", {})
+        self.archive = None
+        if archive_config.get("enabled", True):
+            self.archive = HistoryArchive(
+                path=archive_config.get("path", "neoguard_archive"),
+                partition_seconds=archive_config.get("partition_seconds", 3600)
+            )
+        
+        # Optional recording of the incident stream and model/chain timing for offline replay
+        record_path = self.config.get("replay", {}).get("record_path")
+        self.recorder = IncidentRecorder(record_path) if record_path else None
+        
         # State tracking
         self.is_running = False
         self.incidents_detected = 0
         self.incidents_reported = 0
         self.last_check = None
         self.fallback_used = False
+        self.circuit_fallbacks = 0
+        self._register_metrics()
+    
+    def build_circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """Build the Gemini circuit breaker from config.json (None when disabled)"""
+        breaker_config = self.config.get("gemini", {}).get("circuit_breaker", {})
+        if not breaker_config.get("enabled", True):
+            return None
+        return CircuitBreaker(
+            window_size=breaker_config.get("window_size", 50),
+            min_calls=breaker_config.get("min_calls", 10),
+            error_rate_threshold=breaker_config.get("error_rate_threshold", 0.5),
+            latency_threshold_seconds=breaker_config.get("latency_threshold_seconds"),
+            latency_quantile=breaker_config.get("latency_quantile", 0.95),
+            open_seconds=breaker_config.get("open_seconds", 30.0),
+            half_open_probes=breaker_config.get("half_open_probes", 1),
+            close_after_successes=breaker_config.get("close_after_successes", 2)
+        )
+    
+    def build_llm_scheduler(self) -> Optional[LLMRequestScheduler]:
+        """Build the shared Gemini request scheduler from config.json (None when disabled)"""
+        scheduler_config = self.config.get("gemini", {}).get("scheduler", {})
+        if not scheduler_config.get("enabled", True):
+            return None
+        return LLMRequestScheduler(
+            requests_per_minute=scheduler_config.get("requests_per_minute", 60),
+            burst=scheduler_config.get("burst", 10),
+            max_concurrent=scheduler_config.get("max_concurrent", 4),
+            priorities=scheduler_config.get("priorities"),
+            quota_backoff_seconds=scheduler_config.get("quota_backoff_seconds", 10.0)
+        )
+    
+    def _register_metrics(self):
+        """Expose component counters and queue depths, read at scrape time"""
+        self.metrics.counter("incidents_detected_total", lambda: self.incidents_detected, "Incidents detected this session")
+        self.metrics.counter("incidents_reported_total", lambda: self.incidents_reported,
+                             "Incidents reported on-chain this session")
+        if self.decision_cache is not None:
+            self.metrics.counter("decision_cache_hits_total", lambda: self.decision_cache.hits, "Decision cache hits")
+            self.metrics.counter("decision_cache_misses_total", lambda: self.decision_cache.misses, "Decision cache misses")
+            self.metrics.gauge("decision_cache_entries", lambda: len(self.decision_cache), "Decision cache size")
+        if self.gemini_agent is not None:
+            self.metrics.counter("gemini_hedges_sent_total", lambda: self.gemini_agent.hedges_sent,
+                                 "Hedged Gemini calls sent")
+            self.metrics.counter("gemini_hedges_won_total", lambda: self.gemini_agent.hedges_won,
+                                 "Hedged Gemini calls that answered first")
+            if self.gemini_agent.breaker is not None:
+                breaker = self.gemini_agent.breaker
+                self.metrics.gauge("gemini_circuit_state", lambda: STATES.index(breaker.state),
+                                   "Gemini circuit breaker state (0 closed, 1 half-open, 2 open)")
+                self.metrics.counter("gemini_circuit_trips_total", lambda: breaker.trips, "Gemini circuit breaker trips")
+            if self.gemini_agent.scheduler is not None:
+                scheduler = self.gemini_agent.scheduler
+                self.metrics.gauge("llm_queue_depth", lambda: scheduler.queue_depth,
+                                   "Gemini requests waiting for quota or a concurrency slot")
+                self.metrics.counter("llm_requests_coalesced_total", lambda: scheduler.coalesced,
+                                     "Gemini requests answered by an identical request already in flight")
+                self.metrics.counter("llm_requests_dispatched_total", lambda: scheduler.dispatched, "Gemini requests sent")
+                self.metrics.counter("llm_quota_errors_total", lambda: scheduler.quota_errors,
+                                     "Gemini requests rejected for rate limit or quota")
+        if self.decision_engine is not None:
+            for tier in TIERS:
+                self.metrics.counter("decision_tier_incidents_total", lambda tier=tier: self.decision_engine.counts[tier],
+                                     "Incidents settled (or escalated) per decision tier", tier=tier)
+        if self.incident_index is not None:
+            self.metrics.counter("duplicate_sightings_merged_total", lambda: self.incident_index.merged_sightings,
+                                 "Repeat sightings merged into open incidents")
+        if self.report_batcher is not None:
+            self.metrics.gauge("queue_depth", lambda: self.report_batcher.pending,
+                               "Items waiting in agent queues", queue="report_batcher")
+        if self.report_outbox is not None:
+            self.metrics.gauge("queue_depth", lambda: self.report_outbox.pending,
+                               "Items waiting in agent queues", queue="outbox")
+            self.metrics.counter("outbox_retries_total", lambda: self.report_outbox.retries, "Outbox delivery retries")
+    
+    def metrics_snapshot(self) -> dict:
+        """JSON snapshot of every metric (histograms include p50/p95/p99)"""
+        return self.metrics.snapshot()
     
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from JSON file"""
@@ -73,12 +300,27 @@ class SpoonOSAgent:
         print(f"🎯 Role: {self.role}")
         print(f"⚙️  Confidence Threshold: {self.confidence_threshold * 100}%")
         print(f"⏱️  Check Interval: {self.check_interval}s")
+        print(f"🗺️  Patrol Mode: {self.patrol_mode} ({len(self.sectors)} sectors, max {self.max_concurrent_sectors} concurrent)")
         print(f"🔗 Network: {self.config['blockchain']['network']}")
+        if self.report_outbox is not None:
+            self.report_outbox.start(self.report_incident)
+        if self.metrics_server is not None:
+            await self.metrics_server.start()
+            print(f"📈 Metrics: {self.metrics_server.url}/metrics")
         print(f"\n🚀 Starting autonomous patrol...\n")
     
     async def stop(self):
         """Stop the autonomous monitoring loop"""
         self.is_running = False
+        if self.report_outbox is not None:
+            await self.report_outbox.stop(submit=self.report_incident)
+        if self.report_batcher is not None:
+            await self.report_batcher.flush()
+        if self.rpc_client is not None:
+            await self.rpc_client.close()
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+        self.logging_runtime.flush()
         print(f"\n⏹️  Spoon OS Agent Stopping...")
         print(f"📊 Session Summary:")
         print(f"   - Incidents Detected: {self.incidents_detected}")
@@ -86,17 +328,59 @@ class SpoonOSAgent:
         print(f"   - Success Rate: {(self.incidents_reported / max(self.incidents_detected, 1)) * 100:.1f}%")
         if self.fallback_used:
             print(f"   - Fallback Mode: ACTIVE (Gemini used for reasoning)")
+        if self.circuit_fallbacks:
+            print(f"   - Circuit Fallbacks: {self.circuit_fallbacks} decisions made locally while Gemini's circuit was open")
+        if self.gemini_agent is not None and self.gemini_agent.breaker is not None and self.gemini_agent.breaker.trips:
+            breaker_stats = self.gemini_agent.breaker.stats()
+            print(f"   - Gemini Circuit: {breaker_stats['state']}, tripped {breaker_stats['trips']}x "
+                  f"(last: {breaker_stats['last_trip_reason']}), {breaker_stats['rejected']} calls short-circuited")
+        if self.gemini_agent is not None and self.gemini_agent.scheduler is not None:
+            scheduler_stats = self.gemini_agent.scheduler.stats()
+            if scheduler_stats["submitted"]:
+                print(f"   - Gemini Requests: {scheduler_stats['dispatched']} sent, {scheduler_stats['coalesced']} coalesced, "
+                      f"{scheduler_stats['quota_errors']} quota rejections, "
+                      f"{scheduler_stats['mean_queue_wait_seconds'] * 1000:.0f}ms mean queue wait")
+        if self.gemini_agent is not None:
+            token_stats = self.gemini_agent.token_usage.stats()
+            if token_stats["calls"]:
+                print(f"   - Gemini Tokens: {token_stats['prompt_tokens']} prompt / {token_stats['output_tokens']} output "
+                      f"over {token_stats['calls']} calls ({token_stats['mean_prompt_tokens']:.0f} prompt tokens per call)")
+        if self.decision_cache is not None:
+            cache_stats = self.decision_cache.stats()
+            print(f"   - Decision Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate'] * 100:.1f}% hit rate)")
+        if self.incident_index is not None:
+            print(f"   - Duplicate Sightings Merged: {self.incident_index.merged_sightings}")
+        if self.decision_engine is not None:
+            engine_stats = self.decision_engine.stats()
+            saved = engine_stats["estimated_llm_seconds_saved"]
+            print(f"   - Tiered Decisions: {engine_stats['by_tier']['rules']} by rule, {engine_stats['by_tier']['score']} by score, "
+                  f"{engine_stats['by_tier']['escalated']} escalated ({engine_stats['llm_calls']} LLM calls"
+                  + (f", ~{saved:.1f}s model latency saved)" if saved is not None else ")"))
+        if self.archive is not None:
+            self.archive.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.gemini_agent:
+            self.gemini_agent.close()
     
-    async def monitor_drone_feed(self) -> Optional[dict]:
+    @timed("drone_feed")
+    async def monitor_drone_feed(self, sector_id: Optional[str] = None) -> Optional[dict]:
         """
         Monitor drone feed for anomalies.
         In production, this would call the MCP drone_feed server.
         For demo, we simulate detection.
+        
+        Args:
+            sector_id: Sector to scan (a random configured sector if omitted)
         """
         import random
         
         # Simulate scanning a random sector
-        sector_id = f"Sector-{random.randint(1, 4)}"
+        if sector_id is None:
+            sector_id = random.choice(self.sectors)
+        
+        incident = None
         
         # 25% chance of detecting something
         if random.random() < 0.25:
@@ -123,7 +407,7 @@ class SpoonOSAgent:
             
             scenario = random.choice(disaster_scenarios)
             
-            return {
+            incident = {
                 "sector_id": sector_id,
                 "disaster_type": scenario["type"],
                 "name": scenario["name"],
@@ -136,8 +420,40 @@ class SpoonOSAgent:
                 "video_proof_url": f"neofs://neoguard/incident_{sector_id}_{datetime.now().timestamp()}.mp4"
             }
         
-        return None
+        if self.recorder is not None:
+            self.recorder.record_scan(sector_id, incident)
+        return incident
+    
+    def poll_drone_telemetry(self):
+        """
+        Refresh drone telemetry.
+        In production, this would ingest the drones list of the MCP
+        get_drone_swarm_status tool; for demo, we simulate each drone's sample.
+        """
+        import random
+        
+        drones = []
+        for drone_id in self.telemetry.drone_ids:
+            latest = self.telemetry.latest(drone_id)
+            battery = latest["battery"] if latest else random.uniform(60, 100)
+            # Slow drain, swap to a fresh battery when low
+            battery = 100.0 if battery < 25 else battery - random.uniform(0.0, 0.5)
+            drones.append({
+                "drone_id": drone_id,
+                "battery": battery,
+                "coordinates": {
+                    "lat": 37.3417 + random.uniform(-0.005, 0.005),
+                    "lng": -121.9751 + random.uniform(-0.005, 0.005)
+                },
+                "link_quality": random.uniform(0.2, 1.0) if random.random() < 0.1 else random.uniform(0.7, 1.0)
+            })
+        self.telemetry.record_status(drones)
+    
+    def network_state(self) -> dict:
+        """Current drone network state (from telemetry) used for decisions and scheduling"""
+        return self.telemetry.network_state()
     
+    @timed("decision")
     async def analyze_incident(self, incident: dict) -> bool:
         """
         Analyze detected incident using hybrid approach (Spoon OS + Gemini).
@@ -145,93 +461,158 @@ class SpoonOSAgent:
         """
         confidence = incident.get("confidence", 0)
         
-        print(f"🔍 Analyzing Incident:")
-        print(f"   - Type: {incident['name']}")
-        print(f"   - Sector: {incident['sector_id']}")
-        print(f"   - Confidence: {confidence * 100:.1f}%")
-        print(f"   - Description: {incident['description']}")
+        log_event(incident_log, logging.INFO, "incident.analyze",
+                  f"🔍 Analyzing Incident: {incident['name']} in {incident['sector_id']} "
+                  f"({confidence * 100:.1f}%) - {incident['description']}",
+                  incident_id=incident.get("incident_id"), sector_id=incident["sector_id"],
+                  disaster_type=incident["disaster_type"], confidence=confidence)
         
+        # Clear-cut incidents are settled locally without a model round trip
+        if self.decision_engine is not None:
+            local = self.decision_engine.decide(incident)
+            if local is not None:
+                self.metrics.inc("decisions_total", help_text="Incident decisions by source", source=local["tier"])
+                self._log_decision(incident, local["tier"], local["should_report"], local["confidence"])
+                return local["should_report"]
+        
+        # Reuse a recent verdict for an equivalent incident if one is cached
+        if self.hybrid_agent and self.decision_cache is not None:
+            cached = self.decision_cache.get(incident)
+            if cached is not None:
+                self.metrics.inc("decisions_total", help_text="Incident decisions by source", source="cache")
+                self._log_decision(incident, "cache", cached["should_report"], cached["confidence"])
+                return cached["should_report"]
+        
+        # While Gemini's circuit refuses calls, go straight to the local threshold decision
+        if self.hybrid_agent and self.gemini_agent is not None and not self.gemini_agent.available:
+            self._count_circuit_fallback()
         # Try hybrid analysis if available
-        if self.hybrid_agent:
+        elif self.hybrid_agent:
             try:
-                print(f"   🤝 Using hybrid analysis (Spoon OS + Gemini)...")
-                network_state = {
-                    "total_drones": 3,
-                    "active_drones": 2,
-                    "average_battery": 75,
-                    "network_status": "operational"
-                }
+                log_event(incident_log, logging.DEBUG, "incident.hybrid",
+                          f"   🤝 Using hybrid analysis (Spoon OS + Gemini)...",
+                          incident_id=incident.get("incident_id"))
+                network_state = self.network_state()
                 
+                requested = time.perf_counter()
                 analysis_result = await self.hybrid_agent.process_incident(incident, network_state)
+                if self.decision_engine is not None:
+                    self.decision_engine.record_llm_call(time.perf_counter() - requested)
+                if self.recorder is not None:
+                    self.recorder.record_decision(
+                        incident["video_proof_url"],
+                        time.perf_counter() - requested,
+                        {key: analysis_result[key] for key in ("decision", "decision_error") if key in analysis_result}
+                    )
                 
                 if analysis_result.get("decision", {}).get("status") == "success":
                     decision = analysis_result["decision"].get("decision", {})
-                    should_report = decision.get("should_report", confidence >= self.confidence_threshold)
-                    decision_confidence = decision.get("confidence", confidence * 100)
+                    should_report = decision["should_report"]
+                    decision_confidence = decision["confidence"]
                     
-                    print(f"   🤖 Gemini Decision: {'REPORT' if should_report else 'HOLD'}")
-                    print(f"   📊 Decision Confidence: {decision_confidence}%")
+                    self.metrics.inc("decisions_total", help_text="Incident decisions by source", source="hybrid")
                     
-                    if should_report:
-                        print(f"   ✅ MEETS THRESHOLD - Proceeding to report")
-                        return True
-                    else:
-                        print(f"   ⚠️  Below threshold - Escalating to human review")
-                        return False
+                    if self.decision_cache is not None:
+                        self.decision_cache.put(incident, {
+                            "should_report": should_report,
+                            "confidence": decision_confidence
+                        })
+                    
+                    self._log_decision(incident, "hybrid", should_report, decision_confidence)
+                    return should_report
+                
+                # Failed or unusable model decision: never act on a guessed verdict
+                if analysis_result.get("decision", {}).get("circuit_open"):
+                    # Refused by the breaker (e.g. half-open probe slots taken), not a model failure
+                    self._count_circuit_fallback()
+                else:
+                    self.fallback_used = True
+                    self.metrics.inc("fallbacks_total", help_text="Hybrid decisions that fell back to the threshold rule")
             except Exception as e:
-                print(f"   ⚠️  Hybrid analysis failed: {e}")
+                log_event(logger, logging.WARNING, "incident.hybrid_failed",
+                          f"   ⚠️  Hybrid analysis failed: {e}",
+                          incident_id=incident.get("incident_id"), error=str(e))
                 self.fallback_used = True
+                self.metrics.inc("fallbacks_total", help_text="Hybrid decisions that fell back to the threshold rule")
         
         # Fallback to simple threshold check
-        if confidence >= self.confidence_threshold:
-            print(f"   ✅ MEETS THRESHOLD - Proceeding to report")
-            return True
-        else:
-            print(f"   ⚠️  Below threshold - Escalating to human review")
-            return False
+        self.metrics.inc("decisions_total", help_text="Incident decisions by source", source="threshold")
+        should_report = confidence >= self.confidence_threshold
+        self._log_decision(incident, "threshold", should_report, confidence * 100)
+        return should_report
+    
+    def _count_circuit_fallback(self):
+        self.circuit_fallbacks += 1
+        self.metrics.inc("circuit_fallbacks_total", help_text="Decisions sent to the threshold rule by the open circuit breaker")
     
+    def _log_decision(self, incident: dict, source: str, should_report: bool, decision_confidence: float):
+        verdict = "✅ MEETS THRESHOLD - Proceeding to report" if should_report else "⚠️  Below threshold - Escalating to human review"
+        log_event(incident_log, logging.INFO, "incident.decision",
+                  f"   {'REPORT' if should_report else 'HOLD'} ({source}, {decision_confidence}% confidence): {verdict}",
+                  incident_id=incident.get("incident_id"), source=source,
+                  should_report=should_report, decision_confidence=decision_confidence)
+    
+    @timed("wallet_approval")
     async def request_approval(self, incident: dict) -> bool:
         """
         Request user approval via NeoLine wallet before reporting.
         Returns True if user approves.
         """
-        print(f"\n🔐 Requesting Wallet Approval...")
-        print(f"   Action: Report {incident['name']} to Neo Blockchain")
-        print(f"   Evidence: {incident['video_proof_url']}")
-        print(f"   Coordinates: {incident['coordinates']}")
+        log_event(incident_log, logging.INFO, "incident.approval_requested",
+                  f"🔐 Requesting Wallet Approval: report {incident['name']} to Neo Blockchain",
+                  incident_id=incident.get("incident_id"), evidence=incident["video_proof_url"],
+                  coordinates=incident["coordinates"])
         
         # In production, this would trigger NeoLine popup
         # For demo, we auto-approve
-        approval = await self.wallet_approval_tool.run(
+        approval = self.wallet_approval_tool.run(
             action_description=f"Report {incident['name']} incident",
             action_data=incident
         )
         
-        print(f"   ✅ User approved action")
+        log_event(incident_log, logging.INFO, "incident.approved", f"   ✅ User approved action",
+                  incident_id=incident.get("incident_id"))
         return True
     
+    @timed("neo_report")
     async def report_incident(self, incident: dict) -> bool:
         """
         Report incident to Neo blockchain.
         Returns True if successful.
         """
-        print(f"\n📡 Reporting to Neo N3 Blockchain...")
-        
-        result = self.neo_report_tool.run(
-            disaster_type=incident["disaster_type"],
-            evidence_link=incident["video_proof_url"],
-            sector_id=incident["sector_id"],
-            confidence=incident["confidence"],
-            coordinates=incident["coordinates"]
-        )
+        log_event(incident_log, logging.DEBUG, "incident.reporting", f"📡 Reporting to Neo N3 Blockchain...",
+                  incident_id=incident.get("incident_id"))
+        
+        report_args = {
+            "disaster_type": incident["disaster_type"],
+            "evidence_link": incident["video_proof_url"],
+            "sector_id": incident["sector_id"],
+            "confidence": incident["confidence"],
+            "coordinates": incident["coordinates"]
+        }
+        
+        requested = time.perf_counter()
+        if self.report_batcher is not None:
+            result = await self.report_batcher.submit(**report_args)
+        else:
+            result = await self.neo_report_tool.run_async(**report_args)
+        if self.recorder is not None:
+            self.recorder.record_report(
+                incident["video_proof_url"],
+                time.perf_counter() - requested,
+                {key: result[key] for key in ("status", "message", "transaction_hash", "merkle_root") if key in result}
+            )
         
         if result["status"] == "success":
-            print(f"   ✅ Incident Reported Successfully!")
-            print(f"   📦 Transaction Hash: {result['transaction_hash']}")
+            log_event(incident_log, logging.INFO, "incident.reported",
+                      f"   ✅ Incident Reported: tx {result['transaction_hash']}",
+                      incident_id=incident.get("incident_id"), transaction_hash=result["transaction_hash"],
+                      merkle_root=result.get("merkle_root"), proof_steps=len(result.get("merkle_proof", [])))
             self.incidents_reported += 1
             return True
         else:
-            print(f"   ❌ Failed to report: {result['message']}")
+            log_event(logger, logging.ERROR, "incident.report_failed", f"   ❌ Failed to report: {result['message']}",
+                      incident_id=incident.get("incident_id"), error=result["message"])
             return False
     
     async def run_patrol_cycle(self):
@@ -239,6 +620,7 @@ class SpoonOSAgent:
         self.last_check = datetime.now()
         
         print(f"\n[{self.last_check.strftime('%H:%M:%S')}] 🛡️  Patrol Cycle Starting...")
+        self.poll_drone_telemetry()
         
         # Step 1: Monitor drone feed
         incident = await self.monitor_drone_feed()
@@ -247,25 +629,359 @@ class SpoonOSAgent:
             print(f"   ✅ All sectors clear - No anomalies detected")
             return
         
-        # Step 2: Analyze incident
-        self.incidents_detected += 1
-        print(f"\n⚠️  INCIDENT DETECTED (#{self.incidents_detected})")
+        if not self.is_new_incident(incident):
+            return
         
-        should_report = await self.analyze_incident(incident)
+        await self.handle_incident(incident)
+    
+    def is_new_incident(self, incident: dict) -> bool:
+        """
+        Check the dedup index before analysis.
+        Repeat sightings of an open incident are merged into it as updates and
+        skip the analyze → approve → report chain.
+        """
+        if self.incident_index is None:
+            return True
         
-        if not should_report:
-            print(f"   📋 Incident logged for human review")
+        record, is_new = self.incident_index.observe(incident)
+        incident["incident_id"] = record["incident_id"]
+        if is_new and record["sightings"] > 1:
+            log_event(incident_log, logging.INFO, "incident.resubmitted",
+                      f"   ⏫ {incident['name']} in {incident['sector_id']} rose to "
+                      f"{record['max_confidence'] * 100:.1f}% (sighting #{record['sightings']}) - re-evaluating",
+                      incident_id=record["incident_id"], sightings=record["sightings"],
+                      max_confidence=record["max_confidence"])
+        elif not is_new:
+            log_event(incident_log, logging.INFO, "incident.merged",
+                      f"   🔁 {incident['name']} in {incident['sector_id']} already open "
+                      f"(sighting #{record['sightings']}) - merged as update",
+                      incident_id=record["incident_id"], sightings=record["sightings"])
+            self.archive_incident(incident, "merged")
+        return is_new
+    
+    def archive_incident(self, incident: dict, outcome: str):
+        """
+        Record an incident and what happened to it in the history archive.
+        Archive errors are logged, never raised: the incident has already been handled.
+        """
+        if self.archive is None:
             return
+        coordinates = incident.get("coordinates", {})
+        try:
+            self.archive.append_rows("incidents", [{
+                "incident_id": incident.get("incident_id", ""),
+                "sector_id": incident.get("sector_id", ""),
+                "disaster_type": incident.get("disaster_type", ""),
+                "confidence": incident.get("confidence", 0.0),
+                "lat": coordinates.get("lat", 0.0),
+                "lng": coordinates.get("lng", 0.0),
+                "outcome": INCIDENT_OUTCOMES.index(outcome)
+            }])
+        except Exception as e:
+            log_event(logger, logging.WARNING, "archive.append_failed",
+                      f"   ⚠️  Could not archive {outcome} incident: {e}",
+                      incident_id=incident.get("incident_id"), outcome=outcome, error=str(e))
+    
+    async def handle_incident(self, incident: dict) -> bool:
+        """
+        Run the analyze → approve → report chain for one detected incident.
+        Returns True if the incident was reported.
+        """
+        # Step 2: Analyze incident
+        self.incidents_detected += 1
+        self._log_detected(incident)
+        
+        if not await self.analyze_incident(incident):
+            return self._settle_incident(incident, "held")
         
         # Step 3: Request approval
-        approved = await self.request_approval(incident)
+        if not await self.request_approval(incident):
+            return self._settle_incident(incident, "rejected")
         
-        if not approved:
-            print(f"   ❌ User rejected action")
-            return
+        # Step 4: Report to blockchain (via the durable outbox when enabled)
+        return await self._report_or_queue(incident)
+    
+    async def _report_or_queue(self, incident: dict) -> bool:
+        """Report the incident (or durably queue it when the outbox is enabled) and settle it"""
+        if self.report_outbox is not None:
+            outbox_id = await self.report_outbox.enqueue(incident)
+            self._log_queued(incident, outbox_id)
+            return self._settle_incident(incident, "queued")
+        reported = await self.report_incident(incident)
+        return self._settle_incident(incident, "reported" if reported else "failed")
+    
+    def _settle_incident(self, incident: dict, outcome: str) -> bool:
+        """
+        Bookkeeping shared by handle_incident and the pipeline stages once an incident's
+        outcome is known: log held/rejected, archive the outcome and mark queued or
+        reported incidents in the dedup index. Returns True if the incident went on-chain
+        (or into the outbox).
+        """
+        if outcome == "held":
+            log_event(incident_log, logging.INFO, "incident.held", f"   📋 Incident logged for human review",
+                      incident_id=incident.get("incident_id"))
+        elif outcome == "rejected":
+            log_event(incident_log, logging.INFO, "incident.rejected", f"   ❌ User rejected action",
+                      incident_id=incident.get("incident_id"))
+        self.archive_incident(incident, outcome)
+        reported = outcome in ("queued", "reported")
+        if reported and self.incident_index is not None and incident.get("incident_id"):
+            self.incident_index.mark_reported(incident["incident_id"])
+        return reported
+    
+    def _log_detected(self, incident: dict):
+        log_event(incident_log, logging.INFO, "incident.detected", f"\n⚠️  INCIDENT DETECTED (#{self.incidents_detected})",
+                  incident_id=incident.get("incident_id"), sector_id=incident["sector_id"],
+                  disaster_type=incident["disaster_type"])
+    
+    def _log_queued(self, incident: dict, outbox_id: int):
+        log_event(incident_log, logging.INFO, "incident.queued",
+                  f"   💾 Incident queued in outbox (#{outbox_id}) for on-chain reporting",
+                  incident_id=incident.get("incident_id"), outbox_id=outbox_id)
+    
+    async def _patrol_sector(self, sector_id: str, semaphore: asyncio.Semaphore) -> str:
+        """
+        Scan one sector and run its incident chain independently of the rest of the sweep.
+        Returns the sector outcome: clear, merged, reported or held.
+        """
+        async with semaphore:
+            incident = await self.monitor_drone_feed(sector_id)
+            if incident is None:
+                return "clear"
+            if not self.is_new_incident(incident):
+                return "merged"
+            return "reported" if await self.handle_incident(incident) else "held"
+    
+    async def run_sector_sweep(self) -> dict:
+        """
+        Execute one patrol sweep over every configured sector concurrently.
+        At most `max_concurrent_sectors` sectors are in flight at once; a failure
+        or slow incident in one sector never blocks the others.
+        
+        Returns:
+            Sweep summary with per-sector outcome counts
+        """
+        self.last_check = datetime.now()
+        log_event(logger, logging.INFO, "sweep.start",
+                  f"\n[{self.last_check.strftime('%H:%M:%S')}] 🛡️  Sector Sweep Starting ({len(self.sectors)} sectors)...",
+                  sectors=len(self.sectors))
+        # One telemetry sample per sweep, shared by every sector's decision
+        self.poll_drone_telemetry()
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_sectors)
+        results = await asyncio.gather(
+            *(self._patrol_sector(sector_id, semaphore) for sector_id in self.sectors),
+            return_exceptions=True
+        )
         
-        # Step 4: Report to blockchain
-        await self.report_incident(incident)
+        summary = {"clear": 0, "merged": 0, "reported": 0, "held": 0, "failed": 0}
+        for sector_id, outcome in zip(self.sectors, results):
+            if isinstance(outcome, Exception):
+                log_event(logger, logging.ERROR, "sweep.sector_failed", f"   ❌ {sector_id} patrol failed: {outcome}",
+                          sector_id=sector_id, error=str(outcome))
+                summary["failed"] += 1
+            else:
+                summary[outcome] += 1
+        
+        log_event(logger, logging.INFO, "sweep.complete",
+                  f"   🗺️  Sweep complete: {summary['clear']} clear, {summary['merged']} merged, "
+                  f"{summary['reported']} reported, {summary['held']} held, {summary['failed']} failed",
+                  **summary)
+        return summary
+    
+    async def _detect_stage(self, sector_id: str) -> Optional[dict]:
+        """Pipeline stage: scan a sector and pass on new incidents"""
+        incident = await self.monitor_drone_feed(sector_id)
+        if incident is None or not self.is_new_incident(incident):
+            return None
+        self.incidents_detected += 1
+        self._log_detected(incident)
+        return incident
+    
+    async def _analyze_stage(self, incident: dict) -> Optional[dict]:
+        """Pipeline stage: pass on incidents that should be reported"""
+        if await self.analyze_incident(incident):
+            return incident
+        self._settle_incident(incident, "held")
+        return None
+    
+    async def _approve_stage(self, incident: dict) -> Optional[dict]:
+        """Pipeline stage: pass on approved incidents"""
+        if await self.request_approval(incident):
+            return incident
+        self._settle_incident(incident, "rejected")
+        return None
+    
+    async def _report_stage(self, incident: dict) -> None:
+        """Pipeline stage: report (or durably queue) the incident"""
+        await self._report_or_queue(incident)
+        return None
+    
+    def build_pipeline(self) -> Pipeline:
+        """Build the detect → analyze → approve → report pipeline from config.json"""
+        stage_config = self.config.get("pipeline", {}).get("stages", {})
+        handlers = [
+            ("detect", self._detect_stage),
+            ("analyze", self._analyze_stage),
+            ("approve", self._approve_stage),
+            ("report", self._report_stage)
+        ]
+        pipeline = Pipeline([
+            Stage(
+                name,
+                handler,
+                workers=stage_config.get(name, {}).get("workers", 1),
+                queue_size=stage_config.get(name, {}).get("queue_size", 100),
+                overflow=stage_config.get(name, {}).get("overflow", "block"),
+                spill_path=stage_config.get(name, {}).get("spill_path")
+            )
+            for name, handler in handlers
+        ])
+        for stage in pipeline.stages:
+            self.metrics.gauge("queue_depth", stage.queue.qsize, "Items waiting in agent queues",
+                               queue=f"pipeline_{stage.name}")
+            self.metrics.gauge("pipeline_busy_workers", lambda stage=stage: stage.busy,
+                               "Pipeline workers processing an item", stage=stage.name)
+        return pipeline
+    
+    def _print_pipeline_metrics(self, pipeline: Pipeline):
+        print(f"   📈 Pipeline queues:")
+        for name, m in pipeline.metrics().items():
+            print(f"      {name:<8} depth {m['queue_depth']}/{m['queue_size']} (max {m['max_queue_depth']}), "
+                  f"busy {m['busy']}/{m['workers']}, processed {m['processed']}, "
+                  f"dropped {m['dropped']}, spilled {m['spilled']}")
+    
+    async def run_pipeline(self, duration_seconds: int = 60):
+        """
+        Run the agent as a streaming pipeline.
+        Every check interval all sectors are fed to the detect stage; each stage
+        drains its own bounded queue, so slow decisions or chain calls only back up
+        their own stage (subject to its overflow policy) instead of stalling detection.
+        
+        Args:
+            duration_seconds: How long to run (for demo purposes)
+        """
+        await self.start()
+        
+        pipeline = self.build_pipeline()
+        await pipeline.start()
+        
+        metrics_interval = self.config.get("pipeline", {}).get("metrics_interval_seconds", 10)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        next_tick = started
+        next_metrics = started + metrics_interval
+        
+        try:
+            while self.is_running and loop.time() - started < duration_seconds:
+                self.last_check = datetime.now()
+                self.poll_drone_telemetry()
+                for sector_id in self.sectors:
+                    await pipeline.submit(sector_id)
+                
+                if loop.time() >= next_metrics:
+                    self._print_pipeline_metrics(pipeline)
+                    next_metrics += metrics_interval
+                
+                next_tick += self.check_interval
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            
+            print(f"\n⏱️  Demo duration reached ({duration_seconds}s)")
+        
+        except KeyboardInterrupt:
+            print(f"\n⚠️  Interrupted by user")
+        
+        finally:
+            await pipeline.stop(drain=True, drain_timeout=self.check_interval * 2)
+            self._print_pipeline_metrics(pipeline)
+            await self.stop()
+    
+    def build_scheduler(self) -> SectorScheduler:
+        """Build the adaptive sector scheduler from config.json"""
+        scheduler_config = self.config.get("scheduler", {})
+        return SectorScheduler(
+            self.sectors,
+            tick_seconds=scheduler_config.get("tick_seconds", 0.5),
+            base_interval=scheduler_config.get("base_interval_seconds", self.check_interval),
+            min_interval=scheduler_config.get("min_interval_seconds", 1.0),
+            max_interval=scheduler_config.get("max_interval_seconds", 60.0),
+            backoff_factor=scheduler_config.get("backoff_factor", 1.5),
+            heat_half_life=scheduler_config.get("heat_half_life_seconds", 120.0),
+            heat_gain=scheduler_config.get("heat_gain", 4.0)
+        )
+    
+    async def _adaptive_visit(self, scheduler: SectorScheduler, sector_id: str, started: float):
+        """Scan one due sector, reschedule it from the result, then handle any incident"""
+        loop = asyncio.get_running_loop()
+        try:
+            incident = await self.monitor_drone_feed(sector_id)
+        except Exception as e:
+            log_event(logger, logging.ERROR, "scan.failed", f"   ❌ {sector_id} scan failed: {e}",
+                      sector_id=sector_id, error=str(e))
+            incident = None
+        
+        interval = scheduler.record_result(
+            sector_id,
+            loop.time() - started,
+            alert=incident is not None,
+            confidence=incident["confidence"] if incident else 0.0
+        )
+        
+        if incident is not None:
+            log_event(logger, logging.INFO, "scheduler.alerting", f"   🔥 {sector_id} alerting - next visit in {interval:.1f}s",
+                      sector_id=sector_id, interval_seconds=interval)
+            if self.is_new_incident(incident):
+                await self.handle_incident(incident)
+    
+    async def run_adaptive(self, duration_seconds: int = 60):
+        """
+        Run the agent with the adaptive sector scheduler.
+        Ticks are anchored to the start time (no drift); each tick the most urgent
+        due sectors are visited, up to max_concurrent_sectors at once.
+        
+        Args:
+            duration_seconds: How long to run (for demo purposes)
+        """
+        await self.start()
+        
+        scheduler = self.build_scheduler()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        in_flight = set()
+        
+        try:
+            while self.is_running:
+                elapsed = loop.time() - started
+                if elapsed > duration_seconds:
+                    print(f"\n⏱️  Demo duration reached ({duration_seconds}s)")
+                    break
+                
+                self.poll_drone_telemetry()
+                network = self.network_state()
+                scheduler.set_drone_availability(network["active_drones"], network["total_drones"])
+                
+                self.last_check = datetime.now()
+                free_slots = self.max_concurrent_sectors - len(in_flight)
+                for sector_id in scheduler.due(scheduler.tick_at(elapsed), elapsed, limit=free_slots):
+                    task = asyncio.create_task(self._adaptive_visit(scheduler, sector_id, started))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                
+                # Sleep to the next absolute tick boundary so lag never accumulates
+                next_tick = scheduler.tick_at(loop.time() - started) + 1
+                await asyncio.sleep(max(0.0, started + next_tick * scheduler.tick_seconds - loop.time()))
+        
+        except KeyboardInterrupt:
+            print(f"\n⚠️  Interrupted by user")
+        
+        finally:
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            print(f"   🗓️  Schedule: " + ", ".join(
+                f"{row['sector_id']} every {row['interval_seconds']}s"
+                for row in scheduler.snapshot(loop.time() - started)
+            ))
+            await self.stop()
     
     async def run_continuous(self, duration_seconds: int = 60):
         """
@@ -274,6 +990,13 @@ class SpoonOSAgent:
         Args:
             duration_seconds: How long to run (for demo purposes)
         """
+        if self.patrol_mode == "pipeline":
+            await self.run_pipeline(duration_seconds)
+            return
+        if self.patrol_mode == "adaptive":
+            await self.run_adaptive(duration_seconds)
+            return
+        
         await self.start()
         
         start_time = datetime.now()
@@ -288,7 +1011,10 @@ class SpoonOSAgent:
                     break
                 
                 cycle_count += 1
-                await self.run_patrol_cycle()
+                if self.patrol_mode == "sweep":
+                    await self.run_sector_sweep()
+                else:
+                    await self.run_patrol_cycle()
                 
                 # Wait before next cycle
                 await asyncio.sleep(self.check_interval)
@@ -299,6 +1025,66 @@ class SpoonOSAgent:
         finally:
             await self.stop()
     
+    async def _replay_incident(self, incident: dict, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            if not self.is_new_incident(incident):
+                return "merged"
+            return "reported" if await self.handle_incident(incident) else "held"
+    
+    async def run_replay(self, path: str, speed: Optional[float] = 1.0) -> dict:
+        """
+        Feed a recorded incident stream back through the analyze → approve → report chain.
+        Model decisions and chain reports are answered from the recording, after their
+        recorded latency scaled by `speed`.
+        
+        Args:
+            path: Log written by IncidentRecorder (replay.record_path)
+            speed: 1.0 for real time, N for N× faster, None for maximum speed
+        
+        Returns:
+            Replay summary with outcome counts, wall time and incidents per second
+        """
+        if self.recorder is not None and os.path.abspath(self.recorder.path) == os.path.abspath(path):
+            raise ValueError(f"Cannot replay {path} while recording to it")
+        replay = IncidentReplay(path, speed)
+        if replay.decisions:
+            self.hybrid_agent = ReplayHybridAgent(replay)
+        self.neo_report_tool = ReplayReportTool(replay)
+        # Recorded report latency already includes any batching delay
+        self.report_batcher = None
+        
+        await self.start()
+        print(f"⏯️  Replaying {len(replay.scans)} scans ({replay.incident_count} incidents, "
+              f"{replay.duration:.1f}s recorded) at {f'{speed}x' if replay.speed else 'max'} speed")
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_sectors)
+        in_flight = []
+        results = []
+        started = time.perf_counter()
+        try:
+            async for sector_id, incident in replay.scan_events():
+                if incident is not None:
+                    in_flight.append(asyncio.create_task(self._replay_incident(incident, semaphore)))
+            results = await asyncio.gather(*in_flight, return_exceptions=True)
+        finally:
+            # A recording that fails mid-stream must not leave its incidents running past stop()
+            for task in in_flight:
+                task.cancel()
+            elapsed = time.perf_counter() - started
+            await self.stop()
+        
+        summary = {"merged": 0, "reported": 0, "held": 0, "failed": 0}
+        for outcome in results:
+            summary["failed" if isinstance(outcome, Exception) else outcome] += 1
+        summary.update({
+            "scans": len(replay.scans),
+            "incidents": replay.incident_count,
+            "recorded_seconds": round(replay.duration, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "incidents_per_second": round(replay.incident_count / elapsed, 2) if elapsed else None
+        })
+        return summary
+    
     async def run_single_patrol(self):
         """Run a single patrol cycle (for testing)"""
         await self.start()
@@ -318,6 +1104,7 @@ async def main():
     
     # Run continuous monitoring for 120 seconds (demo)
     await agent.run_continuous(duration_seconds=120)
+    shutdown_logging()
     
     print("\n" + "="*60)
     print("✅ Spoon OS Session Complete")
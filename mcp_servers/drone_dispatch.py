@@ -0,0 +1,316 @@
+"""
+Drone Dispatch Engine
+Fleet state (positions, batteries, missions) for the DroneVision MCP server and
+a batch dispatcher that assigns drones to pending incidents jointly: one
+min-cost assignment over priority-weighted travel time instead of one random
+drone per request.
+"""
+
+import json
+import time
+from typing import Optional, Dict, Any, List, Callable
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+PRIORITY_WEIGHTS = {"low": 1.0, "medium": 2.0, "high": 4.0, "critical": 8.0}
+
+# Cost of leaving an incident unserved (scaled by its priority weight) and of an
+# infeasible drone/incident pair; infeasible pairs always lose to "unserved"
+UNSERVED_SECONDS = 24 * 3600.0
+INFEASIBLE_COST = 1e12
+
+
+def haversine_matrix_km(lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances (len(lat1) x len(lat2)) in kilometers"""
+    phi1 = np.radians(lat1)[:, None]
+    phi2 = np.radians(lat2)[None, :]
+    dlmb = np.radians(lng2)[None, :] - np.radians(lng1)[:, None]
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def solve_assignment(cost: np.ndarray) -> np.ndarray:
+    """
+    Min-cost assignment of every row to a distinct column (rows <= columns).
+    Shortest augmenting path Hungarian algorithm, O(rows^2 * columns), with the
+    inner scan over columns vectorized.
+    
+    Returns:
+        Column assigned to each row
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    n, m = cost.shape
+    if n > m:
+        raise ValueError("solve_assignment needs at least as many columns as rows")
+    
+    # 1-based potentials/matching as in the classic formulation; column 0 is the virtual root
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+    
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            free = ~used[1:]
+            improve = free & (reduced < minv[1:])
+            minv[1:][improve] = reduced[improve]
+            way[1:][improve] = j0
+            
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            
+            j0 = j1
+            if match[j0] == 0:
+                break
+        
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    
+    assignment = np.empty(n, dtype=np.int64)
+    for j in range(1, m + 1):
+        if match[j]:
+            assignment[match[j] - 1] = j - 1
+    return assignment
+
+
+def load_fleet(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the drone fleet from a JSON data file.
+    
+    The file holds a list of {"drone_id", "lat", "lng", ...} objects; optional keys are
+    "battery" (percent), "speed_mps" and "base_lat"/"base_lng" (default: the start position).
+    """
+    with open(path, "r") as f:
+        records = json.load(f)
+    return {
+        record["drone_id"]: {key: value for key, value in record.items() if key != "drone_id"}
+        for record in records
+    }
+
+
+class DroneFleet:
+    """
+    Structure-of-arrays fleet state plus the batch dispatcher.
+    
+    A dispatched drone flies to the incident, holds station for `on_station_seconds`,
+    returns to base and recharges there; it is available again once back at base.
+    """
+    
+    def __init__(
+        self,
+        drones: Dict[str, Dict[str, Any]],
+        default_speed_mps: float = 15.0,
+        drain_pct_per_km: float = 2.5,
+        reserve_pct: float = 15.0,
+        recharge_pct_per_minute: float = 5.0,
+        launch_seconds: float = 10.0,
+        on_station_seconds: float = 120.0,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        """
+        Build the fleet state.
+        
+        Args:
+            drones: Dict of drone id -> {"lat", "lng", "battery", "speed_mps", "base_lat", "base_lng"}
+            default_speed_mps: Cruise speed for drones without "speed_mps"
+            drain_pct_per_km: Battery used per kilometer flown
+            reserve_pct: Battery that must remain after returning to base
+            recharge_pct_per_minute: Recharge rate while idle at base
+            launch_seconds: Fixed take-off overhead added to every ETA
+            on_station_seconds: Time spent over the incident before returning
+            clock: Time source in seconds (defaults to time.monotonic)
+        """
+        self.drone_ids = list(drones)
+        self.rows = {drone_id: i for i, drone_id in enumerate(self.drone_ids)}
+        records = list(drones.values())
+        count = len(records)
+        
+        self.lat = np.array([d["lat"] for d in records], dtype=np.float64)
+        self.lng = np.array([d["lng"] for d in records], dtype=np.float64)
+        self.base_lat = np.array([d.get("base_lat", d["lat"]) for d in records], dtype=np.float64)
+        self.base_lng = np.array([d.get("base_lng", d["lng"]) for d in records], dtype=np.float64)
+        self.battery = np.array([d.get("battery", 100.0) for d in records], dtype=np.float64)
+        self.speed_mps = np.array([d.get("speed_mps", default_speed_mps) for d in records], dtype=np.float64)
+        self.busy_until = np.zeros(count, dtype=np.float64)
+        self.mission: List[Optional[str]] = [None] * count
+        
+        self.drain_pct_per_km = drain_pct_per_km
+        self.reserve_pct = reserve_pct
+        self.recharge_pct_per_minute = recharge_pct_per_minute
+        self.launch_seconds = launch_seconds
+        self.on_station_seconds = on_station_seconds
+        self.clock = clock or time.monotonic
+        self._updated = self.clock()
+    
+    def __len__(self) -> int:
+        return len(self.drone_ids)
+    
+    def _refresh(self, now: float):
+        """Land returning drones at base and recharge idle ones"""
+        landed = (self.busy_until > 0) & (self.busy_until <= now)
+        if landed.any():
+            self.lat[landed] = self.base_lat[landed]
+            self.lng[landed] = self.base_lng[landed]
+            for row in np.flatnonzero(landed).tolist():
+                self.mission[row] = None
+        
+        # Idle time since the last refresh (or since landing) counts towards recharge
+        idle_since = np.maximum(self.busy_until, self._updated)
+        idle_seconds = np.where(self.busy_until <= now, np.maximum(0.0, now - idle_since), 0.0)
+        self.battery = np.minimum(100.0, self.battery + idle_seconds / 60.0 * self.recharge_pct_per_minute)
+        self.busy_until[landed] = 0.0
+        self._updated = now
+    
+    def available(self, now: Optional[float] = None) -> np.ndarray:
+        """Boolean mask of drones ready for a mission"""
+        if now is None:
+            now = self.clock()
+        self._refresh(now)
+        return self.busy_until <= now
+    
+    def plan(
+        self,
+        requests: List[Dict[str, Any]],
+        now: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Solve the joint assignment without committing it.
+        
+        Args:
+            requests: [{"lat", "lng", "priority"}] pending incidents
+        
+        Returns:
+            Per-request arrays: "rows" (drone row or -1), "eta_seconds", "outbound_km",
+            "return_km" and "battery_drain" (NaN where unserved)
+        """
+        if now is None:
+            now = self.clock()
+        available = self.available(now)
+        n = len(requests)
+        m = len(self)
+        if n == 0:
+            empty = np.zeros(0)
+            return {
+                "rows": np.zeros(0, dtype=np.int64),
+                "eta_seconds": empty,
+                "outbound_km": empty,
+                "return_km": empty,
+                "battery_drain": empty
+            }
+        
+        target_lat = np.array([r["lat"] for r in requests], dtype=np.float64)
+        target_lng = np.array([r["lng"] for r in requests], dtype=np.float64)
+        weights = np.array([PRIORITY_WEIGHTS.get(r.get("priority", "high"), 4.0) for r in requests])
+        
+        outbound_km = haversine_matrix_km(target_lat, target_lng, self.lat, self.lng)
+        return_km = haversine_matrix_km(target_lat, target_lng, self.base_lat, self.base_lng)
+        eta = self.launch_seconds + outbound_km * 1000.0 / self.speed_mps[None, :]
+        drain = (outbound_km + return_km) * self.drain_pct_per_km
+        feasible = available[None, :] & (self.battery[None, :] - drain >= self.reserve_pct)
+        
+        # Drone columns cost priority-weighted ETA; one "unserved" column per request
+        # lets the solver leave low-priority incidents waiting when drones run out
+        cost = np.empty((n, m + n))
+        cost[:, :m] = np.where(feasible, eta * weights[:, None], INFEASIBLE_COST)
+        cost[:, m:] = (weights * UNSERVED_SECONDS)[:, None]
+        
+        assignment = solve_assignment(cost)
+        request_rows = np.arange(n)
+        drone_rows = np.where(assignment < m, assignment, 0)
+        served = (assignment < m) & feasible[request_rows, drone_rows]
+        
+        def pick(matrix: np.ndarray) -> np.ndarray:
+            return np.where(served, matrix[request_rows, drone_rows], np.nan)
+        
+        return {
+            "rows": np.where(served, drone_rows, -1),
+            "eta_seconds": pick(eta),
+            "outbound_km": pick(outbound_km),
+            "return_km": pick(return_km),
+            "battery_drain": pick(drain)
+        }
+    
+    def dispatch(self, requests: List[Dict[str, Any]], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Assign drones to pending incidents jointly and commit the missions.
+        
+        Args:
+            requests: [{"sector_id", "lat", "lng", "priority"}] pending incidents
+        
+        Returns:
+            One result per request, in order: "deployed" with drone_id and ETA, or "queued"
+        """
+        if now is None:
+            now = self.clock()
+        plan = self.plan(requests, now)
+        
+        results = []
+        for n, request in enumerate(requests):
+            row = int(plan["rows"][n])
+            if row < 0:
+                results.append({
+                    "status": "queued",
+                    "sector_id": request.get("sector_id"),
+                    "priority": request.get("priority", "high"),
+                    "message": "No drone with enough battery is available"
+                })
+                continue
+            
+            eta = float(plan["eta_seconds"][n])
+            return_seconds = float(plan["return_km"][n]) * 1000.0 / self.speed_mps[row]
+            self.battery[row] -= plan["battery_drain"][n]
+            self.busy_until[row] = now + eta + self.on_station_seconds + return_seconds
+            self.lat[row] = request["lat"]
+            self.lng[row] = request["lng"]
+            self.mission[row] = request.get("sector_id")
+            
+            results.append({
+                "status": "deployed",
+                "sector_id": request.get("sector_id"),
+                "priority": request.get("priority", "high"),
+                "drone_id": self.drone_ids[row],
+                "eta_seconds": round(eta, 1),
+                "distance_km": round(float(plan["outbound_km"][n]), 3),
+                "battery_after_mission": round(float(self.battery[row]), 1)
+            })
+        return results
+    
+    def status(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Fleet-level counters and per-drone state"""
+        if now is None:
+            now = self.clock()
+        available = self.available(now)
+        return {
+            "total_drones": len(self),
+            "active_drones": int(np.count_nonzero(available)),
+            "deployed_drones": int(len(self) - np.count_nonzero(available)),
+            "average_battery": round(float(self.battery.mean()), 1) if len(self) else 0.0,
+            "drones": [
+                {
+                    "drone_id": drone_id,
+                    "status": "available" if available[i] else "deployed",
+                    "mission": self.mission[i],
+                    "battery": round(float(self.battery[i]), 1),
+                    "coordinates": {"lat": float(self.lat[i]), "lng": float(self.lng[i])},
+                    "busy_for_seconds": round(max(0.0, float(self.busy_until[i] - now)), 1)
+                }
+                for i, drone_id in enumerate(self.drone_ids)
+            ]
+        }
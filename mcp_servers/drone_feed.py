@@ -5,20 +5,40 @@ Spoon OS calls these tools to understand the current state of the drone swarm.
 """
 
 from mcp.server.fastmcp import FastMCP
+import atexit
+import os
 import random
 import json
+import uuid
+from collections import OrderedDict
 from datetime import datetime
+from typing import Optional, List
+
+import numpy as np
+
+from mcp_servers.drone_dispatch import DroneFleet, PRIORITY_WEIGHTS, load_fleet
+from mcp_servers.sector_index import SectorIndex, load_sectors
+from mcp_servers.sector_sweep import SectorSweepEngine
+from custom_tools.history_archive import HistoryArchive, SCAN_STATUSES, STREAMS, encode_column, to_dicts
+from custom_tools.incident_replay import IncidentRecorder, IncidentReplay
 
 # Initialize the MCP Server
 mcp = FastMCP("DroneVision")
 
-# Simulated drone feed database
-DRONE_SECTORS = {
-    "Sector-1": {"lat": 37.3417, "lng": -121.9751, "status": "clear"},
-    "Sector-2": {"lat": 37.3425, "lng": -121.9760, "status": "clear"},
-    "Sector-3": {"lat": 37.3410, "lng": -121.9740, "status": "clear"},
-    "Sector-4": {"lat": 37.3430, "lng": -121.9770, "status": "clear"},
-}
+# Sector database, loaded from a data file (override with DRONE_SECTORS_FILE)
+SECTORS_FILE = os.getenv(
+    "DRONE_SECTORS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sectors.json")
+)
+DRONE_SECTORS = load_sectors(SECTORS_FILE)
+SECTOR_INDEX = SectorIndex(DRONE_SECTORS)
+
+# Drone fleet positions and batteries, loaded from a data file (override with DRONE_FLEET_FILE)
+FLEET_FILE = os.getenv(
+    "DRONE_FLEET_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fleet.json")
+)
+FLEET = DroneFleet(load_fleet(FLEET_FILE))
 
 DISASTER_SCENARIOS = [
     {
@@ -47,6 +67,44 @@ DISASTER_SCENARIOS = [
     }
 ]
 
+# Columnar sector state for full-map sweeps
+SWEEP_ENGINE = SectorSweepEngine(DRONE_SECTORS, DISASTER_SCENARIOS, detection_probability=0.3)
+
+# Scan and telemetry history (override the location with NEOGUARD_ARCHIVE_DIR)
+ARCHIVE = HistoryArchive(os.getenv("NEOGUARD_ARCHIVE_DIR", "neoguard_archive"))
+
+# scan_current_sector results can be recorded (NEOGUARD_RECORD_FILE) or served
+# from a recording (NEOGUARD_REPLAY_FILE) instead of the random simulation
+RECORDER = IncidentRecorder(os.environ["NEOGUARD_RECORD_FILE"], source="drone_feed") if os.getenv("NEOGUARD_RECORD_FILE") else None
+REPLAY = IncidentReplay(os.environ["NEOGUARD_REPLAY_FILE"], speed=None, consumer="drone_feed") if os.getenv("NEOGUARD_REPLAY_FILE") else None
+if RECORDER is not None:
+    atexit.register(RECORDER.close)
+# Archive fields are fixed width: ids that do not fit fail here, at startup, instead of being truncated
+SECTOR_ID_BYTES = encode_column("scans", "sector_id", SWEEP_ENGINE.sector_ids)
+# Scenario index -1 (no alert) maps to the trailing empty type
+SCENARIO_TYPE_BYTES = encode_column("scans", "disaster_type", [s["type"] for s in DISASTER_SCENARIOS] + [""])
+encode_column("telemetry", "drone_id", FLEET.drone_ids)
+
+# Sector subscriptions: id -> subscribed rows and the state last delivered to the subscriber
+MAX_SUBSCRIPTIONS = 256
+SUBSCRIPTIONS: "OrderedDict[str, dict]" = OrderedDict()
+# Polls re-sweep a sector only once its state is this old (NEOGUARD_SWEEP_INTERVAL seconds)
+SUBSCRIPTION_SWEEP_SECONDS = float(os.getenv("NEOGUARD_SWEEP_INTERVAL", "5"))
+SCAN_COLUMNS = ["sector_id", "status", "disaster_type", "confidence"]
+
+
+def archive_sweep_rows(rows: np.ndarray):
+    """Append the current sweep state of the given sector rows to the scan archive"""
+    records = ARCHIVE.new_records("scans", len(rows))
+    records["ts"] = datetime.now().timestamp()
+    records["sector_id"] = SECTOR_ID_BYTES[rows]
+    records["status"] = SWEEP_ENGINE.status[rows]
+    records["disaster_type"] = SCENARIO_TYPE_BYTES[SWEEP_ENGINE.scenario[rows]]
+    records["confidence"] = SWEEP_ENGINE.confidence[rows]
+    records["lat"] = SWEEP_ENGINE.lat[rows]
+    records["lng"] = SWEEP_ENGINE.lng[rows]
+    ARCHIVE.append("scans", records)
+
 
 @mcp.tool()
 def scan_current_sector(sector_id: str = "Sector-1") -> dict:
@@ -55,7 +113,7 @@ def scan_current_sector(sector_id: str = "Sector-1") -> dict:
     Spoon OS calls this to analyze the current drone feed.
     
     Args:
-        sector_id: The sector to scan (Sector-1 through Sector-4)
+        sector_id: The sector to scan (any sector in the sector data file)
     
     Returns:
         Analysis of the sector including detected objects and confidence scores
@@ -68,10 +126,15 @@ def scan_current_sector(sector_id: str = "Sector-1") -> dict:
     
     sector = DRONE_SECTORS[sector_id]
     
+    # Recorded scans are served in order; once a sector's recording runs out it is simulated again
+    replayed, recorded = REPLAY.next_scan(sector_id) if REPLAY is not None else (False, None)
+    
+    if replayed and recorded is not None:
+        result = recorded
     # 30% chance of detecting a disaster (for demo purposes)
-    if random.random() < 0.3:
+    elif not replayed and random.random() < 0.3:
         disaster = random.choice(DISASTER_SCENARIOS)
-        return {
+        result = {
             "sector_id": sector_id,
             "timestamp": datetime.now().isoformat(),
             "status": "CRITICAL_ALERT",
@@ -83,43 +146,288 @@ def scan_current_sector(sector_id: str = "Sector-1") -> dict:
             "video_proof_url": f"neofs://neoguard/incident_{sector_id}_{datetime.now().timestamp()}.mp4",
             "recommended_action": "IMMEDIATE_REPORT_TO_BLOCKCHAIN"
         }
+    else:
+        result = {
+            "sector_id": sector_id,
+            "timestamp": datetime.now().isoformat(),
+            "status": "clear",
+            "detected_object": "None",
+            "confidence": 0.0,
+            "description": "No anomalies detected",
+            "coordinates": sector,
+            "video_proof_url": None,
+            "recommended_action": "CONTINUE_MONITORING"
+        }
     
-    return {
+    if RECORDER is not None:
+        RECORDER.record_scan(sector_id, result if result["status"] == "CRITICAL_ALERT" else None)
+    
+    ARCHIVE.append_rows("scans", [{
         "sector_id": sector_id,
-        "timestamp": datetime.now().isoformat(),
-        "status": "clear",
-        "detected_object": "None",
-        "confidence": 0.0,
-        "description": "No anomalies detected",
-        "coordinates": sector,
-        "video_proof_url": None,
-        "recommended_action": "CONTINUE_MONITORING"
-    }
+        "status": SCAN_STATUSES.index(result["status"]),
+        "disaster_type": result.get("disaster_type", ""),
+        "confidence": result["confidence"],
+        "lat": sector["lat"],
+        "lng": sector["lng"]
+    }])
+    return result
 
 
 @mcp.tool()
-def get_all_sectors_status() -> dict:
+def get_all_sectors_status(max_alerts: int = 100, include_all_sectors: bool = False) -> dict:
     """
     Get the status of all monitored sectors.
     Spoon OS uses this for situational awareness.
     
+    Every sector is evaluated in one vectorized pass; only alerting sectors
+    are returned in full (and archived), so the call stays cheap at large sector counts.
+    
+    Args:
+        max_alerts: Maximum alerting sectors returned in full (highest confidence first)
+        include_all_sectors: Also return the per-sector status map for every sector
+    
+    Returns:
+        Status counts, alert counts by disaster type and the alerting sectors
+    """
+    alert_indices = SWEEP_ENGINE.sweep()
+    archive_sweep_rows(alert_indices)
+    status = SWEEP_ENGINE.summary(alert_indices, max_alerts=max_alerts)
+    
+    if include_all_sectors:
+        status["sectors"] = SWEEP_ENGINE.sector_states()
+    
+    return status
+
+
+@mcp.tool()
+def scan_sectors(sector_ids: List[str], include_clear: bool = False) -> dict:
+    """
+    Scan many sectors in one call.
+    Spoon OS uses this instead of one scan_current_sector round trip per sector.
+    
+    Args:
+        sector_ids: Sectors to scan
+        include_clear: Also return rows for sectors that came back clear
+    
+    Returns:
+        Compact column/row results (alerting sectors only unless include_clear)
+    """
+    rows, unknown = SWEEP_ENGINE.row_indices(sector_ids)
+    alerting = SWEEP_ENGINE.sweep(rows)
+    archive_sweep_rows(rows)
+    
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "scanned": len(rows),
+        "critical_alerts": len(alerting),
+        "columns": SCAN_COLUMNS,
+        "rows": SWEEP_ENGINE.compact_rows(rows if include_clear else alerting),
+        "unknown_sectors": unknown
+    }
+
+
+@mcp.tool()
+def subscribe_sectors(sector_ids: List[str]) -> dict:
+    """
+    Subscribe to state changes for a set of sectors.
+    Poll the subscription with poll_sector_changes to receive only sectors whose state changed.
+    
+    Args:
+        sector_ids: Sectors to watch
+    
+    Returns:
+        Subscription id
+    """
+    rows, unknown = SWEEP_ENGINE.row_indices(sector_ids)
+    subscription_id = uuid.uuid4().hex
+    
+    SUBSCRIPTIONS[subscription_id] = {
+        "rows": rows,
+        # -2 never matches a real scenario, so the first poll reports every sector
+        "last_scenario": np.full(len(rows), -2, dtype=np.int16),
+        "created": datetime.now().isoformat()
+    }
+    while len(SUBSCRIPTIONS) > MAX_SUBSCRIPTIONS:
+        SUBSCRIPTIONS.popitem(last=False)
+    
+    return {
+        "subscription_id": subscription_id,
+        "sectors": len(rows),
+        "unknown_sectors": unknown
+    }
+
+
+@mcp.tool()
+def poll_sector_changes(subscription_id: str) -> dict:
+    """
+    Return a subscription's sectors whose state changed since the last poll.
+    Polls read the shared sweep state; a sector is re-swept only when its state is older
+    than SUBSCRIPTION_SWEEP_SECONDS, so concurrent subscriptions see the same changes.
+    
+    Args:
+        subscription_id: Id returned by subscribe_sectors
+    
     Returns:
-        Status of all sectors in the network
-    """
-    sectors_status = {}
-    for sector_id in DRONE_SECTORS.keys():
-        scan_result = scan_current_sector(sector_id)
-        sectors_status[sector_id] = {
-            "status": scan_result.get("status", "unknown"),
-            "detected_object": scan_result.get("detected_object", "None"),
-            "confidence": scan_result.get("confidence", 0.0)
+        Compact column/row results for changed sectors
+    """
+    subscription = SUBSCRIPTIONS.get(subscription_id)
+    if subscription is None:
+        return {
+            "status": "error",
+            "message": f"Subscription {subscription_id} not found"
         }
     
+    rows = subscription["rows"]
+    swept = SWEEP_ENGINE.refresh(rows, SUBSCRIPTION_SWEEP_SECONDS)
+    archive_sweep_rows(swept)
+    current = SWEEP_ENGINE.scenario[rows]
+    changed = current != subscription["last_scenario"]
+    subscription["last_scenario"] = current
+    SUBSCRIPTIONS.move_to_end(subscription_id)
+    
     return {
         "timestamp": datetime.now().isoformat(),
-        "total_sectors": len(DRONE_SECTORS),
-        "sectors": sectors_status,
-        "critical_alerts": sum(1 for s in sectors_status.values() if s["status"] == "CRITICAL_ALERT")
+        "subscription_id": subscription_id,
+        "scanned": len(swept),
+        "changed": int(np.count_nonzero(changed)),
+        "columns": SCAN_COLUMNS,
+        "rows": SWEEP_ENGINE.compact_rows(rows[changed])
+    }
+
+
+@mcp.tool()
+def unsubscribe_sectors(subscription_id: str) -> dict:
+    """
+    Cancel a sector subscription.
+    
+    Args:
+        subscription_id: Id returned by subscribe_sectors
+    """
+    removed = SUBSCRIPTIONS.pop(subscription_id, None) is not None
+    return {
+        "subscription_id": subscription_id,
+        "status": "unsubscribed" if removed else "not_found"
+    }
+
+
+@mcp.tool()
+def locate_sector(lat: float, lng: float, max_distance_km: Optional[float] = None) -> dict:
+    """
+    Map a coordinate to the sector responsible for it (nearest sector center).
+    
+    Args:
+        lat: Latitude of the point
+        lng: Longitude of the point
+        max_distance_km: Optional cutoff; points farther from every sector are unassigned
+    
+    Returns:
+        The owning sector and its distance from the point
+    """
+    match = SECTOR_INDEX.locate(lat, lng, max_distance_km=max_distance_km)
+    if match is None:
+        return {
+            "status": "error",
+            "message": f"No sector within {max_distance_km} km of ({lat}, {lng})"
+        }
+    
+    sector_id, distance = match
+    return {
+        "sector_id": sector_id,
+        "distance_km": round(distance, 4),
+        "coordinates": DRONE_SECTORS[sector_id]
+    }
+
+
+@mcp.tool()
+def find_sectors_in_radius(lat: float, lng: float, radius_km: float, limit: int = 50) -> dict:
+    """
+    Find sectors whose centers lie within a radius of a coordinate.
+    
+    Args:
+        lat: Latitude of the search center
+        lng: Longitude of the search center
+        radius_km: Search radius in kilometers
+        limit: Maximum number of sectors returned (closest first)
+    
+    Returns:
+        Matching sectors with their distances
+    """
+    matches = SECTOR_INDEX.within_radius(lat, lng, radius_km, limit=limit)
+    return {
+        "center": {"lat": lat, "lng": lng},
+        "radius_km": radius_km,
+        "count": len(matches),
+        "sectors": [
+            {"sector_id": sector_id, "distance_km": round(distance, 4)}
+            for sector_id, distance in matches
+        ]
+    }
+
+
+@mcp.tool()
+def get_neighbor_sectors(sector_id: str, k: int = 8) -> dict:
+    """
+    Get the sectors closest to a given sector.
+    Spoon OS uses this to widen a search around an incident.
+    
+    Args:
+        sector_id: Reference sector
+        k: Number of neighbors to return
+    
+    Returns:
+        Nearest sectors with their distances
+    """
+    if sector_id not in DRONE_SECTORS:
+        return {
+            "status": "error",
+            "message": f"Sector {sector_id} not found"
+        }
+    
+    return {
+        "sector_id": sector_id,
+        "neighbors": [
+            {"sector_id": neighbor_id, "distance_km": round(distance, 4)}
+            for neighbor_id, distance in SECTOR_INDEX.neighbors(sector_id, k=k)
+        ]
+    }
+
+
+@mcp.tool()
+def query_archive(stream: str = "scans", since_seconds: float = 3600, key: Optional[str] = None, limit: int = 100) -> dict:
+    """
+    Query archived history for post-incident analysis.
+    
+    Args:
+        stream: "scans", "telemetry" or "incidents"
+        since_seconds: How far back to look
+        key: Only records for this sector id (scans, incidents) or drone id (telemetry)
+        limit: Maximum records returned (most recent first); counts cover the whole range
+    
+    Returns:
+        Record count in range and the most recent matching records
+    """
+    if stream not in STREAMS:
+        return {
+            "status": "error",
+            "message": f"Unknown stream {stream} (expected one of {', '.join(STREAMS)})"
+        }
+    
+    end = datetime.now().timestamp()
+    key_field = "drone_id" if stream == "telemetry" else "sector_id"
+    total = 0
+    matched = []
+    for view in ARCHIVE.iter_range(stream, end - since_seconds, end + 1):
+        if key is not None:
+            view = view[view[key_field] == key.encode()]
+        total += len(view)
+        matched.append(view[-limit:] if limit > 0 else view[:0])
+    
+    recent = np.concatenate(matched)[::-1][:max(0, limit)] if matched else []
+    return {
+        "stream": stream,
+        "since": datetime.fromtimestamp(end - since_seconds).isoformat(),
+        "count": total,
+        "records": to_dicts(recent) if len(recent) else []
     }
 
 
@@ -130,14 +438,27 @@ def get_drone_swarm_status() -> dict:
     Spoon OS calls this to understand fleet health.
     
     Returns:
-        Swarm status including active drones and battery levels
+        Swarm status including active drones, battery levels and per-drone state
     """
+    status = FLEET.status()
+    ARCHIVE.append_rows("telemetry", [
+        {
+            "drone_id": drone["drone_id"],
+            "battery": drone["battery"],
+            "lat": drone["coordinates"]["lat"],
+            "lng": drone["coordinates"]["lng"],
+            "deployed": drone["status"] == "deployed"
+        }
+        for drone in status["drones"]
+    ])
     return {
         "timestamp": datetime.now().isoformat(),
-        "total_drones": 3,
-        "active_drones": random.randint(2, 3),
-        "average_battery": random.randint(60, 100),
-        "network_status": "operational",
+        "total_drones": status["total_drones"],
+        "active_drones": status["active_drones"],
+        "deployed_drones": status["deployed_drones"],
+        "average_battery": status["average_battery"],
+        "network_status": "operational" if status["active_drones"] else "saturated",
+        "drones": status["drones"],
         "last_sync": datetime.now().isoformat()
     }
 
@@ -153,21 +474,62 @@ def request_drone_deployment(sector_id: str, priority: str = "high") -> dict:
         priority: Priority level (low, medium, high, critical)
     
     Returns:
-        Deployment status and ETA
+        Deployment status with the assigned drone and its ETA, or "queued" when
+        no drone with enough battery is available
     """
-    if sector_id not in DRONE_SECTORS:
+    result = request_batch_deployment([{"sector_id": sector_id, "priority": priority}])
+    if result["status"] == "error":
+        return result
+    return result["deployments"][0]
+
+
+@mcp.tool()
+def request_batch_deployment(deployments: List[dict]) -> dict:
+    """
+    Dispatch drones to several sectors at once.
+    All requests are assigned jointly (min-cost matching over priority-weighted
+    travel time), so a nearby drone is not spent on a low-priority sector when a
+    critical one needs it.
+    
+    Args:
+        deployments: [{"sector_id": ..., "priority": "low" | "medium" | "high" | "critical"}]
+    
+    Returns:
+        One deployment result per request, in request order
+    """
+    unknown = [d.get("sector_id") for d in deployments if d.get("sector_id") not in DRONE_SECTORS]
+    if unknown:
         return {
             "status": "error",
-            "message": f"Sector {sector_id} not found"
+            "message": f"Sectors not found: {', '.join(map(str, unknown))}"
         }
+    invalid = [d["priority"] for d in deployments if d.get("priority", "high") not in PRIORITY_WEIGHTS]
+    if invalid:
+        return {
+            "status": "error",
+            "message": f"Unknown priority: {', '.join(map(str, invalid))}"
+        }
+    
+    requests = [
+        {
+            "sector_id": d["sector_id"],
+            "priority": d.get("priority", "high"),
+            "lat": DRONE_SECTORS[d["sector_id"]]["lat"],
+            "lng": DRONE_SECTORS[d["sector_id"]]["lng"]
+        }
+        for d in deployments
+    ]
+    timestamp = datetime.now().isoformat()
+    results = FLEET.dispatch(requests)
+    for result in results:
+        result["timestamp"] = timestamp
     
     return {
-        "status": "deployed",
-        "sector_id": sector_id,
-        "priority": priority,
-        "drone_id": f"UNIT-{random.randint(1, 3):03d}",
-        "eta_seconds": random.randint(30, 120),
-        "timestamp": datetime.now().isoformat()
+        "status": "success",
+        "timestamp": timestamp,
+        "deployed": sum(1 for r in results if r["status"] == "deployed"),
+        "queued": sum(1 for r in results if r["status"] == "queued"),
+        "deployments": results
     }
 
 
@@ -0,0 +1,201 @@
+"""
+Sector Spatial Index
+Uniform lat/lng grid index over sector centers for the DroneVision MCP server.
+Supports point-to-sector (nearest center), radius and nearest-neighbor queries
+in well under a millisecond at 100k sectors.
+"""
+
+import heapq
+import json
+import math
+from typing import Optional, Dict, Any, List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two coordinates in kilometers"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def load_sectors(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load sectors from a JSON data file.
+    
+    The file holds a list of {"sector_id", "lat", "lng", ...} objects; extra keys are kept.
+    Returns a dict keyed by sector id with "status" defaulting to "clear".
+    """
+    with open(path, "r") as f:
+        records = json.load(f)
+    
+    sectors = {}
+    for record in records:
+        sector = {key: value for key, value in record.items() if key != "sector_id"}
+        sector.setdefault("status", "clear")
+        sectors[record["sector_id"]] = sector
+    return sectors
+
+
+class SectorIndex:
+    """
+    Grid index over sector centers.
+    
+    Each sector is bucketed into a cell of `cell_size_deg` degrees; queries only
+    visit the cells that can contain an answer, so cost depends on local density
+    rather than the total number of sectors.
+    """
+    
+    def __init__(self, sectors: Dict[str, Dict[str, Any]], cell_size_deg: Optional[float] = None):
+        """
+        Build the index.
+        
+        Args:
+            sectors: Dict of sector id -> {"lat", "lng", ...}
+            cell_size_deg: Grid cell size (defaults to roughly 4 sectors per cell)
+        """
+        self.sectors = sectors
+        self.cell_size_deg = cell_size_deg or self._auto_cell_size(sectors)
+        self._cells: Dict[Tuple[int, int], List[Tuple[str, float, float]]] = {}
+        
+        for sector_id, sector in sectors.items():
+            self._cells.setdefault(self._cell(sector["lat"], sector["lng"]), []).append(
+                (sector_id, sector["lat"], sector["lng"])
+            )
+    
+    @staticmethod
+    def _auto_cell_size(sectors: Dict[str, Dict[str, Any]]) -> float:
+        if len(sectors) < 2:
+            return 0.01
+        lats = [s["lat"] for s in sectors.values()]
+        lngs = [s["lng"] for s in sectors.values()]
+        area = max(max(lats) - min(lats), 1e-6) * max(max(lngs) - min(lngs), 1e-6)
+        return max(math.sqrt(area * 4 / len(sectors)), 1e-5)
+    
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_size_deg)), int(math.floor(lng / self.cell_size_deg))
+    
+    def _ring(self, center: Tuple[int, int], radius: int):
+        """Cells at Chebyshev distance `radius` from `center`"""
+        ci, cj = center
+        if radius == 0:
+            yield center
+            return
+        for dj in range(-radius, radius + 1):
+            yield ci - radius, cj + dj
+            yield ci + radius, cj + dj
+        for di in range(-radius + 1, radius):
+            yield ci + di, cj - radius
+            yield ci + di, cj + radius
+    
+    def _ring_min_km(self, lat: float, radius: int) -> float:
+        """Lower bound on the distance to any cell outside ring `radius - 1`"""
+        if radius == 0:
+            return 0.0
+        degrees = (radius - 1) * self.cell_size_deg
+        km_per_deg_lng = 111.32 * max(math.cos(math.radians(min(abs(lat) + degrees, 89.9))), 1e-6)
+        return degrees * min(110.5, km_per_deg_lng)
+    
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 1,
+        exclude: Optional[str] = None,
+        max_distance_km: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        k nearest sectors to a coordinate.
+        
+        Returns:
+            List of (sector_id, distance_km), closest first
+        """
+        if not self.sectors:
+            return []
+        
+        center = self._cell(lat, lng)
+        found: List[Tuple[float, str]] = []
+        radius = 0
+        
+        while True:
+            # Stop once no unvisited cell can beat the current k-th best
+            if len(found) >= k and self._ring_min_km(lat, radius) > found[k - 1][0]:
+                break
+            if max_distance_km is not None and self._ring_min_km(lat, radius) > max_distance_km:
+                break
+            # Far from every sector: rings now outgrow the occupied grid, scan it directly
+            if 8 * radius > len(self._cells):
+                return self._scan_nearest(lat, lng, k, exclude, max_distance_km)
+            
+            for cell in self._ring(center, radius):
+                for sector_id, s_lat, s_lng in self._cells.get(cell, ()):
+                    if sector_id == exclude:
+                        continue
+                    distance = haversine_km(lat, lng, s_lat, s_lng)
+                    if max_distance_km is None or distance <= max_distance_km:
+                        found.append((distance, sector_id))
+            found.sort()
+            del found[k:]
+            radius += 1
+        
+        return [(sector_id, distance) for distance, sector_id in found]
+    
+    def _scan_nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int,
+        exclude: Optional[str],
+        max_distance_km: Optional[float]
+    ) -> List[Tuple[str, float]]:
+        candidates = (
+            (haversine_km(lat, lng, s["lat"], s["lng"]), sector_id)
+            for sector_id, s in self.sectors.items()
+            if sector_id != exclude
+        )
+        if max_distance_km is not None:
+            candidates = (c for c in candidates if c[0] <= max_distance_km)
+        return [(sector_id, distance) for distance, sector_id in heapq.nsmallest(k, candidates)]
+    
+    def locate(self, lat: float, lng: float, max_distance_km: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """Sector whose center is closest to the coordinate (its Voronoi cell contains the point)"""
+        result = self.nearest(lat, lng, k=1, max_distance_km=max_distance_km)
+        return result[0] if result else None
+    
+    def within_radius(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Sectors whose centers lie within `radius_km` of the coordinate.
+        
+        Returns:
+            List of (sector_id, distance_km), closest first
+        """
+        lat_span = radius_km / 111.32
+        lng_span = radius_km / (111.32 * max(math.cos(math.radians(min(abs(lat) + lat_span, 89.9))), 1e-6))
+        i_min, j_min = self._cell(lat - lat_span, lng - lng_span)
+        i_max, j_max = self._cell(lat + lat_span, lng + lng_span)
+        
+        found = []
+        if (i_max - i_min + 1) * (j_max - j_min + 1) > len(self._cells):
+            candidate_cells = [c for c in self._cells if i_min <= c[0] <= i_max and j_min <= c[1] <= j_max]
+        else:
+            candidate_cells = [(i, j) for i in range(i_min, i_max + 1) for j in range(j_min, j_max + 1)]
+        
+        for cell in candidate_cells:
+            for sector_id, s_lat, s_lng in self._cells.get(cell, ()):
+                distance = haversine_km(lat, lng, s_lat, s_lng)
+                if distance <= radius_km:
+                    found.append((distance, sector_id))
+        
+        found.sort()
+        if limit is not None:
+            del found[limit:]
+        return [(sector_id, distance) for distance, sector_id in found]
+    
+    def neighbors(self, sector_id: str, k: int = 8) -> List[Tuple[str, float]]:
+        """k sectors closest to the given sector's center"""
+        sector = self.sectors[sector_id]
+        return self.nearest(sector["lat"], sector["lng"], k=k, exclude=sector_id)
@@ -0,0 +1,85 @@
+"""Incident bookkeeping (archive rows, dedup index state) in pipeline patrol mode"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from custom_tools.history_archive import INCIDENT_OUTCOMES, HistoryArchive, to_dicts
+from main_agent import SpoonOSAgent
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INCIDENTS = {
+    "Sector-1": {"disaster_type": "wildfire", "name": "Active Wildfire", "confidence": 0.98,
+                 "description": "Large fire detected with smoke plume"},
+    "Sector-2": {"disaster_type": "flood", "name": "Flash Flood", "confidence": 0.5,
+                 "description": "Water overflow in low-lying area"}
+}
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    with open(os.path.join(ROOT, "config.json"), encoding="utf-8") as f:
+        config = json.load(f)
+    config["monitoring"]["patrol_mode"] = "pipeline"
+    config["archive"]["path"] = str(tmp_path / "archive")
+    config["outbox"]["enabled"] = False
+    config["logging"] = {"level": "WARNING"}
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+
+    agent = SpoonOSAgent(str(config_path))
+
+    async def monitor_drone_feed(sector_id=None):
+        scenario = INCIDENTS.get(sector_id)
+        if scenario is None:
+            return None
+        return {
+            "sector_id": sector_id,
+            **scenario,
+            "coordinates": {"lat": 37.3417, "lng": -121.9751},
+            "video_proof_url": f"neofs://neoguard/incident_{sector_id}.mp4"
+        }
+
+    agent.monitor_drone_feed = monitor_drone_feed
+    return agent
+
+
+def test_pipeline_archives_outcomes_and_marks_reported(agent, tmp_path):
+    async def main():
+        await agent.start()
+        pipeline = agent.build_pipeline()
+        await pipeline.start()
+        for sector_id in ("Sector-1", "Sector-2", "Sector-3"):
+            await pipeline.submit(sector_id)
+        await pipeline.stop(drain=True, drain_timeout=10)
+        records = {record["incident_id"]: dict(record) for record in agent.incident_index._by_id.values()}
+        await agent.stop()
+        return records
+
+    records = asyncio.run(main())
+
+    rows = to_dicts(HistoryArchive(str(tmp_path / "archive")).query("incidents"))
+    outcomes = {row["sector_id"]: INCIDENT_OUTCOMES[row["outcome"]] for row in rows}
+    assert outcomes == {"Sector-1": "reported", "Sector-2": "held"}
+
+    by_sector = {record["incident"]["sector_id"]: record for record in records.values()}
+    assert by_sector["Sector-1"]["reported"] is True
+    assert by_sector["Sector-2"]["reported"] is False
+    assert agent.incidents_reported == 1
+
+
+def test_archive_errors_do_not_fail_a_reported_incident(agent):
+    async def main():
+        await agent.start()
+        incident = await agent.monitor_drone_feed("Sector-1")
+        incident["sector_id"] = "Sector-" + "9" * 40
+        reported = await agent.handle_incident(incident)
+        await agent.stop()
+        return reported
+
+    assert asyncio.run(main()) is True
+    assert agent.incidents_reported == 1
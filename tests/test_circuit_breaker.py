@@ -0,0 +1,127 @@
+"""State transitions of the Gemini circuit breaker"""
+
+from custom_tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock, **overrides) -> CircuitBreaker:
+    options = dict(window_size=4, min_calls=4, error_rate_threshold=0.5, open_seconds=10.0,
+                   half_open_probes=1, close_after_successes=2, clock=clock)
+    options.update(overrides)
+    return CircuitBreaker(**options)
+
+
+def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.min_calls):
+        breaker.record(breaker.allow(), False, 0.1)
+
+
+def test_trips_open_on_error_rate():
+    breaker = make_breaker(FakeClock())
+    breaker.record(breaker.allow(), True, 0.1)
+    breaker.record(breaker.allow(), True, 0.1)
+    breaker.record(breaker.allow(), False, 0.1)
+    assert breaker.state == CLOSED
+
+    breaker.record(breaker.allow(), False, 0.1)
+    assert breaker.state == OPEN
+    assert breaker.trips == 1
+    assert breaker.allow() is None
+    assert breaker.rejected == 1
+
+
+def test_trips_open_on_latency():
+    breaker = make_breaker(FakeClock(), latency_threshold_seconds=1.0, latency_quantile=0.5)
+    for _ in range(4):
+        breaker.record(breaker.allow(), True, 2.0)
+    assert breaker.state == OPEN
+    assert breaker.last_trip_reason.startswith("p50 latency")
+
+
+def test_half_open_after_cool_down_limits_probes():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    assert not breaker.accepting
+
+    clock.now = 10.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.accepting
+    probe = breaker.allow()
+    assert probe is not None
+    assert not breaker.accepting
+    assert breaker.allow() is None
+
+    breaker.release(probe)
+    assert breaker.accepting
+
+
+def test_successful_probes_close_the_circuit():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now = 10.0
+
+    breaker.record(breaker.allow(), True, 0.1)
+    assert breaker.state == HALF_OPEN
+    breaker.record(breaker.allow(), True, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_failed_probe_reopens_the_circuit():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now = 10.0
+
+    breaker.record(breaker.allow(), False, 0.1)
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+    clock.now = 15.0
+    assert breaker.state == OPEN
+    clock.now = 20.0
+    assert breaker.state == HALF_OPEN
+
+
+def test_call_admitted_while_closed_is_not_a_probe():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    slow_call = breaker.allow()
+    trip(breaker)
+    clock.now = 10.0
+    probe = breaker.allow()
+
+    # The slow call finishes successfully after the circuit went half-open
+    breaker.record(slow_call, True, 0.1)
+    assert breaker.state == HALF_OPEN
+    assert not breaker.accepting
+
+    breaker.record(probe, True, 0.1)
+    assert breaker.state == HALF_OPEN
+
+
+def test_probe_from_an_earlier_half_open_period_is_ignored():
+    clock = FakeClock()
+    breaker = make_breaker(clock, half_open_probes=2)
+    trip(breaker)
+    clock.now = 10.0
+    stale_probe = breaker.allow()
+    breaker.record(breaker.allow(), False, 0.1)
+    assert breaker.state == OPEN
+
+    clock.now = 20.0
+    probe = breaker.allow()
+    breaker.record(stale_probe, False, 0.1)
+    assert breaker.state == HALF_OPEN
+    breaker.release(stale_probe)
+    assert breaker.allow() is not None
+    assert breaker.allow() is None
+    breaker.release(probe)
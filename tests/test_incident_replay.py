@@ -0,0 +1,87 @@
+"""Replaying agent and drone feed recordings through both consumers"""
+
+import asyncio
+import importlib
+import json
+import os
+
+import pytest
+
+from custom_tools.incident_replay import IncidentRecorder, IncidentReplay
+from main_agent import SpoonOSAgent
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+AGENT_INCIDENT = {
+    "sector_id": "Sector-1",
+    "disaster_type": "wildfire",
+    "name": "Active Wildfire",
+    "confidence": 0.98,
+    "description": "Large fire detected with smoke plume",
+    "coordinates": {"lat": 37.3417, "lng": -121.9751},
+    "video_proof_url": "neofs://neoguard/incident_Sector-1_1.mp4"
+}
+
+FEED_SCAN = {
+    "sector_id": "Sector-2",
+    "timestamp": "2026-10-18T12:00:00",
+    "status": "CRITICAL_ALERT",
+    "detected_object": "Flash Flood",
+    "disaster_type": "flood",
+    "confidence": 0.92,
+    "description": "Water overflow in low-lying area",
+    "coordinates": {"lat": 37.3425, "lng": -121.976, "status": "clear"},
+    "video_proof_url": "neofs://neoguard/incident_Sector-2_1.mp4",
+    "recommended_action": "IMMEDIATE_REPORT_TO_BLOCKCHAIN"
+}
+
+
+@pytest.fixture(params=["agent", "drone_feed"])
+def recording(request, tmp_path):
+    source = request.param
+    incident = AGENT_INCIDENT if source == "agent" else FEED_SCAN
+    path = str(tmp_path / f"{source}.jsonl")
+    recorder = IncidentRecorder(path, source=source)
+    recorder.record_scan(incident["sector_id"], incident)
+    recorder.record_scan("Sector-3", None)
+    recorder.close()
+    return path, incident["sector_id"]
+
+
+def test_agent_replays_either_source(recording, tmp_path, monkeypatch):
+    path, _ = recording
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    with open(os.path.join(ROOT, "config.json"), encoding="utf-8") as f:
+        config = json.load(f)
+    config["archive"]["path"] = str(tmp_path / "archive")
+    config["outbox"]["enabled"] = False
+    config["logging"] = {"level": "WARNING"}
+    config.pop("replay", None)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+
+    summary = asyncio.run(SpoonOSAgent(str(config_path)).run_replay(path, speed=None))
+    assert summary["incidents"] == 1
+    assert summary["failed"] == 0
+    assert summary["reported"] + summary["held"] == 1
+
+
+def test_drone_feed_replays_either_source(recording, tmp_path, monkeypatch):
+    path, sector_id = recording
+    monkeypatch.setenv("NEOGUARD_ARCHIVE_DIR", str(tmp_path / "feed_archive"))
+    drone_feed = importlib.import_module("mcp_servers.drone_feed")
+    monkeypatch.setattr(drone_feed, "ARCHIVE", drone_feed.HistoryArchive(str(tmp_path / "feed_archive")))
+    monkeypatch.setattr(drone_feed, "REPLAY", IncidentReplay(path, speed=None, consumer="drone_feed"))
+
+    result = drone_feed.scan_current_sector(sector_id)
+    assert result["status"] == "CRITICAL_ALERT"
+    assert result["sector_id"] == sector_id
+    assert result["detected_object"] in ("Active Wildfire", "Flash Flood")
+    assert drone_feed.scan_current_sector("Sector-3")["status"] == "clear"
+
+
+def test_unknown_source_is_rejected(tmp_path):
+    path = str(tmp_path / "other.jsonl")
+    IncidentRecorder(path, source="satellite").close()
+    with pytest.raises(ValueError, match="unknown source 'satellite'"):
+        IncidentReplay(path)
@@ -0,0 +1,256 @@
+"""Rate limiting, priority, coalescing, cancellation and deadlines of the LLM request scheduler"""
+
+import asyncio
+import time
+
+import pytest
+
+from custom_tools.circuit_breaker import OPEN, CircuitBreaker
+from custom_tools.gemini_fallback import GeminiFallbackAgent
+from custom_tools.llm_scheduler import LLMRequestScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_rate_up_to_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+    bucket.take()
+    bucket.take()
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+    clock.now = 10.0
+    assert bucket.wait_time() == 0.0
+    assert bucket.tokens == 2
+
+
+def test_token_bucket_pause_stops_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, burst=5, clock=clock)
+    bucket.pause(3.0)
+    clock.now = 2.0
+    assert bucket.wait_time() == pytest.approx(1.0)
+    clock.now = 4.0
+    assert bucket.wait_time() == 0.0
+    assert bucket.tokens == pytest.approx(1.0)
+
+
+def test_rate_limit_spaces_dispatches():
+    async def main():
+        scheduler = LLMRequestScheduler(requests_per_minute=600, burst=1, max_concurrent=8)
+        started = []
+
+        def factory():
+            async def call():
+                started.append(time.monotonic())
+                return len(started)
+            return call()
+
+        results = await asyncio.gather(*(scheduler.submit("analyze_incident", n, factory) for n in range(3)))
+        scheduler.close()
+        return results, started
+
+    results, started = asyncio.run(main())
+    assert sorted(results) == [1, 2, 3]
+    # 10 requests per second with a burst of one: one dispatch every ~100ms
+    assert started[2] - started[0] >= 0.18
+
+
+def test_decisions_overtake_background_work():
+    async def main():
+        scheduler = LLMRequestScheduler(requests_per_minute=60000, burst=100, max_concurrent=1)
+        gate = asyncio.Event()
+        order = []
+
+        def factory(name, wait=False):
+            async def call():
+                order.append(name)
+                if wait:
+                    await gate.wait()
+                return name
+            return call
+
+        blocker = asyncio.create_task(scheduler.submit("analyze_incident", "blocker", factory("blocker", True)))
+        await asyncio.sleep(0.01)
+        report = asyncio.create_task(scheduler.submit("generate_incident_report", "report", factory("report")))
+        network = asyncio.create_task(scheduler.submit("reason_about_network", "network", factory("network")))
+        decision = asyncio.create_task(scheduler.submit("assess_and_decide", "decision", factory("decision")))
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(blocker, report, network, decision)
+        scheduler.close()
+        return order
+
+    assert asyncio.run(main()) == ["blocker", "decision", "network", "report"]
+
+
+def test_identical_requests_share_one_call():
+    async def main():
+        scheduler = LLMRequestScheduler(requests_per_minute=60000, burst=100)
+        calls = []
+
+        def factory():
+            async def call():
+                calls.append(1)
+                await asyncio.sleep(0.02)
+                return "verdict"
+            return call()
+
+        results = await asyncio.gather(*(scheduler.submit("assess_and_decide", "same", factory) for _ in range(3)))
+        scheduler.close()
+        return results, calls, scheduler.stats()
+
+    results, calls, stats = asyncio.run(main())
+    assert results == ["verdict"] * 3
+    assert len(calls) == 1
+    assert stats["coalesced"] == 2
+    assert stats["dispatched"] == 1
+
+
+def test_one_caller_cancelling_does_not_cancel_the_shared_call():
+    async def main():
+        scheduler = LLMRequestScheduler(requests_per_minute=60000, burst=100)
+
+        def factory():
+            async def call():
+                await asyncio.sleep(0.05)
+                return "verdict"
+            return call()
+
+        first = asyncio.create_task(scheduler.submit("assess_and_decide", "same", factory))
+        second = asyncio.create_task(scheduler.submit("assess_and_decide", "same", factory))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        scheduler.close()
+        return result, first.cancelled()
+
+    assert asyncio.run(main()) == ("verdict", True)
+
+
+def test_queued_request_abandoned_by_every_caller_is_never_sent():
+    async def main():
+        scheduler = LLMRequestScheduler(requests_per_minute=60000, burst=100, max_concurrent=1)
+        gate = asyncio.Event()
+        calls = []
+
+        def factory(name):
+            async def call():
+                calls.append(name)
+                await gate.wait()
+                return name
+            return call
+
+        blocker = asyncio.create_task(scheduler.submit("analyze_incident", "blocker", factory("blocker")))
+        queued = asyncio.create_task(scheduler.submit("analyze_incident", "queued", factory("queued")))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        await asyncio.sleep(0.01)
+        gate.set()
+        await blocker
+        await asyncio.sleep(0.01)
+        scheduler.close()
+        return calls, scheduler.stats()
+
+    calls, stats = asyncio.run(main())
+    assert calls == ["blocker"]
+    assert stats["abandoned"] == 1
+
+
+def test_running_call_is_cancelled_when_its_last_caller_leaves():
+    async def main():
+        scheduler = LLMRequestScheduler(requests_per_minute=60000, burst=100, max_concurrent=1)
+        cancelled = asyncio.Event()
+
+        def hung():
+            async def call():
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return call()
+
+        caller = asyncio.create_task(scheduler.submit("assess_and_decide", "hung", hung))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1.0)
+        await asyncio.sleep(0)
+        running = scheduler.stats()["running"]
+        scheduler.close()
+        return running
+
+    assert asyncio.run(main()) == 0
+
+
+def test_hung_call_times_out_and_frees_its_slot():
+    async def main():
+        scheduler = LLMRequestScheduler(requests_per_minute=60000, burst=100, max_concurrent=1)
+
+        def hung():
+            return asyncio.Event().wait()
+
+        async def answer():
+            return "verdict"
+
+        with pytest.raises(asyncio.TimeoutError):
+            await scheduler.submit("assess_and_decide", "hung", hung, deadline=0.05)
+        result = await asyncio.wait_for(scheduler.submit("assess_and_decide", "next", answer, deadline=0.05), 1.0)
+        stats = scheduler.stats()
+        scheduler.close()
+        return result, stats
+
+    result, stats = asyncio.run(main())
+    assert result == "verdict"
+    assert stats["timed_out"] == 1
+    assert stats["running"] == 0
+
+
+def test_try_acquire_takes_a_token_or_nothing():
+    clock = FakeClock()
+    scheduler = LLMRequestScheduler(requests_per_minute=60, burst=1, clock=clock)
+    assert scheduler.try_acquire()
+    assert not scheduler.try_acquire()
+    clock.now = 1.0
+    assert scheduler.try_acquire()
+    assert scheduler.stats()["extra_calls"] == 2
+
+
+class HungModel:
+    """Stand-in for genai.GenerativeModel that never answers"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.calls += 1
+        await asyncio.Event().wait()
+
+
+def test_hung_model_keeps_reaching_the_model_and_trips_the_breaker():
+    async def main():
+        breaker = CircuitBreaker(window_size=4, min_calls=4, open_seconds=60.0)
+        agent = GeminiFallbackAgent(
+            api_key="test",
+            request_timeout=0.1,
+            breaker=breaker,
+            scheduler=LLMRequestScheduler(requests_per_minute=60000, burst=100, max_concurrent=2)
+        )
+        agent.model = HungModel()
+        for n in range(3):
+            await asyncio.gather(*(
+                agent.query_network_requirements(f"question {n}-{k}") for k in range(2)
+            ))
+        agent.close()
+        return agent.model.calls, breaker.state
+
+    calls, state = asyncio.run(main())
+    # Every timed-out call released its slot, so each round reached the model
+    assert calls >= 4
+    assert state == OPEN
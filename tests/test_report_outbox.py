@@ -0,0 +1,40 @@
+"""Pending-row accounting of the durable report outbox across restarts"""
+
+import asyncio
+
+from custom_tools.report_outbox import ReportOutbox
+
+
+def test_pending_counts_rows_left_by_a_previous_run(tmp_path):
+    path = str(tmp_path / "outbox.db")
+
+    async def fail(incident):
+        return False
+
+    async def deliver(incident):
+        return True
+
+    async def first_run():
+        outbox = ReportOutbox(path, commit_interval_seconds=0, max_attempts=1)
+        await asyncio.gather(*(outbox.enqueue({"sector_id": f"Sector-{n}"}) for n in range(3)))
+        pending = outbox.pending
+        await outbox.stop()
+        return pending
+
+    async def second_run():
+        outbox = ReportOutbox(path, commit_interval_seconds=0, drain_batch_size=1, max_attempts=1)
+        await outbox.enqueue({"sector_id": "Sector-4"})
+        restarted = outbox.pending
+        await outbox.drain_once(deliver)
+        await outbox.drain_once(fail)
+        drained = outbox.pending
+        stats = await outbox.stats()
+        await outbox.stop()
+        return restarted, drained, stats
+
+    assert asyncio.run(first_run()) == 3
+    restarted, drained, stats = asyncio.run(second_run())
+    assert restarted == 4
+    # One delivered, one dead-lettered; the session counters alone would read 1 - 1 - 1
+    assert drained == 2
+    assert stats["pending"] == drained
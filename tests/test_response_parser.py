@@ -0,0 +1,120 @@
+"""JSON recovery, unit normalization and schema checks of model responses"""
+
+import pytest
+
+from custom_tools.response_parser import (
+    ResponseParseError,
+    ResponseParser,
+    extract_json,
+    normalize_confidence,
+    normalize_should_report
+)
+
+DECISION = '{"should_report": true, "confidence": 92, "reasoning": "smoke plume"}'
+
+
+def test_plain_json_is_direct():
+    assert extract_json(DECISION) == (
+        {"should_report": True, "confidence": 92, "reasoning": "smoke plume"}, "direct"
+    )
+
+
+def test_fenced_json_is_extracted():
+    value, outcome = extract_json(f"```json\n{DECISION}\n```")
+    assert outcome == "extracted"
+    assert value["confidence"] == 92
+
+
+def test_prose_wrapped_json_is_extracted():
+    value, outcome = extract_json(f"Here is my assessment:\n{DECISION}\nLet me know if you need more.")
+    assert outcome == "extracted"
+    assert value["should_report"] is True
+
+
+def test_truncated_string_is_closed_off():
+    value, outcome = extract_json('{"severity": "High", "reasoning": "water rising quick')
+    assert outcome == "repaired"
+    assert value == {"severity": "High", "reasoning": "water rising quick"}
+
+
+def test_truncated_scalar_is_cut_back_to_the_last_complete_value():
+    value, outcome = extract_json('{"severity": "High", "risk_factors": ["wind"], "score": 1')
+    assert outcome == "repaired"
+    assert value == {"severity": "High", "risk_factors": ["wind"]}
+
+
+def test_unrecoverable_text_raises():
+    with pytest.raises(ResponseParseError):
+        extract_json("I cannot help with that.")
+    with pytest.raises(ResponseParseError):
+        extract_json("")
+
+
+@pytest.mark.parametrize("raw, percent", [
+    (85, 85.0),
+    (0.85, 85.0),
+    ("85%", 85.0),
+    ("0.85", 85.0),
+    (100, 100.0),
+    (1, 1.0),
+    (1.0, 1.0),
+    (0, 0.0)
+])
+def test_confidence_is_normalized_to_percent(raw, percent):
+    assert normalize_confidence(raw) == percent
+
+
+@pytest.mark.parametrize("raw", [350, -5, "high", True, None, float("nan")])
+def test_non_confidences_are_rejected(raw):
+    assert normalize_confidence(raw) is None
+
+
+def test_should_report_words_become_bools():
+    assert normalize_should_report("Yes") is True
+    assert normalize_should_report("hold") is False
+    assert normalize_should_report("maybe") == "maybe"
+
+
+def test_parse_normalizes_a_decision():
+    parser = ResponseParser()
+    value, outcome = parser.parse(
+        "collaborate_on_decision", '```json\n{"should_report": "yes", "confidence": 0.9}\n```'
+    )
+    assert outcome == "extracted"
+    assert value == {"should_report": True, "confidence": 90.0}
+
+
+@pytest.mark.parametrize("text", [
+    '{"should_report": true, "confidence": 1',
+    '{"should_report": true, "confidence": 8',
+    '{"should_report": true, "confidence": 95, "reasoning": "cut'
+])
+def test_truncated_decisions_are_rejected(text):
+    parser = ResponseParser()
+    with pytest.raises(ResponseParseError):
+        parser.parse("collaborate_on_decision", text)
+    assert parser.stats()["outcomes"]["invalid"] == 1
+
+
+def test_truncated_fused_decision_is_rejected():
+    text = '{"analysis": {"severity": "High"}, "decision": {"should_report": true, "confidence": 9'
+    with pytest.raises(ResponseParseError):
+        ResponseParser().parse("assess_and_decide", text)
+
+
+def test_truncated_analysis_is_repaired():
+    parser = ResponseParser()
+    value, outcome = parser.parse("analyze_incident", '{"severity": "critical", "recommended_actions": ["evacuate"')
+    assert outcome == "repaired"
+    assert value == {"severity": "Critical", "recommended_actions": ["evacuate"]}
+
+
+def test_schema_violations_raise():
+    parser = ResponseParser()
+    with pytest.raises(ResponseParseError, match="required"):
+        parser.parse("collaborate_on_decision", '{"should_report": true}')
+    with pytest.raises(ResponseParseError, match="not a fraction or percent"):
+        parser.parse("collaborate_on_decision", '{"should_report": true, "confidence": 350}')
+    with pytest.raises(ResponseParseError, match="not one of"):
+        parser.parse("analyze_incident", '{"severity": "Apocalyptic"}')
+    assert parser.stats()["outcomes"]["invalid"] == 3